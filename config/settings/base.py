@@ -46,6 +46,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "courier.middleware.ProfilingMiddleware",  # Opt-in; removes itself unless configured
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",  # CORS - must be before CommonMiddleware
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -121,8 +122,8 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
+        'courier.throttling.AnonSlidingWindowThrottle',
+        'courier.throttling.UserSlidingWindowThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '30/minute',
@@ -189,3 +190,125 @@ LOGGING = {
 
 # Increase field limit for Admin panel (to support large city lists)
 DATA_UPLOAD_MAX_NUMBER_FIELDS = None
+
+# =============================================================================
+# RATE CARD SNAPSHOT
+# =============================================================================
+
+# Precompiled rate-card artifact written by `manage.py export_rate_snapshot`
+# and loaded at boot when present. Set to an empty value to disable.
+COURIER_RATE_SNAPSHOT_PATH = os.getenv(
+    "COURIER_RATE_SNAPSHOT_PATH",
+    str(BASE_DIR / "courier" / "data" / "rate_snapshot.msgpack"),
+)
+
+# =============================================================================
+# BATCH RATE COMPARISON
+# =============================================================================
+
+# Maximum number of shipments accepted by POST /api/compare-rates/batch
+COURIER_RATE_BATCH_MAX_SIZE = int(os.getenv("COURIER_RATE_BATCH_MAX_SIZE", "1000"))
+
+# =============================================================================
+# ASYNC (ASGI) QUOTES
+# =============================================================================
+
+# Threads per worker for blocking work from async views (bounds DB connections)
+COURIER_ASYNC_DB_THREADS = int(os.getenv("COURIER_ASYNC_DB_THREADS", "4"))
+# Seconds async workers keep rate cards in-process before refreshing
+COURIER_ASYNC_RATES_TTL = int(os.getenv("COURIER_ASYNC_RATES_TTL", "5"))
+
+# =============================================================================
+# HEALTH CHECKS
+# =============================================================================
+
+# Seconds /api/health/ready (and /api/health) reuse one readiness report
+COURIER_HEALTH_CACHE_SECONDS = int(os.getenv("COURIER_HEALTH_CACHE_SECONDS", "5"))
+
+# =============================================================================
+# THROTTLING
+# =============================================================================
+
+# Seconds between syncs of the in-memory throttle counters with the shared
+# cache (0 = count per worker process only)
+COURIER_THROTTLE_SYNC_INTERVAL = float(os.getenv("COURIER_THROTTLE_SYNC_INTERVAL", "1"))
+
+# =============================================================================
+# ADMIN TOKEN CACHE
+# =============================================================================
+
+# Seconds a verified X-Admin-Token skips the password hash check
+COURIER_ADMIN_TOKEN_CACHE_TTL = int(os.getenv("COURIER_ADMIN_TOKEN_CACHE_TTL", "300"))
+# Seconds, and how many, rejected tokens are remembered
+COURIER_ADMIN_TOKEN_NEGATIVE_TTL = int(os.getenv("COURIER_ADMIN_TOKEN_NEGATIVE_TTL", "60"))
+COURIER_ADMIN_TOKEN_NEGATIVE_CACHE_SIZE = int(os.getenv("COURIER_ADMIN_TOKEN_NEGATIVE_CACHE_SIZE", "1024"))
+
+# =============================================================================
+# ORDER LISTINGS
+# =============================================================================
+
+# ?count=estimate counts exactly when the planner expects fewer rows than this
+COURIER_EXACT_COUNT_THRESHOLD = int(os.getenv("COURIER_EXACT_COUNT_THRESHOLD", "10000"))
+
+# =============================================================================
+# REQUEST PROFILING
+# =============================================================================
+
+# Requests with "X-Profile-Token: <token>" are profiled (empty disables)
+COURIER_PROFILE_TOKEN = os.getenv("COURIER_PROFILE_TOKEN", "")
+# Fraction of all requests to profile (0 disables sampling)
+COURIER_PROFILE_SAMPLE_RATE = float(os.getenv("COURIER_PROFILE_SAMPLE_RATE", "0"))
+# Run sampled requests under cProfile too (token requests opt in per request)
+COURIER_PROFILE_CPROFILE = os.getenv("COURIER_PROFILE_CPROFILE", "False").lower() in ("true", "1", "yes")
+# Where cProfile dumps go, and how many are kept
+COURIER_PROFILE_DIR = os.getenv("COURIER_PROFILE_DIR", str(BASE_DIR / "profiles"))
+COURIER_PROFILE_MAX_FILES = int(os.getenv("COURIER_PROFILE_MAX_FILES", "100"))
+
+# =============================================================================
+# ORDER NUMBERS
+# =============================================================================
+
+# Order numbers each worker reserves per database round-trip
+COURIER_ORDER_NUMBER_BLOCK_SIZE = int(os.getenv("COURIER_ORDER_NUMBER_BLOCK_SIZE", "20"))
+
+# =============================================================================
+# BULK ORDER IMPORT
+# =============================================================================
+
+# Rows accepted per upload, and rows per INSERT
+COURIER_ORDER_IMPORT_MAX_ROWS = int(os.getenv("COURIER_ORDER_IMPORT_MAX_ROWS", "10000"))
+COURIER_ORDER_IMPORT_BATCH_SIZE = int(os.getenv("COURIER_ORDER_IMPORT_BATCH_SIZE", "1000"))
+
+# =============================================================================
+# ORDER PARTITIONING & ARCHIVAL
+# =============================================================================
+
+# Listings cover this many days unless ?since= says otherwise (0 lists everything)
+COURIER_ORDER_LIST_WINDOW_DAYS = int(os.getenv("COURIER_ORDER_LIST_WINDOW_DAYS", "365"))
+# Monthly order partitions kept ready ahead of the current month (PostgreSQL)
+COURIER_ORDER_PARTITION_MONTHS_AHEAD = int(os.getenv("COURIER_ORDER_PARTITION_MONTHS_AHEAD", "3"))
+# Delivered / cancelled orders older than this are moved to the archive, in batches
+COURIER_ORDER_ARCHIVE_AFTER_DAYS = int(os.getenv("COURIER_ORDER_ARCHIVE_AFTER_DAYS", "180"))
+COURIER_ORDER_ARCHIVE_BATCH_SIZE = int(os.getenv("COURIER_ORDER_ARCHIVE_BATCH_SIZE", "1000"))
+
+# =============================================================================
+# INVOICES
+# =============================================================================
+
+# Rendered invoice PDFs, one file per order version
+COURIER_INVOICE_CACHE_DIR = os.getenv("COURIER_INVOICE_CACHE_DIR", str(BASE_DIR / "invoices"))
+# Render processes per web worker (0 renders in the request thread)
+COURIER_INVOICE_WORKERS = int(os.getenv("COURIER_INVOICE_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Seconds a download waits for a render before answering 202 + Retry-After
+COURIER_INVOICE_RENDER_TIMEOUT = float(os.getenv("COURIER_INVOICE_RENDER_TIMEOUT", "10"))
+COURIER_INVOICE_BULK_MAX_ORDERS = int(os.getenv("COURIER_INVOICE_BULK_MAX_ORDERS", "500"))
+
+# =============================================================================
+# DRAFT RE-QUOTES
+# =============================================================================
+
+# Queue a re-quote of stored DRAFT quotes whenever rates or SystemConfig change
+COURIER_REQUOTE_ON_RATE_CHANGE = os.getenv("COURIER_REQUOTE_ON_RATE_CHANGE", "True").lower() in ("true", "1", "yes")
+# Orders re-priced (and locked) per transaction, and the pause between batches
+COURIER_REQUOTE_BATCH_SIZE = int(os.getenv("COURIER_REQUOTE_BATCH_SIZE", "200"))
+COURIER_REQUOTE_PAUSE_SECONDS = float(os.getenv("COURIER_REQUOTE_PAUSE_SECONDS", "0.2"))
@@ -1,8 +1,11 @@
-from django.contrib import admin
+import json
+
+from django.contrib import admin, messages
 from django.utils.html import format_html
 from django.db.models import Sum, Count
-from .models import Order, OrderStatus, PaymentMode, FTLOrder, Courier, CourierZoneRate, CityRoute, CustomZone, CustomZoneRate, DeliverySlab, SystemConfig
+from .models import Order, OrderArchive, OrderStatus, RequoteJob, PaymentMode, FTLOrder, Courier, CourierZoneRate, CityRoute, CustomZone, CustomZoneRate, DeliverySlab, SystemConfig
 from .models_refactored import FeeStructure, ServiceConstraints, FuelConfiguration, RoutingLogic
+from .rate_versions import draft_warning
 
 class FeeStructureInline(admin.StackedInline):
     model = FeeStructure
@@ -103,6 +106,12 @@ class CourierAdmin(admin.ModelAdmin):
     # We remove the fieldsets that referenced legacy fields because they will error if fields are deleted
     # Instead rely on Inlines
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        warning = draft_warning()
+        if warning:
+            messages.warning(request, warning)
+
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
@@ -244,3 +253,42 @@ class FTLOrderAdmin(admin.ModelAdmin):
         count = queryset.update(status=OrderStatus.CANCELLED)
         self.message_user(request, f'{count} FTL order(s) marked as cancelled.')
     mark_as_cancelled.short_description = "Mark selected FTL orders as CANCELLED"
+
+
+@admin.register(OrderArchive)
+class OrderArchiveAdmin(admin.ModelAdmin):
+    """Read-only lookup of orders moved out by the archive_orders command"""
+    list_display = ['order_number', 'kind', 'status', 'created_at', 'archived_at']
+    list_filter = ['kind', 'status']
+    search_fields = ['order_number']
+    fields = ['order_number', 'kind', 'order_id', 'status', 'created_at', 'archived_at', 'order_data']
+    readonly_fields = fields
+
+    def order_data(self, obj):
+        from courier.archive import unpack
+        return format_html('<pre>{}</pre>', json.dumps(unpack(obj.payload), indent=2))
+    order_data.short_description = "Archived row"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(RequoteJob)
+class RequoteJobAdmin(admin.ModelAdmin):
+    """Read-only report of the DRAFT re-quote jobs run by the requote_drafts command"""
+    list_display = ['id', 'status', 'reason', 'scanned', 'changed', 'total_delta', 'created_at', 'finished_at']
+    list_filter = ['status']
+    readonly_fields = [
+        'status', 'reason', 'carrier_ids', 'source_pincode', 'dest_pincode', 'run_after', 'cursor', 'scanned',
+        'changed', 'unserviceable', 'total_delta', 'largest_increase', 'largest_decrease', 'by_carrier', 'error',
+        'created_at', 'started_at', 'finished_at',
+    ]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -10,6 +10,11 @@ class CourierConfig(AppConfig):
         Register signal handlers when Django starts.
         
         Imports signals module to connect automatic cache invalidation
-        handlers to Courier model changes.
+        handlers to Courier model changes, and loads the precompiled
+        rate-card snapshot if one has been exported (no DB access here;
+        its version is checked in the background on first use).
         """
         import courier.signals  # noqa: F401 - Import registers signal handlers
+        from courier.snapshot import load_boot_snapshot
+
+        load_boot_snapshot()
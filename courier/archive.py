@@ -0,0 +1,101 @@
+"""
+Archival of finished orders.
+
+Delivered and cancelled orders older than COURIER_ORDER_ARCHIVE_AFTER_DAYS
+are moved out of orders / ftl_orders into ``OrderArchive``: one row per
+order holding the whole row as zlib-compressed JSON, plus the order
+number, status and created_at to find it again. Each batch is copied and
+deleted in one transaction, so an interrupted run never loses or
+duplicates an order and can simply be run again.
+
+On PostgreSQL the monthly partitions left empty by the move are dropped
+(see courier.partitioning).
+"""
+import logging
+import zlib
+from datetime import timedelta
+from typing import Dict, Iterable
+
+import msgspec
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from courier import partitioning
+from courier.models import FTLOrder, Order, OrderArchive, OrderStatus
+
+logger = logging.getLogger('courier')
+
+ARCHIVE_STATUSES = (OrderStatus.DELIVERED, OrderStatus.CANCELLED)
+ARCHIVED_MODELS = (
+    (OrderArchive.Kind.ORDER, Order),
+    (OrderArchive.Kind.FTL, FTLOrder),
+)
+COMPRESSION_LEVEL = 6
+
+
+def pack(row: dict) -> bytes:
+    return zlib.compress(msgspec.json.encode(row), COMPRESSION_LEVEL)
+
+
+def unpack(payload) -> dict:
+    """Archived row as stored: column name -> JSON value (dates and decimals as strings)."""
+    return msgspec.json.decode(zlib.decompress(bytes(payload)))
+
+
+def archive_cutoff(older_than_days: int = None):
+    if older_than_days is None:
+        older_than_days = getattr(settings, 'COURIER_ORDER_ARCHIVE_AFTER_DAYS', 180)
+    return timezone.now() - timedelta(days=older_than_days)
+
+
+def archive_orders(
+    older_than_days: int = None,
+    statuses: Iterable[str] = ARCHIVE_STATUSES,
+    batch_size: int = None,
+    dry_run: bool = False,
+) -> Dict:
+    """
+    Move finished orders created before the cutoff into OrderArchive.
+
+    Returns:
+        dict: {cutoff, dry_run, archived: {kind: count}, dropped_partitions}
+    """
+    cutoff = archive_cutoff(older_than_days)
+    batch_size = batch_size or getattr(settings, 'COURIER_ORDER_ARCHIVE_BATCH_SIZE', 1000)
+    statuses = list(statuses)
+    report = {"cutoff": cutoff, "dry_run": dry_run, "archived": {}, "dropped_partitions": []}
+
+    for kind, model in ARCHIVED_MODELS:
+        candidates = model.objects.filter(status__in=statuses, created_at__lt=cutoff)
+        if dry_run:
+            report["archived"][kind] = candidates.count()
+            continue
+
+        columns = [field.attname for field in model._meta.concrete_fields]
+        moved = 0
+        while True:
+            with transaction.atomic():
+                rows = list(candidates.order_by('created_at', 'id').values(*columns)[:batch_size])
+                if not rows:
+                    break
+                OrderArchive.objects.bulk_create([
+                    OrderArchive(
+                        kind=kind,
+                        order_id=row['id'],
+                        order_number=row['order_number'],
+                        status=row['status'],
+                        created_at=row['created_at'],
+                        payload=pack(row),
+                    )
+                    for row in rows
+                ])
+                model.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+            moved += len(rows)
+        report["archived"][kind] = moved
+        if moved:
+            logger.info(f"ORDER_ARCHIVE: Archived {moved} {kind} order(s) created before {cutoff:%Y-%m-%d}")
+
+    if not dry_run:
+        report["dropped_partitions"] = partitioning.drop_empty_partitions(partitioning.month_start(cutoff))
+    return report
@@ -1,8 +1,21 @@
 """
 Custom authentication for admin endpoints using X-Admin-Token header.
 Uses Django's password hashing for security.
+
+check_password() with the default PBKDF2 hasher costs tens of milliseconds
+of CPU, so verified tokens are remembered: only an HMAC digest of the
+token (keyed by SECRET_KEY) is kept, for COURIER_ADMIN_TOKEN_CACHE_TTL
+seconds, and compared in constant time. Rejected tokens go into a bounded
+negative cache for COURIER_ADMIN_TOKEN_NEGATIVE_TTL seconds so a client
+repeating a bad token does not trigger a hash each time.
 """
+import hashlib
+import hmac
 import secrets
+import threading
+import time
+from collections import OrderedDict
+
 from rest_framework import authentication
 from rest_framework import exceptions
 from django.conf import settings
@@ -11,6 +24,65 @@ import logging
 
 logger = logging.getLogger('courier')
 
+_token_lock = threading.Lock()
+# (digest, expires_at) of the last verified token
+_verified_token = None
+# digest -> expires_at of recently rejected tokens, oldest first
+_rejected_tokens = OrderedDict()
+
+
+def _token_digest(token):
+    # Bound to the current hash, so rotating ADMIN_PASSWORD_HASH invalidates the cache
+    message = f"{settings.ADMIN_PASSWORD_HASH}\0{token}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).digest()
+
+
+def check_admin_token(token):
+    """
+    Check an X-Admin-Token value against ADMIN_PASSWORD_HASH.
+
+    Same result as check_password(token, settings.ADMIN_PASSWORD_HASH), but
+    successful and failed checks are cached (see module docstring).
+    """
+    global _verified_token
+    if not token or not settings.ADMIN_PASSWORD_HASH:
+        return False
+
+    digest = _token_digest(token)
+    now = time.monotonic()
+    with _token_lock:
+        verified = _verified_token
+        if verified is not None and verified[1] > now and hmac.compare_digest(verified[0], digest):
+            return True
+        rejected_until = _rejected_tokens.get(digest)
+        if rejected_until is not None:
+            if rejected_until > now:
+                return False
+            del _rejected_tokens[digest]
+
+    valid = check_password(token, settings.ADMIN_PASSWORD_HASH)
+
+    with _token_lock:
+        if valid:
+            ttl = getattr(settings, 'COURIER_ADMIN_TOKEN_CACHE_TTL', 300)
+            _verified_token = (digest, now + ttl)
+        else:
+            ttl = getattr(settings, 'COURIER_ADMIN_TOKEN_NEGATIVE_TTL', 60)
+            _rejected_tokens[digest] = now + ttl
+            _rejected_tokens.move_to_end(digest)
+            max_size = getattr(settings, 'COURIER_ADMIN_TOKEN_NEGATIVE_CACHE_SIZE', 1024)
+            while len(_rejected_tokens) > max_size:
+                _rejected_tokens.popitem(last=False)
+    return valid
+
+
+def clear_admin_token_cache():
+    """Forget verified and rejected tokens (tests, password rotation)."""
+    global _verified_token
+    with _token_lock:
+        _verified_token = None
+        _rejected_tokens.clear()
+
 
 class AdminTokenAuthentication(authentication.BaseAuthentication):
     """
@@ -36,7 +108,7 @@ class AdminTokenAuthentication(authentication.BaseAuthentication):
                 return None
 
             # Verify token against hashed password
-            if not check_password(token, settings.ADMIN_PASSWORD_HASH):
+            if not check_admin_token(token):
                 logger.warning(
                     f"UNAUTHORIZED_ACCESS_ATTEMPT: Invalid admin token from {request.META.get('REMOTE_ADDR')} "
                     f"to {path}"
@@ -79,7 +151,7 @@ def verify_admin_token(request):
         )
         raise exceptions.PermissionDenied("Missing Admin Token")
 
-    if not check_password(token, settings.ADMIN_PASSWORD_HASH):
+    if not check_admin_token(token):
         logger.warning(
             f"UNAUTHORIZED_ACCESS_ATTEMPT: Invalid admin token from {request.META.get('REMOTE_ADDR')}"
         )
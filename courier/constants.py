@@ -53,10 +53,12 @@ class CSVFiles:
 class CacheKeys:
     """Cache key constants for Django cache."""
     
-    CARRIER_RATE_CARDS = "carrier_rate_cards"
+    CARRIER_RATE_CARDS = "carrier_rate_cards"  # Holds a RateCardSnapshot
     FTL_RATE_CARDS = "ftl_rate_cards"
+    RATE_CARD_SCHEDULE = "rate_card_schedule"  # [(effective_from, version_id), ...]
     PINCODE_MASTER = "pincode_master"
     PINCODE_LOOKUP = "pincode_{}"  # Format with pincode number
+    THROTTLE_WINDOW = "throttle_window_{}_{}"  # Format with throttle key, window index
     
     @staticmethod
     def pincode_lookup(pincode: int) -> str:
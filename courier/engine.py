@@ -18,7 +18,8 @@ class CostCalculator:
     Breaks down the massive calculate_cost function into manageable steps.
     """
     def __init__(self, weight: float, source_pincode: int, dest_pincode: int, 
-                 carrier_data: Dict[str, Any], is_cod: bool = False, order_value: float = 0):
+                 carrier_data: Dict[str, Any], is_cod: bool = False, order_value: float = 0,
+                 system_config: Optional[Dict[str, Any]] = None):
         """
         Initialize the calculator with order and carrier details.
 
@@ -29,6 +30,8 @@ class CostCalculator:
             carrier_data (Dict[str, Any]): Dictionary containing carrier's rate card and config.
             is_cod (bool, optional): Whether payment mode is COD. Defaults to False.
             order_value (float, optional): Declared value of the shipment. Defaults to 0.
+            system_config (Dict[str, Any], optional): Global pricing config (GST, escalation,
+                diesel prices) from a rate card snapshot. Read from SystemConfig if omitted.
         """
         self.weight = float(weight)
         if self.weight <= 0:
@@ -39,6 +42,7 @@ class CostCalculator:
         self.carrier_data = carrier_data
         self.is_cod = is_cod
         self.order_value = float(order_value)
+        self._system_config = system_config
         
         # State extracted during calculation
         self.zone_id: Optional[str] = None
@@ -53,6 +57,14 @@ class CostCalculator:
         self.min_weight: float = carrier_data.get("min_weight", 0)
         self.error_msg: str = ""
 
+    @property
+    def system_config(self) -> Dict[str, Any]:
+        """Global pricing config, loaded from the DB at most once per calculation."""
+        if self._system_config is None:
+            from courier.snapshot import system_config_dict
+            self._system_config = system_config_dict(SystemConfig.get_solo())
+        return self._system_config
+
     def calculate(self) -> Dict[str, Any]:
         """
         Main orchestrator method for cost calculation.
@@ -215,7 +227,7 @@ class CostCalculator:
 
     def _calculate_csv_pricing(self, freight_min):
         """Helper for CSV/Region pricing (complex edl logic)"""
-        default_csv = SystemConfig.get_solo().default_servicable_csv
+        default_csv = self.system_config["default_servicable_csv"]
         csv_file = self.carrier_data.get("routing_logic", {}).get("csv_file", default_csv)
         bd_details = zones.get_csv_region_details(self.dest_pincode, csv_file)
         
@@ -338,10 +350,10 @@ class CostCalculator:
     def _calc_fuel(self, base_amount):
         fuel_config = self.carrier_data.get("fuel_config", {})
         if fuel_config.get("is_dynamic"):
-            conf = SystemConfig.get_solo()
-            base_diesel = fuel_config.get("base_diesel_price", float(conf.base_diesel_price))
-            diesel_ratio = fuel_config.get("diesel_ratio", float(conf.fuel_surcharge_ratio))
-            current_diesel = float(conf.diesel_price_current)
+            conf = self.system_config
+            base_diesel = fuel_config.get("base_diesel_price", conf["base_diesel_price"])
+            diesel_ratio = fuel_config.get("diesel_ratio", conf["fuel_surcharge_ratio"])
+            current_diesel = conf["diesel_price_current"]
             fuel_pct = (current_diesel - base_diesel) * diesel_ratio / 100
             return base_amount * fuel_pct
         else:
@@ -435,8 +447,8 @@ class CostCalculator:
         surcharges_total = sum(surcharges.values())
         
         # Profit Margin (Escalation) - Applied only on base freight
-        conf = SystemConfig.get_solo()
-        escalation_rate = float(conf.escalation_rate)
+        conf = self.system_config
+        escalation_rate = conf["escalation_rate"]
         profit_margin = self.freight_cost * escalation_rate
         
         # Financials
@@ -444,7 +456,7 @@ class CostCalculator:
         customer_subtotal = base_transport_cost + profit_margin + surcharges_total
         
         # GST
-        gst_rate = float(conf.gst_rate)
+        gst_rate = conf["gst_rate"]
         gst_amount = customer_subtotal * gst_rate
         final_total = customer_subtotal + gst_amount
         
@@ -490,6 +502,7 @@ def calculate_cost(
     carrier_data: Dict[str, Any],
     is_cod: bool = False,
     order_value: float = 0,
+    system_config: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
     Calculate shipping cost for a carrier.
@@ -504,6 +517,8 @@ def calculate_cost(
         carrier_data (Dict[str, Any]): Carrier configuration.
         is_cod (bool): Is Cash on Delivery.
         order_value (float): Value of the order.
+        system_config (Dict[str, Any], optional): Pricing config of the rate card
+            version being quoted. Read from SystemConfig if omitted.
 
     Returns:
         Dict[str, Any]: Calculation result with total_cost, breakdown, and serviceable status.
@@ -513,7 +528,7 @@ def calculate_cost(
         for better testability and clearer object-oriented design.
     """
     calculator = CostCalculator(
-        weight, source_pincode, dest_pincode, carrier_data, is_cod, order_value
+        weight, source_pincode, dest_pincode, carrier_data, is_cod, order_value, system_config
     )
     return calculator.calculate()
 
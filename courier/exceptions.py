@@ -45,3 +45,30 @@ class NoRatesAvailableError(CourierError):
 class UnsupportedRouteError(CourierError):
     """Raised when a specific route is known to be serviceable but not by specific carriers."""
     pass
+
+class SnapshotError(CourierError):
+    """Raised when a rate-card snapshot file is missing, corrupt or incompatible."""
+    def __init__(self, path, reason):
+        super().__init__(
+            f"Rate card snapshot {path} rejected: {reason}",
+            code="SNAPSHOT_INVALID",
+            details={"path": str(path), "reason": reason}
+        )
+
+class RateCardImportError(CourierError):
+    """Raised when a rate card document fails validation during import."""
+    def __init__(self, errors):
+        super().__init__(
+            f"Rate card import rejected: {len(errors)} error(s).",
+            code="RATE_CARD_INVALID",
+            details={"errors": errors}
+        )
+
+class OrderImportError(CourierError):
+    """Raised when a bulk order upload cannot be read at all (row errors are reported, not raised)."""
+    def __init__(self, reason):
+        super().__init__(
+            f"Order import rejected: {reason}",
+            code="ORDER_IMPORT_INVALID",
+            details={"reason": reason}
+        )
@@ -0,0 +1,151 @@
+"""
+Liveness and readiness checks.
+
+Probes hit these every few seconds per container, so nothing here may do
+expensive work: the readiness report only inspects what the process has
+already loaded (it never compiles rate cards or reads CSVs) plus one
+trivial database round-trip, and the whole report is cached in-process
+for COURIER_HEALTH_CACHE_SECONDS (default 5).
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from courier import zones
+from courier.constants import CacheKeys
+from courier.rate_versions import get_active_version_id, peek_version_snapshot
+from courier.snapshot import RateCardSnapshot, get_boot_snapshot
+
+logger = logging.getLogger('courier')
+
+_lock = threading.Lock()
+# (report, expires_at)
+_report: Optional[Tuple[Dict[str, Any], float]] = None
+
+
+def _timestamp(epoch: Optional[float]) -> Optional[str]:
+    if epoch is None:
+        return None
+    return datetime.fromtimestamp(epoch, tz=dt_timezone.utc).isoformat()
+
+
+def peek_rate_snapshot() -> Tuple[Optional[RateCardSnapshot], Optional[str]]:
+    """
+    The rate cards load_rates() would serve, without loading any.
+
+    Returns:
+        tuple: (snapshot or None, source) where source is "version",
+        "cache" or "boot".
+    """
+    version_id = get_active_version_id()
+    if version_id is not None:
+        return peek_version_snapshot(version_id), "version"
+
+    snapshot = cache.get(CacheKeys.CARRIER_RATE_CARDS)
+    if isinstance(snapshot, RateCardSnapshot):
+        return snapshot, "cache"
+
+    return get_boot_snapshot(verify=False), "boot"
+
+
+def check_database() -> Dict[str, Any]:
+    from courier.models import SystemConfig
+
+    start = time.perf_counter()
+    try:
+        rate_card_version = SystemConfig.get_rate_card_version()
+    except Exception as e:
+        logger.error(f"HEALTH_CHECK: Database check failed: {e}")
+        return {"ok": False, "error": str(e)}
+    return {
+        "ok": True,
+        "vendor": connection.vendor,
+        "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+        "rate_card_version": rate_card_version,
+    }
+
+
+def check_pincode_index() -> Dict[str, Any]:
+    return {
+        "ok": len(zones.PINCODE_LOOKUP) > 0,
+        "count": len(zones.PINCODE_LOOKUP),
+        "data_modified_at": _timestamp(zones.PINCODE_DATA_MTIME),
+        "loaded_at": _timestamp(zones.PINCODE_LOADED_AT),
+    }
+
+
+def check_region_store() -> Dict[str, Any]:
+    # Region CSVs load lazily on first use; report what is loaded so far
+    return {
+        "ok": True,
+        "files": {
+            filename: {"count": len(rows), "loaded_at": _timestamp(zones.CSV_LOADED_AT.get(filename))}
+            for filename, rows in list(zones.CSV_CACHE.items())
+        },
+    }
+
+
+def check_rate_cards() -> Dict[str, Any]:
+    try:
+        snapshot, source = peek_rate_snapshot()
+    except Exception as e:
+        logger.error(f"HEALTH_CHECK: Rate card check failed: {e}")
+        return {"ok": False, "error": str(e)}
+
+    if snapshot is None:
+        # Not loaded yet; the first quote compiles them
+        return {"ok": True, "loaded": False}
+    return {
+        "ok": True,
+        "loaded": True,
+        "source": source,
+        "carrier_count": len(snapshot.carriers),
+        "version": snapshot.version,
+        "version_id": snapshot.version_id,
+        "built_at": snapshot.built_at,
+    }
+
+
+def build_readiness_report() -> Dict[str, Any]:
+    """Run every check now. Ready means the database answers and pincodes are loaded."""
+    checks = {
+        "database": check_database(),
+        "pincode_index": check_pincode_index(),
+        "region_store": check_region_store(),
+        "rate_cards": check_rate_cards(),
+    }
+    ready = all(check["ok"] for check in checks.values())
+    return {
+        "status": "ready" if ready else "not_ready",
+        "checked_at": datetime.now(tz=dt_timezone.utc).isoformat(),
+        "checks": checks,
+    }
+
+
+def get_readiness_report() -> Dict[str, Any]:
+    """Readiness report, recomputed at most once per COURIER_HEALTH_CACHE_SECONDS."""
+    global _report
+    report = _report
+    if report is not None and report[1] > time.monotonic():
+        return report[0]
+
+    # One thread recomputes; concurrent probes wait for its result
+    with _lock:
+        if _report is not None and _report[1] > time.monotonic():
+            return _report[0]
+        result = build_readiness_report()
+        ttl = getattr(settings, 'COURIER_HEALTH_CACHE_SECONDS', 5)
+        _report = (result, time.monotonic() + ttl)
+        return result
+
+
+def clear_readiness_report():
+    """Drop the cached report (tests)."""
+    global _report
+    _report = None
@@ -0,0 +1,384 @@
+"""
+Invoice PDFs: rendering, the on-disk cache and the render pool.
+
+An invoice is rendered once per order version and kept under
+COURIER_INVOICE_CACHE_DIR as ``<id // 1000>/<id>_<updated_at>_v<TEMPLATE_VERSION>.pdf``;
+later downloads are served from that file. Saving the order (or bumping
+TEMPLATE_VERSION after a layout change) moves it to a new file name, and
+the stale version is removed when the new one is written.
+
+Renders run on a process pool of COURIER_INVOICE_WORKERS spawned workers
+(0 renders in the calling thread), so reportlab's CPU time is spent
+outside the web process's GIL. Workers only see a plain snapshot of the
+order (``invoice_context``) and write the PDF themselves - a render keeps
+going and lands in the cache even if the request that asked for it gives
+up. Concurrent requests for the same invoice share one render.
+
+The layout itself is one shared ``InvoiceTemplate`` per process: styles and
+the static header/footer are built at import, each render only fills in
+the order's fields.
+"""
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from functools import partial
+from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Tuple
+
+from django.conf import settings
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import BaseDocTemplate, Frame, PageTemplate, Paragraph, Spacer, Table, TableStyle
+
+logger = logging.getLogger('courier')
+
+# Bump when the layout changes so cached PDFs are rendered again
+TEMPLATE_VERSION = 2
+
+# Order fields the invoice prints (copied into the snapshot sent to workers)
+INVOICE_FIELDS = [
+    'id', 'order_number', 'created_at', 'status', 'awb_number',
+    'sender_name', 'sender_address', 'sender_pincode', 'sender_phone',
+    'recipient_name', 'recipient_address', 'recipient_pincode', 'recipient_phone', 'recipient_email',
+    'item_type', 'sku', 'quantity', 'weight', 'length', 'width', 'height', 'item_amount',
+    'total_cost', 'cost_breakdown',
+]
+
+
+def invoice_context(order) -> Dict:
+    """Picklable snapshot of what the invoice shows for ``order``."""
+    context = {field: getattr(order, field) for field in INVOICE_FIELDS}
+    context['carrier_name'] = order.carrier.name if order.carrier_id else None
+    return context
+
+
+def invoice_queryset():
+    """Orders with just the columns an invoice (and its cache key) needs."""
+    from courier.models import Order
+
+    return Order.objects.select_related('carrier').only(*INVOICE_FIELDS, 'updated_at', 'carrier__name')
+
+
+def invoice_filename(order) -> str:
+    return f"Invoice_{order.order_number}.pdf"
+
+
+def cache_dir() -> Path:
+    return Path(getattr(settings, 'COURIER_INVOICE_CACHE_DIR', Path(settings.BASE_DIR) / 'invoices'))
+
+
+def cache_path(order) -> Path:
+    version = int(order.updated_at.timestamp() * 1_000_000)
+    return cache_dir() / f"{order.pk // 1000:04d}" / f"{order.pk}_{version}_v{TEMPLATE_VERSION}.pdf"
+
+
+class InvoiceTemplate:
+    """
+    The invoice layout, built once and shared.
+
+    Styles, table styles and the static text (title, company block, footer)
+    are prepared here and never modified afterwards. The title, company
+    block, invoice details and footer are drawn straight onto the canvas
+    by the page template, so per-order work is only the address, shipment
+    and cost tables. Flowables and documents hold layout state while they
+    are built, so render() creates its own; everything shared is read-only
+    and one instance serves every thread.
+    """
+    page_size = letter
+    margin = 40
+    # Header block baselines below the block top (the bold first line sits in a
+    # taller row) and the space the block takes before the 30pt gap to the body
+    header_offsets = [16, 46, 64, 82, 100]
+    header_height = 96
+    column_widths = [3.5 * inch, 3 * inch]
+
+    company_lines = [
+        ('Helvetica-Bold', "Courier Module Inc."),
+        ('Helvetica', "123 Logistics Way"),
+        ('Helvetica', "Tech Park, Bangalore 560100"),
+        ('Helvetica', "support@couriermodule.com"),
+        ('Helvetica', "+91 98765 43210"),
+    ]
+    footer_text = "Thank you for using Courier Module Inc. This is a computer-generated invoice."
+
+    def __init__(self):
+        styles = getSampleStyleSheet()
+        self.normal_style = styles['Normal']
+        # Centred copy: the sample Heading1 stays as reportlab ships it
+        self.title_style = ParagraphStyle('InvoiceTitle', parent=styles['Heading1'], alignment=TA_CENTER)
+        self.bold_style = ParagraphStyle('Bold', parent=self.normal_style, fontName='Helvetica-Bold')
+        self.footer_style = ParagraphStyle('Footer', parent=self.normal_style, alignment=TA_CENTER,
+                                           fontSize=8, textColor=colors.grey)
+
+        self.block_style = TableStyle([('LEFTPADDING', (0,0), (-1,-1), 0)])
+        self.address_style = TableStyle([
+            ('VALIGN', (0,0), (-1,-1), 'TOP'),
+            ('LINEBELOW', (0,0), (1,0), 0.5, colors.lightgrey),
+            ('BOTTOMPADDING', (0,0), (1,0), 20),
+        ])
+        self.item_style = TableStyle([
+            ('BACKGROUND', (0,0), (-1,0), colors.Color(0.12, 0.23, 0.54)), # Brand blue
+            ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
+            ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0,0), (-1,0), 10),
+            ('BOTTOMPADDING', (0,0), (-1,0), 12),
+            ('BACKGROUND', (0,1), (-1,-1), colors.whitesmoke),
+            ('GRID', (0,0), (-1,-1), 1, colors.black),
+        ])
+        self.item_widths = [2*inch, 1*inch, 0.5*inch, 1*inch, 1.5*inch, 1*inch]
+        self.item_header = ["Description", "SKU", "Qty", "Weight (kg)", "Dimensions (cm)", "Amount (₹)"]
+        self.cost_style = TableStyle([
+            ('ALIGN', (0,0), (-1,-1), 'RIGHT'),
+            ('FONTNAME', (0,-1), (-1,-1), 'Helvetica-Bold'), # Total row bold
+            ('LINEABOVE', (0,-1), (-1,-1), 1, colors.black),
+        ])
+
+        # Header geometry, matching the flowing layout this replaced: title,
+        # 20pt gap, the two five-line blocks side by side, then the frame.
+        width, height = self.page_size
+        content_width = width - 2 * self.margin
+        top = height - self.margin - 6  # frame padding
+        self.title_y = top - self.title_style.fontSize
+        header_top = top - self.title_style.leading - self.title_style.spaceAfter - 20
+        self.header_ys = [header_top - offset for offset in self.header_offsets]
+        self.left_x = self.margin + (content_width - sum(self.column_widths)) / 2 + 6
+        self.right_x = self.left_x + self.column_widths[0]
+        self.invoice_label_width = stringWidth("Invoice #: ", 'Helvetica-Bold', self.normal_style.fontSize)
+        self.frame_top = header_top - self.header_height - 30
+        self.footer_y = self.margin
+
+    def _draw_page(self, invoice_lines, canvas, doc):
+        """onPage callback: the title, both header blocks and the footer."""
+        width = self.page_size[0]
+        font_size = self.normal_style.fontSize
+        canvas.saveState()
+
+        canvas.setFont(self.title_style.fontName, self.title_style.fontSize)
+        canvas.setFillColor(self.title_style.textColor)
+        canvas.drawCentredString(width / 2, self.title_y, "INVOICE")
+
+        canvas.setFillColor(self.normal_style.textColor)
+        for y, (font, text) in zip(self.header_ys, self.company_lines):
+            canvas.setFont(font, font_size)
+            canvas.drawString(self.left_x, y, text)
+
+        order_number, *lines = invoice_lines
+        canvas.setFont('Helvetica-Bold', font_size)
+        canvas.drawString(self.right_x, self.header_ys[0], "Invoice #:")
+        canvas.setFont('Helvetica', font_size)
+        canvas.drawString(self.right_x + self.invoice_label_width, self.header_ys[0], order_number)
+        for y, text in zip(self.header_ys[1:], lines):
+            canvas.drawString(self.right_x, y, text)
+
+        canvas.setFont(self.footer_style.fontName, self.footer_style.fontSize)
+        canvas.setFillColor(self.footer_style.textColor)
+        canvas.drawCentredString(width / 2, self.footer_y, self.footer_text)
+        canvas.restoreState()
+
+    def _elements(self, order) -> List:
+        normal_style, bold_style = self.normal_style, self.bold_style
+        elements = []
+
+        # --- Addresses ---
+        # Sender (Left) & Recipient (Right)
+        sender_info = [
+            [Paragraph("<b>Sender Details:</b>", bold_style)],
+            [order.sender_name or "N/A"],
+            [Paragraph(order.sender_address or "", normal_style)],
+            [f"Pincode: {order.sender_pincode}"],
+            [f"Phone: {order.sender_phone or 'N/A'}"]
+        ]
+
+        recipient_info = [
+            [Paragraph("<b>Recipient Details:</b>", bold_style)],
+            [order.recipient_name],
+            [Paragraph(order.recipient_address, normal_style)],
+            [f"Pincode: {order.recipient_pincode}"],
+            [f"Phone: {order.recipient_phone or 'N/A'}"],
+            [f"Email: {order.recipient_email or 'N/A'}"]
+        ]
+
+        address_data = [[
+            Table(sender_info, style=self.block_style),
+            Table(recipient_info, style=self.block_style)
+        ]]
+        elements.append(Table(address_data, colWidths=self.column_widths, style=self.address_style))
+        elements.append(Spacer(1, 30))
+
+        # --- Item Details ---
+        elements.append(Paragraph("<b>Shipment Details:</b>", normal_style))
+        elements.append(Spacer(1, 10))
+
+        item_row = [
+            order.item_type or "Package",
+            order.sku or "-",
+            str(order.quantity),
+            str(order.weight),
+            f"{order.length}x{order.width}x{order.height}",
+            f"{order.item_amount:.2f}"
+        ]
+        elements.append(Table([self.item_header, item_row], colWidths=self.item_widths, style=self.item_style))
+        elements.append(Spacer(1, 20))
+
+        # --- Cost Breakdown ---
+        if order.total_cost:
+            breakdown = order.cost_breakdown or {}
+            freight = breakdown.get('freight_charge', 0)
+            # Surcharges (sum of others)
+            surcharges = sum(v for k, v in breakdown.items()
+                             if k not in ('freight_charge', 'total_charge') and isinstance(v, (int, float)))
+            cost_data = [
+                ["Freight Charges:", f"₹{freight:.2f}"],
+                ["Surcharges/Taxes:", f"₹{surcharges:.2f}"],
+                ["Total Shipping Cost:", f"₹{order.total_cost:.2f}"],
+            ]
+            elements.append(Table(cost_data, colWidths=[5.5*inch, 1.5*inch], style=self.cost_style))
+        return elements
+
+    def render(self, context: Dict, invariant: bool = False) -> bytes:
+        """
+        PDF bytes for an ``invoice_context`` snapshot. ``invariant`` fixes the
+        creation date and document id so identical input gives identical bytes.
+        """
+        order = SimpleNamespace(**context)
+        invoice_lines = [
+            order.order_number,
+            f"Date: {order.created_at.strftime('%Y-%m-%d')}",
+            f"Status: {order.status.upper()}",
+            f"Carrier: {order.carrier_name or 'N/A'}",
+            f"AWB: {order.awb_number or 'N/A'}",
+        ]
+
+        buffer = BytesIO()
+        doc = BaseDocTemplate(buffer, pagesize=self.page_size,
+                              rightMargin=self.margin, leftMargin=self.margin,
+                              topMargin=self.margin, bottomMargin=self.margin,
+                              title=f"Invoice {order.order_number}", invariant=int(invariant))
+        # Leave room for the footer below the frame
+        bottom = self.footer_y + 2 * self.footer_style.leading
+        frame = Frame(self.margin, bottom, self.page_size[0] - 2 * self.margin, self.frame_top - bottom,
+                      leftPadding=0, rightPadding=0, topPadding=0, bottomPadding=0, id='body')
+        doc.addPageTemplates([
+            PageTemplate(id='invoice', frames=[frame], onPage=partial(self._draw_page, invoice_lines)),
+        ])
+        doc.build(self._elements(order))
+        return buffer.getvalue()
+
+
+invoice_template = InvoiceTemplate()
+
+
+def render_invoice(context: Dict) -> bytes:
+    """Render the invoice PDF for an ``invoice_context`` snapshot."""
+    return invoice_template.render(context)
+
+
+def render_to_file(context: Dict, path: str) -> str:
+    """
+    Render ``context`` to ``path`` (atomically) and remove the order's older
+    cached versions. Runs in a pool worker.
+    """
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    pdf = render_invoice(context)
+
+    fd, tmp = tempfile.mkstemp(dir=target.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(pdf)
+        os.replace(tmp, target)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+    for stale in target.parent.glob(f"{context['id']}_*.pdf"):
+        if stale != target:
+            stale.unlink(missing_ok=True)
+    return path
+
+
+class InvoiceRenderer:
+    """Hands renders to the process pool, one in-flight render per cache file."""
+
+    def __init__(self, workers: int = None):
+        self._workers = workers
+        self._executor = None
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def workers(self) -> int:
+        if self._workers is not None:
+            return self._workers
+        return getattr(settings, 'COURIER_INVOICE_WORKERS', min(4, os.cpu_count() or 1))
+
+    def _get_executor(self):
+        if self._executor is None:
+            # spawn: workers start clean instead of inheriting request threads' locks and DB sockets
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._executor
+
+    def submit(self, order) -> Future:
+        """Future for the path of ``order``'s cached invoice; already done on a cache hit."""
+        path = str(cache_path(order))
+        if os.path.exists(path):
+            future = Future()
+            future.set_result(path)
+            return future
+
+        with self._lock:
+            future = self._pending.get(path)
+            if future is not None:
+                return future
+            if self.workers:
+                future = self._get_executor().submit(render_to_file, invoice_context(order), path)
+            else:
+                future = Future()
+            self._pending[path] = future
+        future.add_done_callback(lambda _: self._forget(path))
+
+        if not self.workers:
+            try:
+                future.set_result(render_to_file(invoice_context(order), path))
+            except Exception as e:
+                future.set_exception(e)
+        logger.info(f"INVOICE: Rendering {order.order_number}")
+        return future
+
+    def _forget(self, path: str):
+        with self._lock:
+            self._pending.pop(path, None)
+
+    def render(self, order, timeout: float = None) -> str:
+        """Path of ``order``'s invoice, rendering it if needed (raises TimeoutError)."""
+        if timeout is None:
+            timeout = getattr(settings, 'COURIER_INVOICE_RENDER_TIMEOUT', 10)
+        return self.submit(order).result(timeout=timeout)
+
+    def render_many(self, orders) -> Iterator[Tuple[object, Future]]:
+        """(order, finished future) for every order, in the order renders finish."""
+        futures = {self.submit(order): order for order in orders}
+        for future in as_completed(futures):
+            yield futures[future], future
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._pending.clear()
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+renderer = InvoiceRenderer()
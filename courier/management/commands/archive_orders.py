@@ -0,0 +1,82 @@
+"""
+Django management command to archive finished orders.
+
+Moves delivered and cancelled orders (regular and FTL) older than
+COURIER_ORDER_ARCHIVE_AFTER_DAYS into the compressed order_archive table.
+On PostgreSQL it also creates the coming months' order partitions and
+drops partitions the move left empty. Safe to run repeatedly (e.g. nightly
+from cron).
+
+Usage:
+    python manage.py archive_orders
+    python manage.py archive_orders --older-than-days 365 --dry-run
+    python manage.py archive_orders --status delivered
+"""
+from django.core.management.base import BaseCommand, CommandError
+from courier import partitioning
+from courier.archive import ARCHIVE_STATUSES, archive_orders
+from courier.models import OrderStatus
+
+
+class Command(BaseCommand):
+    help = 'Move old delivered / cancelled orders into the order archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days',
+            type=int,
+            help='Archive orders created more than this many days ago (default: COURIER_ORDER_ARCHIVE_AFTER_DAYS)',
+        )
+        parser.add_argument(
+            '--status',
+            action='append',
+            dest='statuses',
+            help=f'Status to archive, repeatable (default: {", ".join(ARCHIVE_STATUSES)})',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Orders moved per transaction (default: COURIER_ORDER_ARCHIVE_BATCH_SIZE)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count what would be archived; change nothing',
+        )
+
+    def handle(self, *args, **options):
+        statuses = options['statuses'] or list(ARCHIVE_STATUSES)
+        unknown = sorted(set(statuses) - set(OrderStatus.values))
+        if unknown:
+            raise CommandError(f'Unknown status: {", ".join(unknown)}')
+        if options['older_than_days'] is not None and options['older_than_days'] < 0:
+            raise CommandError('--older-than-days must not be negative')
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Archiving {"/".join(statuses)} orders{" (dry run)" if options["dry_run"] else ""}...'
+        ))
+
+        if not options['dry_run'] and partitioning.supports_partitioning():
+            partitions = partitioning.ensure_partitions()
+            if partitions:
+                self.stdout.write(f'  ✓ Partitions ready through {partitions[-1]}')
+
+        report = archive_orders(
+            older_than_days=options['older_than_days'],
+            statuses=statuses,
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+        )
+
+        for kind, count in report['archived'].items():
+            self.stdout.write(f'  {kind:6} {count} {"to archive" if report["dry_run"] else "archived"}')
+        for name in report['dropped_partitions']:
+            self.stdout.write(f'  ✓ Dropped empty partition {name}')
+
+        self.stdout.write('\n' + '='*60)
+        total = sum(report['archived'].values())
+        verb = 'would be archived' if report['dry_run'] else 'archived'
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ {total} order(s) created before {report["cutoff"]:%Y-%m-%d} {verb}'
+        ))
+        self.stdout.write('='*60)
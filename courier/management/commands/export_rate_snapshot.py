@@ -0,0 +1,75 @@
+"""
+Django management command to export a precompiled rate-card snapshot.
+
+The snapshot holds the compiled rate cards of all active carriers, the FTL
+rate table and the system config, tagged with the current rate card version.
+Workers load it at boot instead of compiling rate cards from the database.
+
+Usage:
+    python manage.py export_rate_snapshot
+    python manage.py export_rate_snapshot --output /srv/app/rate_snapshot.msgpack
+    python manage.py export_rate_snapshot --verify --verbose
+"""
+import os
+from django.core.management.base import BaseCommand, CommandError
+from courier.exceptions import SnapshotError
+from courier.snapshot import build_snapshot, dump_snapshot, read_snapshot, get_snapshot_path, DEFAULT_SNAPSHOT_PATH
+
+
+class Command(BaseCommand):
+    help = 'Export a precompiled rate-card snapshot for fast worker startup'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            help='Snapshot file path (default: COURIER_RATE_SNAPSHOT_PATH)',
+        )
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Read the written file back and check it matches',
+        )
+        parser.add_argument(
+            '--verbose',
+            action='store_true',
+            help='Display detailed information about each exported carrier',
+        )
+
+    def handle(self, *args, **options):
+        verbose = options.get('verbose', False)
+        output_path = options.get('output') or get_snapshot_path() or DEFAULT_SNAPSHOT_PATH
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Exporting rate card snapshot...'))
+        self.stdout.write(f'Output path: {output_path}\n')
+
+        snapshot = build_snapshot()
+        if not snapshot.carriers:
+            self.stdout.write(self.style.WARNING('No active couriers found in database!'))
+
+        if verbose:
+            for carrier in snapshot.carriers:
+                self.stdout.write(
+                    f'  ✓ {carrier["carrier_name"]} ({carrier.get("mode")}, '
+                    f'{carrier.get("logic")})'
+                )
+            self.stdout.write(f'  ✓ FTL rate table: {len(snapshot.ftl_rates)} source cities')
+
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        size = dump_snapshot(snapshot, output_path)
+
+        if options.get('verify'):
+            try:
+                loaded = read_snapshot(output_path)
+            except SnapshotError as e:
+                raise CommandError(e.message)
+            if loaded.to_payload() != snapshot.to_payload():
+                raise CommandError(f'Snapshot read back from {output_path} does not match what was written')
+            self.stdout.write('  ✓ Verified checksum and contents')
+
+        self.stdout.write('\n' + '='*60)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✓ Exported snapshot v{snapshot.version}: {len(snapshot)} carrier(s), {size / 1024:.1f} KB'
+            )
+        )
+        self.stdout.write('='*60)
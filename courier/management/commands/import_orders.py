@@ -0,0 +1,80 @@
+"""
+Django management command to bulk create orders from a CSV or JSON file.
+
+CSV files need a header row of Order field names; JSON files hold a list
+of order objects (the same shape POST /api/orders/ accepts). Rows are
+validated column-wise and inserted with bulk_create; invalid rows are
+listed with their row number.
+
+Usage:
+    python manage.py import_orders orders.csv
+    python manage.py import_orders orders.json --dry-run
+    python manage.py import_orders orders.csv --atomic
+"""
+import msgspec
+from django.core.management.base import BaseCommand, CommandError
+from courier.exceptions import OrderImportError
+from courier.order_import import OrderImporter, read_csv
+
+
+class Command(BaseCommand):
+    help = 'Bulk create DRAFT orders from a CSV or JSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path to the CSV or JSON file')
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'json'],
+            help='File format (default: from the file extension)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate only; create nothing',
+        )
+        parser.add_argument(
+            '--atomic',
+            action='store_true',
+            help='Create nothing if any row is invalid',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('json' if path.lower().endswith('.json') else 'csv')
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Importing orders from {path}{" (dry run)" if options["dry_run"] else ""}...'
+        ))
+
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            raise CommandError(f'Could not read {path}: {e}')
+
+        try:
+            if fmt == 'json':
+                try:
+                    rows = msgspec.json.decode(data)
+                except msgspec.DecodeError as e:
+                    raise OrderImportError(f'could not parse JSON: {e}')
+            else:
+                rows = read_csv(data)
+            report = OrderImporter(rows).run(dry_run=options['dry_run'], atomic=options['atomic'])
+        except OrderImportError as e:
+            raise CommandError(e.message)
+
+        for error in report['errors']:
+            details = '; '.join(f'{field}: {" ".join(messages)}' for field, messages in error['errors'].items())
+            self.stdout.write(self.style.ERROR(f'  ✗ Row {error["row"]}: {details}'))
+
+        self.stdout.write('\n' + '='*60)
+        summary = f'✓ {report["created"]} created, {report["failed"]} rejected of {report["total"]} rows'
+        if report['dry_run']:
+            summary = f'✓ {report["valid"]} valid, {report["failed"]} rejected of {report["total"]} rows (dry run)'
+        style = self.style.SUCCESS if report['created'] or report['dry_run'] or not report['failed'] else self.style.ERROR
+        self.stdout.write(style(summary))
+        if report['created']:
+            orders = report['orders']
+            self.stdout.write(f'  Order numbers {orders[0]["order_number"]} .. {orders[-1]["order_number"]}')
+        self.stdout.write('='*60)
@@ -0,0 +1,81 @@
+"""
+Django management command to bulk import a rate card document into the database.
+
+The document is a JSON list of carriers in the format produced by
+GET /api/admin/rates. Changes are diffed against the DB and applied in a
+single transaction.
+
+Usage:
+    python manage.py import_rate_cards rates.json
+    python manage.py import_rate_cards rates.json --dry-run --verbose
+    python manage.py import_rate_cards rates.json --deactivate-missing
+"""
+import json
+from django.core.management.base import BaseCommand, CommandError
+from courier.exceptions import RateCardImportError
+from courier.rate_import import RateCardImporter
+
+
+class Command(BaseCommand):
+    help = 'Bulk import a rate card document (JSON list of carriers) into the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path to the rate card JSON document')
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would change without writing anything',
+        )
+        parser.add_argument(
+            '--deactivate-missing',
+            action='store_true',
+            help='Deactivate active carriers that are not in the document',
+        )
+        parser.add_argument(
+            '--verbose',
+            action='store_true',
+            help='Display per-table row counts',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        dry_run = options['dry_run']
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Importing rate cards from {path}{" (dry run)" if dry_run else ""}...'
+        ))
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                carriers = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise CommandError(f'Could not read {path}: {e}')
+
+        try:
+            summary = RateCardImporter(
+                carriers, deactivate_missing=options['deactivate_missing']
+            ).run(dry_run=dry_run)
+        except RateCardImportError as e:
+            for error in e.details['errors']:
+                self.stdout.write(self.style.ERROR(f'  ✗ {error["carrier"]}: {error["error"]}'))
+            raise CommandError(e.message)
+
+        for label, key in (('Created', 'created'), ('Updated', 'updated'), ('Deactivated', 'deactivated')):
+            for name in summary[key]:
+                self.stdout.write(f'  ✓ {label}: {name}')
+
+        if options['verbose']:
+            for table, counts in summary['rows'].items():
+                self.stdout.write(
+                    f'    {table}: +{counts["created"]} ~{counts["updated"]} -{counts["deleted"]}'
+                )
+
+        self.stdout.write('\n' + '='*60)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✓ {len(summary["created"])} created, {len(summary["updated"])} updated, '
+                f'{len(summary["deactivated"])} deactivated, {len(summary["unchanged"])} unchanged '
+                f'(rate card version {summary["rate_card_version"]})'
+            )
+        )
+        self.stdout.write('='*60)
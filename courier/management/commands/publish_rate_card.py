@@ -0,0 +1,47 @@
+"""
+Django management command to publish the current rate tables as a rate card version.
+
+Published versions are immutable. Pricing switches to a version once its
+effective time has passed, so price changes can be scheduled ahead.
+
+Usage:
+    python manage.py publish_rate_card
+    python manage.py publish_rate_card --effective-from 2026-11-01T00:00:00+05:30 --notes "November diesel revision"
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from courier.rate_versions import publish_rate_card_version
+
+
+class Command(BaseCommand):
+    help = 'Publish the current rate tables as an immutable, effective-dated rate card version'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--effective-from',
+            help='ISO datetime the version takes effect (default: now)',
+        )
+        parser.add_argument(
+            '--notes',
+            default='',
+            help='Description of the change',
+        )
+
+    def handle(self, *args, **options):
+        effective_from = None
+        if options['effective_from']:
+            effective_from = parse_datetime(options['effective_from'])
+            if effective_from is None:
+                raise CommandError(f'Invalid datetime: {options["effective_from"]}')
+            if timezone.is_naive(effective_from):
+                effective_from = timezone.make_aware(effective_from)
+
+        version = publish_rate_card_version(effective_from=effective_from, notes=options['notes'])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✓ Published rate card version {version.pk} '
+                f'({len(version.payload["carriers"])} carriers, effective {version.effective_from.isoformat()})'
+            )
+        )
@@ -0,0 +1,108 @@
+"""
+Django management command to re-quote DRAFT orders after rate changes.
+
+Runs the re-quote jobs queued by rate card, carrier and SystemConfig
+changes (see courier.requote): the stored quotes of affected DRAFT orders
+are re-priced in throttled batches and the changes reported. An
+interrupted job is resumed from where it stopped, so the command is safe
+to run repeatedly (e.g. every few minutes from cron with --max-seconds).
+
+Usage:
+    python manage.py requote_drafts
+    python manage.py requote_drafts --max-seconds 240
+    python manage.py requote_drafts --all
+    python manage.py requote_drafts --carrier "Delhivery Surface 0.5kg" --source-pincode 400001 --dest-pincode 110001
+    python manage.py requote_drafts --job 12
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from courier.models import Courier, RequoteJob
+from courier.requote import enqueue_requote, run_job, run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = 'Re-price the stored quotes of DRAFT orders after rate or fuel changes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Queue a re-quote of every carrier\'s drafts before running',
+        )
+        parser.add_argument(
+            '--carrier',
+            action='append',
+            dest='carriers',
+            help='Queue a re-quote of this carrier\'s drafts before running (repeatable)',
+        )
+        parser.add_argument('--source-pincode', type=int, help='Only re-quote drafts shipping from this pincode')
+        parser.add_argument('--dest-pincode', type=int, help='Only re-quote drafts shipping to this pincode')
+        parser.add_argument(
+            '--job',
+            type=int,
+            help='Run (or resume) this job only, e.g. one that failed',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Orders re-priced per transaction (default: COURIER_REQUOTE_BATCH_SIZE)',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            help='Seconds to sleep between batches (default: COURIER_REQUOTE_PAUSE_SECONDS)',
+        )
+        parser.add_argument(
+            '--max-seconds',
+            type=float,
+            help='Stop starting batches after this long; the next run resumes',
+        )
+
+    def handle(self, *args, **options):
+        lane = {'source_pincode': options['source_pincode'], 'dest_pincode': options['dest_pincode']}
+        if options['all'] and options['carriers']:
+            raise CommandError('Use either --all or --carrier')
+        if any(lane.values()) and not (options['all'] or options['carriers']):
+            raise CommandError('--source-pincode / --dest-pincode need --all or --carrier')
+
+        if options['carriers']:
+            couriers = dict(Courier.objects.filter(name__in=options['carriers']).values_list('name', 'id'))
+            unknown = sorted(set(options['carriers']) - set(couriers))
+            if unknown:
+                raise CommandError(f'Unknown carrier: {", ".join(unknown)}')
+            job = enqueue_requote(couriers.values(), reason="Manual re-quote", **lane)
+            self.stdout.write(f'  ✓ Queued job {job.pk}')
+        elif options['all']:
+            job = enqueue_requote(reason="Manual re-quote", **lane)
+            self.stdout.write(f'  ✓ Queued job {job.pk}')
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Re-quoting DRAFT orders...'))
+        run_options = {'batch_size': options['batch_size'], 'pause': options['pause']}
+        if options['job'] is not None:
+            try:
+                job = RequoteJob.objects.get(pk=options['job'])
+            except RequoteJob.DoesNotExist:
+                raise CommandError(f'Job {options["job"]} not found')
+            deadline = time.monotonic() + options['max_seconds'] if options['max_seconds'] is not None else None
+            jobs = [run_job(job, deadline=deadline, **run_options)]
+        else:
+            jobs = run_pending_jobs(max_seconds=options['max_seconds'], **run_options)
+
+        for job in jobs:
+            mark = '✗' if job.status == RequoteJob.Status.FAILED else '✓'
+            self.stdout.write(
+                f'  {mark} Job {job.pk} {job.get_status_display().lower()}: {job.changed} of {job.scanned} '
+                f're-quoted, total {job.total_delta:+} (up to +{job.largest_increase} / -{job.largest_decrease})'
+            )
+            for carrier, stats in sorted(job.by_carrier.items()):
+                self.stdout.write(f'      {carrier}: {stats["changed"]} changed, {stats["delta"]:+.2f}')
+            if job.unserviceable:
+                self.stdout.write(f'      {job.unserviceable} draft(s) no longer serviceable, left as quoted')
+            if job.error:
+                self.stdout.write(self.style.ERROR(f'      {job.error}'))
+
+        self.stdout.write('\n' + '='*60)
+        changed = sum(job.changed for job in jobs)
+        self.stdout.write(self.style.SUCCESS(f'✓ {len(jobs)} job(s) run, {changed} draft quote(s) changed'))
+        self.stdout.write('='*60)
@@ -0,0 +1,185 @@
+"""
+Opt-in request profiling.
+
+ProfilingMiddleware profiles a request when it carries the trusted
+``X-Profile-Token`` header (COURIER_PROFILE_TOKEN) or is picked by
+COURIER_PROFILE_SAMPLE_RATE. For a profiled request it records wall
+time, database query count and SQL time (all connections), and default
+cache hits and misses, and returns them in a ``Server-Timing`` header::
+
+    Server-Timing: total;dur=41.2, db;dur=12.8;desc="7 queries", app;dur=28.4,
+                   cache;desc="hits=3 misses=1"
+
+With ``X-Profile-CProfile: 1`` on a token request (or COURIER_PROFILE_CPROFILE
+for sampled ones) the request also runs under cProfile and the stats are
+written to COURIER_PROFILE_DIR, keeping the newest COURIER_PROFILE_MAX_FILES
+files. The file name is returned in ``X-Profile-Id``; open it with
+``python -m pstats`` or snakeviz.
+
+When neither a token nor a sample rate is configured the middleware
+removes itself at startup (MiddlewareNotUsed) and costs nothing.
+"""
+import cProfile
+import hmac
+import logging
+import os
+import random
+import re
+import time
+from contextlib import ExitStack, suppress
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('courier')
+
+_MISSING = object()
+
+
+class RequestProfile:
+    """Counters for one profiled request."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_seconds += time.perf_counter() - start
+
+    def instrument_cache(self, backend):
+        """
+        Count hits and misses on ``backend`` until the returned callback runs.
+
+        Cache backends are per thread, so patching the instance only sees
+        this request's calls.
+        """
+        get, get_many = backend.get, backend.get_many
+
+        def counting_get(key, default=None, version=None):
+            value = get(key, _MISSING, version=version)
+            if value is _MISSING:
+                self.cache_misses += 1
+                return default
+            self.cache_hits += 1
+            return value
+
+        def counting_get_many(keys, version=None):
+            keys = list(keys)
+            found = get_many(keys, version=version)
+            self.cache_hits += len(found)
+            self.cache_misses += len(keys) - len(found)
+            return found
+
+        backend.get, backend.get_many = counting_get, counting_get_many
+
+        def restore():
+            del backend.get, backend.get_many
+        return restore
+
+    def server_timing(self, total_seconds):
+        db_ms = self.sql_seconds * 1000
+        total_ms = total_seconds * 1000
+        return ", ".join([
+            f"total;dur={total_ms:.1f}",
+            f'db;dur={db_ms:.1f};desc="{self.queries} queries"',
+            f"app;dur={max(total_ms - db_ms, 0):.1f}",
+            f'cache;desc="hits={self.cache_hits} misses={self.cache_misses}"',
+        ])
+
+
+class ProfilingMiddleware:
+    """Profile token-bearing or sampled requests (see module docstring)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.token = getattr(settings, 'COURIER_PROFILE_TOKEN', '')
+        self.sample_rate = getattr(settings, 'COURIER_PROFILE_SAMPLE_RATE', 0.0)
+        if not self.token and not self.sample_rate:
+            raise MiddlewareNotUsed()
+        self.profile_dir = getattr(settings, 'COURIER_PROFILE_DIR', '')
+        self.max_files = getattr(settings, 'COURIER_PROFILE_MAX_FILES', 100)
+
+    def __call__(self, request):
+        trusted = self._has_token(request)
+        if not trusted and not (self.sample_rate and random.random() < self.sample_rate):
+            return self.get_response(request)
+
+        if trusted:
+            use_cprofile = request.META.get('HTTP_X_PROFILE_CPROFILE') == '1'
+        else:
+            use_cprofile = getattr(settings, 'COURIER_PROFILE_CPROFILE', False)
+        return self._profile(request, use_cprofile and bool(self.profile_dir))
+
+    def _has_token(self, request):
+        supplied = request.META.get('HTTP_X_PROFILE_TOKEN')
+        return bool(self.token and supplied) and hmac.compare_digest(supplied.encode(), self.token.encode())
+
+    def _profile(self, request, use_cprofile):
+        profile = RequestProfile()
+        profiler = cProfile.Profile() if use_cprofile else None
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile.record_query))
+            stack.callback(profile.instrument_cache(caches['default']))
+
+            start = time.perf_counter()
+            if profiler is not None:
+                try:
+                    profiler.enable()
+                except ValueError:
+                    # Another profiler is active (e.g. a concurrent request on 3.12+)
+                    profiler = None
+            try:
+                response = self.get_response(request)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+            total = time.perf_counter() - start
+
+        response['Server-Timing'] = profile.server_timing(total)
+        if profiler is not None:
+            profile_id = self._dump(profiler, request)
+            if profile_id:
+                response['X-Profile-Id'] = profile_id
+
+        logger.info(
+            f"PROFILE: {request.method} {request.path} {response.status_code} "
+            f"total={total * 1000:.1f}ms db={profile.sql_seconds * 1000:.1f}ms/{profile.queries}q "
+            f"cache={profile.cache_hits}h/{profile.cache_misses}m"
+        )
+        return response
+
+    def _dump(self, profiler, request):
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', request.path).strip('-')[:80] or 'root'
+        profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{time.time_ns() % 10**9:09d}-{request.method}-{slug}.prof"
+        try:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            profiler.dump_stats(os.path.join(self.profile_dir, profile_id))
+            self._prune()
+        except OSError as e:
+            logger.warning(f"PROFILE: Could not write {profile_id}: {e}")
+            return None
+        return profile_id
+
+    def _prune(self):
+        """Keep only the newest COURIER_PROFILE_MAX_FILES profiles."""
+        entries = [
+            entry for entry in os.scandir(self.profile_dir)
+            if entry.is_file() and entry.name.endswith('.prof')
+        ]
+        if len(entries) <= self.max_files:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_files]:
+            with suppress(OSError):
+                os.remove(entry.path)
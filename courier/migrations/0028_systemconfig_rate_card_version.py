@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courier", "0027_remove_courier_appointment_delivery_fee_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="systemconfig",
+            name="rate_card_version",
+            field=models.PositiveIntegerField(
+                default=1,
+                editable=False,
+                help_text="Incremented whenever rates or config change",
+                verbose_name="Rate Card Version",
+            ),
+        ),
+    ]
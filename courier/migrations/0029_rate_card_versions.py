@@ -0,0 +1,58 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courier", "0028_systemconfig_rate_card_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RateCardVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "effective_from",
+                    models.DateTimeField(db_index=True, verbose_name="Effective From"),
+                ),
+                (
+                    "payload",
+                    models.JSONField(editable=False, help_text="Compiled RateCardSnapshot payload"),
+                ),
+                (
+                    "source_version",
+                    models.PositiveIntegerField(
+                        editable=False, help_text="SystemConfig.rate_card_version at publish time"
+                    ),
+                ),
+                ("notes", models.CharField(blank=True, default="", max_length=255)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Rate Card Version",
+                "db_table": "rate_card_versions",
+                "ordering": ["-effective_from", "-id"],
+            },
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="rate_card_version",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Published rate card version the booking was priced against",
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="orders",
+                to="courier.ratecardversion",
+            ),
+        ),
+    ]
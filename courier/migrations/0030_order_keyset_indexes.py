@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 21:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courier", "0029_rate_card_versions"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="ftlorder",
+            name="ftl_orders_created_5a45a3_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="order",
+            name="orders_created_77e2b9_idx",
+        ),
+        migrations.AddIndex(
+            model_name="ftlorder",
+            index=models.Index(fields=["created_at", "id"], name="ftl_orders_created_ab04ad_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(fields=["created_at", "id"], name="orders_created_f67d2c_idx"),
+        ),
+    ]
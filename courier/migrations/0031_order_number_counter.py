@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-18 21:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courier", "0030_order_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrderNumberCounter",
+            fields=[
+                ("prefix", models.CharField(max_length=20, primary_key=True, serialize=False)),
+                ("next_value", models.PositiveBigIntegerField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Order Number Counter",
+                "db_table": "order_number_counters",
+            },
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.8 on 2026-10-18 21:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courier", "0031_order_number_counter"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="ftlorder",
+            name="ftl_orders_order_n_a2381b_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="ftlorder",
+            name="ftl_orders_status_2a0853_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="order",
+            name="orders_order_n_1336be_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="order",
+            name="orders_status_762191_idx",
+        ),
+        migrations.AlterField(
+            model_name="order",
+            name="carrier",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="orders",
+                to="courier.courier",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ftlorder",
+            index=models.Index(
+                fields=["status", "-created_at", "-id"], name="ftl_orders_status_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ftlorder",
+            index=models.Index(
+                condition=models.Q(("status", "booked")),
+                fields=["booked_at"],
+                name="ftl_orders_booked_at_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["status", "-created_at", "-id"], name="orders_status_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["carrier", "-created_at", "-id"], name="orders_carrier_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                condition=models.Q(("status", "booked")),
+                fields=["booked_at"],
+                name="orders_booked_at_idx",
+            ),
+        ),
+    ]
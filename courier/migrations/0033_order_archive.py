@@ -0,0 +1,63 @@
+# Generated by Django 5.2.8 on 2026-10-18 22:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courier", "0032_order_access_path_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrderArchive",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("order", "Order"), ("ftl", "FTL Order")], max_length=10
+                    ),
+                ),
+                ("order_id", models.BigIntegerField()),
+                ("order_number", models.CharField(db_index=True, max_length=50)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("draft", "Draft"),
+                            ("booked", "Booked / Ready to Ship"),
+                            ("manifested", "Manifested"),
+                            ("picked_up", "Picked Up / In Transit"),
+                            ("out_for_delivery", "Out for Delivery"),
+                            ("delivered", "Delivered"),
+                            ("cancelled", "Cancelled / Unbooked"),
+                            ("pickup_exception", "Pickup Exception"),
+                            ("ndr", "NDR (Non-Delivery Report)"),
+                            ("rto", "RTO (Return to Origin)"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("created_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                ("payload", models.BinaryField()),
+            ],
+            options={
+                "verbose_name": "Archived Order",
+                "db_table": "order_archive",
+                "ordering": ["-created_at"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("kind", "order_id"), name="order_archive_kind_order_id_uniq"
+                    )
+                ],
+            },
+        ),
+    ]
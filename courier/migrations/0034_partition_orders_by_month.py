@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.db import migrations
+
+from courier.partitioning import PARTITIONED_TABLES, is_partitioned, partition_table
+
+
+def partition_orders(apps, schema_editor):
+    # PostgreSQL only: SQLite (dev) keeps plain tables
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    months_ahead = getattr(settings, 'COURIER_ORDER_PARTITION_MONTHS_AHEAD', 3)
+    for table in PARTITIONED_TABLES:
+        if not is_partitioned(table, schema_editor.connection.alias):
+            partition_table(schema_editor, table, months_ahead)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courier", "0033_order_archive"),
+    ]
+
+    operations = [
+        # The partitioned tables have the same columns, so going back needs no schema change
+        migrations.RunPython(partition_orders, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.8 on 2026-10-18 22:17
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courier", "0034_partition_orders_by_month"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RequoteJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        db_index=True,
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("reason", models.CharField(blank=True, default="", max_length=255)),
+                (
+                    "carrier_ids",
+                    models.JSONField(
+                        blank=True, help_text="Courier ids; empty means all carriers", null=True
+                    ),
+                ),
+                ("source_pincode", models.IntegerField(blank=True, null=True)),
+                ("dest_pincode", models.IntegerField(blank=True, null=True)),
+                ("cursor", models.BigIntegerField(default=0, help_text="Last order id processed")),
+                ("scanned", models.PositiveIntegerField(default=0)),
+                ("changed", models.PositiveIntegerField(default=0)),
+                ("unserviceable", models.PositiveIntegerField(default=0)),
+                (
+                    "total_delta",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        help_text="Sum of new minus old total_cost",
+                        max_digits=14,
+                    ),
+                ),
+                (
+                    "largest_increase",
+                    models.DecimalField(decimal_places=2, default=Decimal("0.00"), max_digits=12),
+                ),
+                (
+                    "largest_decrease",
+                    models.DecimalField(decimal_places=2, default=Decimal("0.00"), max_digits=12),
+                ),
+                (
+                    "by_carrier",
+                    models.JSONField(
+                        blank=True, default=dict, help_text="carrier -> {changed, delta}"
+                    ),
+                ),
+                ("error", models.TextField(blank=True, default="")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Draft Re-quote Job",
+                "db_table": "requote_jobs",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
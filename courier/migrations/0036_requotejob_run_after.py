@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-18 22:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courier", "0035_requote_jobs"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="requotejob",
+            name="run_after",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Not started before this time (a scheduled rate card version)",
+                null=True,
+            ),
+        ),
+    ]
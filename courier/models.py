@@ -253,6 +253,9 @@ class Courier(models.Model):
     def get_rate_dict(self):
         """
         Reconstructs the dictionary expected by the engine from DB columns and CourierZoneRate.
+
+        Snapshots are compiled in bulk by courier.rate_compiler, which builds
+        the same dict from values_list rows; keep the two in step.
         """
         # Fetch Zone Rates efficiently
         zone_rates = self.zone_rates.all()
@@ -599,7 +602,10 @@ class Order(models.Model):
     )
 
     # Shipment Details (filled after carrier selection)
-    carrier = models.ForeignKey('Courier', on_delete=models.PROTECT, null=True, blank=True, related_name='orders')
+    # db_index=False: orders_carrier_created_idx leads with carrier_id
+    carrier = models.ForeignKey(
+        'Courier', on_delete=models.PROTECT, null=True, blank=True, related_name='orders', db_index=False
+    )
     total_cost = models.DecimalField(
         max_digits=12, decimal_places=2, blank=True, null=True,
         help_text="Total shipping cost"
@@ -608,6 +614,10 @@ class Order(models.Model):
     awb_number = models.CharField(max_length=100, blank=True, null=True)  # Air Waybill number
     zone_applied = models.CharField(max_length=100, blank=True, null=True)
     mode = models.CharField(max_length=20, blank=True, null=True)  # Surface/Air
+    rate_card_version = models.ForeignKey(
+        'RateCardVersion', on_delete=models.PROTECT, null=True, blank=True, related_name='orders',
+        help_text="Published rate card version the booking was priced against"
+    )
 
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -620,10 +630,18 @@ class Order(models.Model):
     class Meta:
         db_table = 'orders'
         ordering = ['-created_at']
+        # order_number is covered by its unique constraint. The composites
+        # serve ?status= / ?carrier= listings newest first (and the GROUP BY
+        # status / carrier_id in admin_dashboard_stats) without a sort step.
         indexes = [
-            models.Index(fields=['order_number']),
-            models.Index(fields=['status']),
-            models.Index(fields=['created_at']),
+            # Keyset pagination (courier.pagination) walks (created_at, id)
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['status', '-created_at', '-id'], name='orders_status_created_idx'),
+            models.Index(fields=['carrier', '-created_at', '-id'], name='orders_carrier_created_idx'),
+            # "Booked in the last N days" only ever looks at BOOKED rows
+            models.Index(
+                fields=['booked_at'], name='orders_booked_at_idx', condition=models.Q(status=OrderStatus.BOOKED)
+            ),
         ]
 
     def __str__(self):
@@ -712,10 +730,14 @@ class FTLOrder(models.Model):
     class Meta:
         db_table = 'ftl_orders'
         ordering = ['-created_at']
+        # Same access patterns as Order (there is no carrier on FTL orders)
         indexes = [
-            models.Index(fields=['order_number']),
-            models.Index(fields=['status']),
-            models.Index(fields=['created_at']),
+            # Keyset pagination (courier.pagination) walks (created_at, id)
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['status', '-created_at', '-id'], name='ftl_orders_status_created_idx'),
+            models.Index(
+                fields=['booked_at'], name='ftl_orders_booked_at_idx', condition=models.Q(status=OrderStatus.BOOKED)
+            ),
         ]
 
     def __str__(self):
@@ -757,6 +779,13 @@ class SystemConfig(models.Model):
         verbose_name="Default Serviceable CSV", help_text="Filename in config directory"
     )
 
+    # Monotonic counter bumped on every rate card or config change.
+    # Lets precompiled rate-card snapshots detect that they are stale.
+    rate_card_version = models.PositiveIntegerField(
+        default=1, editable=False,
+        verbose_name="Rate Card Version", help_text="Incremented whenever rates or config change"
+    )
+
     class Meta:
         db_table = 'system_config'
         verbose_name = "System Configuration"
@@ -772,6 +801,13 @@ class SystemConfig(models.Model):
             # Or just block it. For now, let's just save as is or update the first one.
             # A cleaner way for simple singleton is just strict check, but let's be lenient.
             return super().save(*args, **kwargs)
+        if not self._state.adding:
+            # Config changes alter quotes, so they count as a new rate card version.
+            # Bump in SQL so a stale in-memory value can never move the counter backwards.
+            self.rate_card_version = models.F('rate_card_version') + 1
+            super().save(*args, **kwargs)
+            self.refresh_from_db(fields=['rate_card_version'])
+            return
         return super().save(*args, **kwargs)
 
     @classmethod
@@ -781,6 +817,148 @@ class SystemConfig(models.Model):
         obj, created = cls.objects.get_or_create(pk=1)
         return obj
 
+    @classmethod
+    def get_rate_card_version(cls):
+        """Return the current rate card version without loading the whole row."""
+        version = cls.objects.filter(pk=1).values_list('rate_card_version', flat=True).first()
+        return version or 0
+
+    @classmethod
+    def bump_rate_card_version(cls):
+        """Atomically increment the rate card version (no-op before the row exists)."""
+        cls.objects.filter(pk=1).update(rate_card_version=models.F('rate_card_version') + 1)
+
+
+class RateCardVersion(models.Model):
+    """
+    Immutable, effective-dated copy of the compiled rate cards.
+
+    Publishing freezes the current rate tables and system config. Pricing
+    uses the latest version whose effective_from has passed, so a version
+    can be scheduled ahead of time (e.g. a monthly fuel revision).
+    """
+    effective_from = models.DateTimeField(db_index=True, verbose_name="Effective From")
+    payload = models.JSONField(editable=False, help_text="Compiled RateCardSnapshot payload")
+    source_version = models.PositiveIntegerField(
+        editable=False, help_text="SystemConfig.rate_card_version at publish time"
+    )
+    notes = models.CharField(max_length=255, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'rate_card_versions'
+        ordering = ['-effective_from', '-id']
+        verbose_name = "Rate Card Version"
+
+    def __str__(self):
+        return f"Rate card v{self.pk} (effective {self.effective_from:%Y-%m-%d %H:%M})"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Published rate card versions are immutable")
+        return super().save(*args, **kwargs)
+
+
+class OrderNumberCounter(models.Model):
+    """
+    Next unreserved order number for one prefix (e.g. "ORD-2026-").
+
+    Workers reserve blocks of numbers by advancing next_value in a single
+    UPDATE and hand them out from memory (see courier.order_numbers).
+    """
+    prefix = models.CharField(max_length=20, primary_key=True)
+    next_value = models.PositiveBigIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'order_number_counters'
+        verbose_name = "Order Number Counter"
+
+    def __str__(self):
+        return f"{self.prefix}{self.next_value}"
+
+
+class OrderArchive(models.Model):
+    """
+    A delivered or cancelled order moved out of orders / ftl_orders.
+
+    The full row is kept as zlib-compressed JSON (see courier.archive);
+    only the columns needed to find it again are stored in the clear.
+    """
+    class Kind(models.TextChoices):
+        ORDER = "order", "Order"
+        FTL = "ftl", "FTL Order"
+
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    order_id = models.BigIntegerField()
+    order_number = models.CharField(max_length=50, db_index=True)
+    status = models.CharField(max_length=20, choices=OrderStatus.choices)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    payload = models.BinaryField()
+
+    class Meta:
+        db_table = 'order_archive'
+        ordering = ['-created_at']
+        verbose_name = "Archived Order"
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'order_id'], name='order_archive_kind_order_id_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.order_number} (archived {self.get_status_display()})"
+
+
+class RequoteJob(models.Model):
+    """
+    Re-pricing of the quotes stored on DRAFT orders after a rate change.
+
+    Queued when rate cards or SystemConfig change (courier.signals) or a
+    rate card version is published (courier.rate_versions), and worked
+    through in batches by the requote_drafts command (see courier.requote).
+    ``cursor`` is the last order id done, so a job that was interrupted
+    resumes where it stopped.
+    """
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING, db_index=True)
+    reason = models.CharField(max_length=255, blank=True, default="")
+
+    # What to re-price: drafts quoted by these couriers (null: every courier), optionally one lane
+    carrier_ids = models.JSONField(blank=True, null=True, help_text="Courier ids; empty means all carriers")
+    source_pincode = models.IntegerField(blank=True, null=True)
+    dest_pincode = models.IntegerField(blank=True, null=True)
+    run_after = models.DateTimeField(blank=True, null=True,
+                                     help_text="Not started before this time (a scheduled rate card version)")
+
+    # Progress and report
+    cursor = models.BigIntegerField(default=0, help_text="Last order id processed")
+    scanned = models.PositiveIntegerField(default=0)
+    changed = models.PositiveIntegerField(default=0)
+    unserviceable = models.PositiveIntegerField(default=0)
+    total_delta = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'),
+                                      help_text="Sum of new minus old total_cost")
+    largest_increase = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    largest_decrease = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    by_carrier = models.JSONField(default=dict, blank=True, help_text="carrier -> {changed, delta}")
+    error = models.TextField(blank=True, default="")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'requote_jobs'
+        ordering = ['-created_at']
+        verbose_name = "Draft Re-quote Job"
+
+    def __str__(self):
+        return f"Re-quote #{self.pk} ({self.get_status_display()})"
+
 
 class CourierZoneRate(models.Model):
     """
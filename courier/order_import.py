@@ -0,0 +1,276 @@
+"""
+Bulk order ingestion from CSV or JSON.
+
+Uploads are validated column by column with pandas instead of running an
+OrderSerializer per row: every rule of OrderSerializer (required fields,
+number parsing, positive dimensions, 6-digit pincodes, name / contact /
+address / email checks) is applied to a whole column at once, with the
+serializer's messages. Volumetric and applicable weight are computed the
+same way, so ``Order.save()`` is not needed. Blank recipient city and
+state are filled from the pincode index.
+
+Valid rows get order numbers from one block allocation and are inserted
+with ``bulk_create`` in batches of COURIER_ORDER_IMPORT_BATCH_SIZE, in one
+transaction. Invalid rows are reported with their row number (1-based,
+header excluded) and DRF-shaped errors; with ``atomic`` any invalid row
+rejects the whole upload.
+"""
+import io
+import logging
+from decimal import Decimal
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from courier import zones
+from courier.exceptions import OrderImportError
+from courier.models import Order, OrderStatus, PaymentMode
+from courier.order_numbers import allocate_order_numbers
+
+logger = logging.getLogger('courier')
+
+# Text columns: (field, max_length or None, required)
+TEXT_FIELDS = [
+    ("recipient_name", 255, True),
+    ("recipient_contact", 15, True),
+    ("recipient_address", None, True),
+    ("recipient_city", 100, False),
+    ("recipient_state", 100, False),
+    ("recipient_phone", 15, False),
+    ("recipient_email", 254, False),
+    ("sender_name", 255, False),
+    ("sender_address", None, False),
+    ("sender_phone", 15, False),
+    ("item_type", 100, False),
+    ("sku", 100, False),
+    ("notes", None, False),
+]
+
+PINCODE_FIELDS = ["recipient_pincode", "sender_pincode"]
+DIMENSION_FIELDS = ["weight", "length", "width", "height"]
+AMOUNT_FIELDS = ["order_value", "item_amount"]
+
+REQUIRED = "This field is required."
+INVALID_INTEGER = "A valid integer is required."
+INVALID_NUMBER = "A valid number is required."
+INVALID_AMOUNT = "Ensure a valid amount with no more than 10 digits before and 2 after the decimal point."
+
+# Same character rules as OrderSerializer.validate_recipient_name / _address
+NAME_PATTERN = r"(?:[^\W\d_]|[ .\-])*"
+ADDRESS_PATTERN = r"(?:[^\W_]|[ .,/\-#()])*"
+AMOUNT_PATTERN = r"[+-]?(?:\d{1,10}(?:\.\d{0,2})?|\.\d{1,2})"
+
+
+def read_csv(data) -> List[Dict[str, Any]]:
+    """
+    Rows of a CSV upload (bytes, text or a file object) as dicts of strings.
+
+    Raises:
+        OrderImportError: If the CSV cannot be parsed.
+    """
+    if isinstance(data, bytes):
+        data = data.decode('utf-8-sig')
+    if isinstance(data, str):
+        data = io.StringIO(data)
+    try:
+        frame = pd.read_csv(data, dtype=str, keep_default_na=False, skip_blank_lines=True)
+    except (ValueError, UnicodeDecodeError, pd.errors.ParserError) as e:
+        raise OrderImportError(f"could not parse CSV: {e}")
+    frame.columns = frame.columns.str.strip()
+    return frame.to_dict("records")
+
+
+class OrderImporter:
+    """Validate and insert a batch of order rows (dicts keyed by Order field name)."""
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise OrderImportError("expected a list of order objects")
+        if not rows:
+            raise OrderImportError("no orders to import")
+        max_rows = getattr(settings, 'COURIER_ORDER_IMPORT_MAX_ROWS', 10000)
+        if len(rows) > max_rows:
+            raise OrderImportError(f"{len(rows)} rows exceeds the limit of {max_rows}")
+
+        # object dtype keeps JSON values as sent (no int -> float upcasting around gaps)
+        self.frame = pd.DataFrame(rows, dtype=object)
+        self.errors: Dict[int, Dict[str, List[str]]] = {}
+
+    # --- Column helpers ---
+
+    def _fail(self, mask: pd.Series, field: str, message: str):
+        """Record ``message`` for ``field`` on every row where ``mask`` is set."""
+        for index in mask.index[mask.to_numpy(dtype=bool)]:
+            self._fail_row(index, field, message)
+
+    def _fail_row(self, index, field: str, message: str):
+        # First error per field wins, as DRF stops at a field's first failing validator
+        self.errors.setdefault(index, {}).setdefault(field, [message])
+
+    def _text(self, field: str) -> pd.Series:
+        if field not in self.frame:
+            return pd.Series("", index=self.frame.index, dtype=object)
+        column = self.frame[field]
+        return column.where(column.notna(), "").astype(str).str.strip()
+
+    def _integers(self, field: str, default=None) -> pd.Series:
+        raw = self._text(field)
+        blank = raw == ""
+        values = pd.to_numeric(raw.where(~blank), errors="coerce")
+        invalid = ~blank & (values.isna() | (values % 1 != 0))
+        if default is None:
+            self._fail(blank, field, REQUIRED)
+        self._fail(invalid, field, INVALID_INTEGER)
+        return values.where(~blank, default)
+
+    def _floats(self, field: str) -> pd.Series:
+        raw = self._text(field)
+        blank = raw == ""
+        values = pd.to_numeric(raw.where(~blank), errors="coerce").astype(float)
+        self._fail(blank, field, REQUIRED)
+        self._fail(~blank & ~np.isfinite(values), field, INVALID_NUMBER)
+        return values
+
+    # --- Validation ---
+
+    def validate(self) -> pd.DataFrame:
+        """
+        Validate every column and build the cleaned values.
+
+        Returns:
+            DataFrame: One row per input row with Order field values; rows
+            listed in ``self.errors`` must not be inserted.
+        """
+        clean = pd.DataFrame(index=self.frame.index)
+
+        for field, max_length, required in TEXT_FIELDS:
+            values = self._text(field)
+            blank = values == ""
+            if required:
+                self._fail(blank, field, REQUIRED)
+            if max_length:
+                self._fail(values.str.len() > max_length, field, f"Ensure this field has no more than {max_length} characters.")
+            clean[field] = values.where(~blank, None)
+
+        name = self._text("recipient_name")
+        self._fail(~name.str.fullmatch(NAME_PATTERN), "recipient_name",
+                   "Name must contain only letters, spaces, dots, and hyphens")
+
+        contact = self._text("recipient_contact").str.replace(r"[ \-]", "", regex=True)
+        self._fail((contact != "") & ~contact.str.fullmatch(r"\d*"), "recipient_contact",
+                   "Contact number must contain only digits")
+        self._fail((contact != "") & (contact.str.len() != 10), "recipient_contact",
+                   "Contact number must be exactly 10 digits")
+        clean["recipient_contact"] = contact
+
+        address = self._text("recipient_address")
+        self._fail(~address.str.fullmatch(ADDRESS_PATTERN), "recipient_address", "Address contains invalid characters")
+
+        for index, email in clean["recipient_email"].dropna().items():
+            try:
+                validate_email(email)
+            except ValidationError:
+                self._fail_row(index, "recipient_email", "Enter a valid email address.")
+
+        for field in PINCODE_FIELDS:
+            values = self._integers(field)
+            self._fail(values.notna() & ((values < 100000) | (values > 999999)), field, "Pincode must be exactly 6 digits")
+            clean[field] = values
+
+        for field in DIMENSION_FIELDS:
+            values = self._floats(field)
+            self._fail(values <= 0, field, f"{field.capitalize()} must be greater than 0")
+            clean[field] = values
+
+        clean["quantity"] = self._integers("quantity", default=1)
+
+        for field in AMOUNT_FIELDS:
+            raw = self._text(field)
+            blank = raw == ""
+            self._fail(~blank & ~raw.str.fullmatch(AMOUNT_PATTERN), field, INVALID_AMOUNT)
+            clean[field] = raw.where(~blank, "0")
+
+        payment_mode = self._text("payment_mode")
+        for index, value in payment_mode[(payment_mode != "") & ~payment_mode.isin(PaymentMode.values)].items():
+            self._fail_row(index, "payment_mode", f"\"{value}\" is not a valid choice.")
+        clean["payment_mode"] = payment_mode.where(payment_mode != "", PaymentMode.PREPAID)
+
+        # Order.save(): volumetric weight = L x W x H / 5000, charged on the larger weight
+        clean["volumetric_weight"] = clean["length"] * clean["width"] * clean["height"] / 5000
+        clean["applicable_weight"] = np.maximum(clean["weight"], clean["volumetric_weight"])
+
+        self._fill_location(clean)
+        return clean
+
+    @staticmethod
+    def _fill_location(clean: pd.DataFrame):
+        """Fill blank recipient city/state from the pincode index, as GET /api/pincode/ reports them."""
+        lookup = zones.PINCODE_LOOKUP
+        pincodes = clean["recipient_pincode"]
+        known = {int(p): lookup[int(p)] for p in pincodes.dropna().unique() if int(p) in lookup}
+        if not known:
+            return
+        for field, key in (("recipient_city", "district"), ("recipient_state", "state")):
+            found = pincodes.map(lambda p, key=key: str(known[p][key])[:100] if p in known else None)
+            clean[field] = clean[field].where(clean[field].notna(), found)
+
+    # --- Import ---
+
+    def run(self, dry_run: bool = False, atomic: bool = False) -> Dict[str, Any]:
+        """
+        Validate the rows and insert the valid ones.
+
+        Args:
+            dry_run: Validate only.
+            atomic: Insert nothing if any row is invalid.
+
+        Returns:
+            dict: total / valid / created / failed counts, the created
+            orders (row, id, order_number) and per-row errors.
+        """
+        clean = self.validate()
+        valid = clean.drop(index=list(self.errors))
+        insert = not dry_run and len(valid) and not (atomic and self.errors)
+
+        created = []
+        if insert:
+            orders = self._build_orders(valid, allocate_order_numbers(len(valid)))
+            batch_size = getattr(settings, 'COURIER_ORDER_IMPORT_BATCH_SIZE', 1000)
+            with transaction.atomic():
+                Order.objects.bulk_create(orders, batch_size=batch_size)
+            created = [
+                {"row": int(index) + 1, "id": order.pk, "order_number": order.order_number}
+                for index, order in zip(valid.index, orders)
+            ]
+            logger.info(f"ORDER_IMPORT: Created {len(orders)} orders ({len(self.errors)} rows rejected)")
+
+        return {
+            "total": len(clean),
+            "valid": len(valid),
+            "created": len(created),
+            "failed": len(self.errors),
+            "dry_run": dry_run,
+            "orders": created,
+            "errors": [
+                {"row": int(index) + 1, "errors": self.errors[index]}
+                for index in sorted(self.errors)
+            ],
+        }
+
+    @staticmethod
+    def _build_orders(valid: pd.DataFrame, order_numbers: List[str]) -> List[Order]:
+        # Back to plain Python values (no numpy scalars or NaN) for the ORM
+        records = valid.astype(object).where(valid.notna(), None).to_dict("records")
+        orders = []
+        for record, order_number in zip(records, order_numbers):
+            for field in PINCODE_FIELDS + ["quantity"]:
+                record[field] = int(record[field])
+            for field in AMOUNT_FIELDS:
+                record[field] = Decimal(record[field]).quantize(Decimal("0.01"))
+            orders.append(Order(order_number=order_number, status=OrderStatus.DRAFT, **record))
+        return orders
@@ -0,0 +1,129 @@
+"""
+Order number allocation.
+
+Order numbers look like ``ORD-2026-1001`` / ``FTL-2026-1001``: a prefix per
+kind and year plus a counter that starts at 1001. The counter lives in an
+``OrderNumberCounter`` row per prefix. Each worker reserves a block of
+COURIER_ORDER_NUMBER_BLOCK_SIZE numbers with one atomic UPDATE and hands
+them out from memory, so creating an order no longer scans for the latest
+number, and concurrent creates can never pick the same one.
+
+Numbers are unique but not gap-free: a worker that exits leaves the rest
+of its block unused. Inside a transaction only the numbers needed are
+reserved, since a rollback would also undo the reservation.
+"""
+import logging
+import threading
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+
+logger = logging.getLogger('courier')
+
+ORDER = 'ORD'
+FTL = 'FTL'
+
+# First number of a prefix that has no orders yet
+FIRST_NUMBER = 1001
+
+
+def _last_issued(kind: str, prefix: str) -> int:
+    """Highest number issued under ``prefix`` before its counter row existed."""
+    from courier.models import FTLOrder, Order
+
+    model = FTLOrder if kind == FTL else Order
+    latest = (
+        model.objects
+        .filter(order_number__startswith=prefix)
+        .order_by('-id')
+        .values_list('order_number', flat=True)
+        .first()
+    )
+    if latest:
+        try:
+            return int(latest.rsplit('-', 1)[-1])
+        except ValueError:
+            pass
+    return FIRST_NUMBER - 1
+
+
+def reserve(kind: str, prefix: str, count: int) -> int:
+    """
+    Advance the counter for ``prefix`` by ``count``.
+
+    Returns:
+        int: First reserved number; the range is [first, first + count).
+    """
+    from courier.models import OrderNumberCounter
+
+    counters = OrderNumberCounter.objects.filter(prefix=prefix)
+    with transaction.atomic():
+        if not counters.update(next_value=models.F('next_value') + count):
+            # First number for this prefix (new year, or first run): continue after existing orders
+            first = _last_issued(kind, prefix) + 1
+            try:
+                with transaction.atomic():
+                    OrderNumberCounter.objects.create(prefix=prefix, next_value=first + count)
+                logger.info(f"ORDER_NUMBERS: Started {prefix} counter at {first}")
+                return first
+            except IntegrityError:
+                # Another worker created it first
+                counters.update(next_value=models.F('next_value') + count)
+        return counters.values_list('next_value', flat=True).get() - count
+
+
+class OrderNumberAllocator:
+    """Thread-safe allocator handing out numbers from reserved blocks."""
+
+    def __init__(self, block_size: int = None):
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        # prefix -> (next number, end of block)
+        self._blocks: Dict[str, Tuple[int, int]] = {}
+
+    def allocate(self, kind: str, count: int = 1) -> List[str]:
+        """``count`` new order numbers for ``kind`` (ORDER or FTL), ascending."""
+        if count < 1:
+            return []
+        prefix = f"{kind}-{timezone.now().year}-"
+        block_size = self.block_size or getattr(settings, 'COURIER_ORDER_NUMBER_BLOCK_SIZE', 20)
+
+        with self._lock:
+            start, end = self._blocks.get(prefix, (0, 0))
+            taken = list(range(start, min(start + count, end)))
+            remaining = count - len(taken)
+            if remaining:
+                if transaction.get_connection().in_atomic_block:
+                    # A rollback would release the reservation; keep nothing for later
+                    first = reserve(kind, prefix, remaining)
+                    self._blocks.pop(prefix, None)
+                else:
+                    reserved = max(remaining, block_size)
+                    first = reserve(kind, prefix, reserved)
+                    end = first + reserved
+                    self._blocks[prefix] = (first + remaining, end)
+                taken.extend(range(first, first + remaining))
+            else:
+                self._blocks[prefix] = (start + count, end)
+
+        return [f"{prefix}{number}" for number in taken]
+
+    def reset(self):
+        """Forget reserved blocks (tests; the unused numbers are skipped)."""
+        with self._lock:
+            self._blocks.clear()
+
+
+allocator = OrderNumberAllocator()
+
+
+def allocate_order_numbers(count: int) -> List[str]:
+    """``count`` new ``ORD-YYYY-N`` numbers, e.g. for a batch import."""
+    return allocator.allocate(ORDER, count)
+
+
+def allocate_ftl_order_numbers(count: int) -> List[str]:
+    """``count`` new ``FTL-YYYY-N`` numbers."""
+    return allocator.allocate(FTL, count)
@@ -0,0 +1,193 @@
+"""
+Keyset (cursor) pagination for order listings.
+
+Pages are ordered newest first on ``(created_at, id)`` and each page
+continues from the last row of the previous one, so page 10,000 costs the
+same index range scan as page 1 - unlike OFFSET, which reads and discards
+every earlier row. Cursors are opaque; clients follow ``next``.
+
+Counting every matching row is what makes deep listings slow, so counts
+are opt-in with ``?count=``:
+
+    none      no count (default for the order ViewSets)
+    estimate  planner estimate on PostgreSQL, exact below
+              COURIER_EXACT_COUNT_THRESHOLD rows and on other databases
+    exact     COUNT(*)
+
+Listings only cover the last COURIER_ORDER_LIST_WINDOW_DAYS by default,
+so on PostgreSQL they are planned against the recent monthly partitions
+only (courier.partitioning). ``?since=YYYY-MM-DD`` (or a datetime) moves
+the start of the window and ``?since=all`` lifts it.
+"""
+import base64
+import json
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.settings import api_settings
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+COUNT_MODES = ('none', 'estimate', 'exact')
+
+
+def estimated_count(queryset):
+    """
+    Row count of ``queryset`` from the PostgreSQL planner.
+
+    Falls back to an exact count on other databases, and when the estimate
+    is small enough that counting is cheap (COURIER_EXACT_COUNT_THRESHOLD).
+
+    Returns:
+        tuple: (count, is_estimate)
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count(), False
+
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    estimate = int(plan[0]["Plan"]["Plan Rows"])
+
+    if estimate < getattr(settings, 'COURIER_EXACT_COUNT_THRESHOLD', 10000):
+        return queryset.count(), False
+    return estimate, True
+
+
+class KeysetPagination(BasePagination):
+    """Forward-only cursor pagination on ``(-created_at, -id)``."""
+    page_size = api_settings.PAGE_SIZE or 50
+    max_page_size = 500
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    default_count = 'none'
+    since_query_param = 'since'
+    invalid_cursor_message = 'Invalid cursor'
+    invalid_since_message = 'Expected a date (YYYY-MM-DD), a datetime or "all"'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+
+        since = self.get_since(request)
+        if since is not None:
+            queryset = queryset.filter(created_at__gte=since)
+
+        self.count, self.count_is_estimate = self.get_count(queryset, request)
+
+        queryset = queryset.order_by('-created_at', '-id')
+        if position is not None:
+            created_at, pk = position
+            # created_at <= c AND NOT (created_at = c AND id >= pk): stays an index range scan
+            queryset = queryset.filter(created_at__lte=created_at).exclude(created_at=created_at, id__gte=pk)
+
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        self.next_position = (rows[-1].created_at, rows[-1].pk) if self.has_next else None
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_since(self, request):
+        """Start of the listing window, or None for no lower bound."""
+        value = request.query_params.get(self.since_query_param)
+        if value == 'all':
+            return None
+        if value:
+            try:
+                since = parse_datetime(value)
+                if since is None and parse_date(value):
+                    since = datetime.combine(parse_date(value), time.min)
+            except ValueError:
+                since = None
+            if since is None:
+                raise ValidationError({self.since_query_param: [self.invalid_since_message]})
+            return timezone.make_aware(since) if timezone.is_naive(since) else since
+
+        days = getattr(settings, 'COURIER_ORDER_LIST_WINDOW_DAYS', 365)
+        return timezone.now() - timedelta(days=days) if days else None
+
+    def get_count(self, queryset, request):
+        mode = request.query_params.get(self.count_query_param, self.default_count)
+        if mode == 'exact':
+            return queryset.count(), False
+        if mode == 'estimate':
+            return estimated_count(queryset)
+        return None, False
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            created_at, pk = base64.urlsafe_b64decode(encoded.encode()).decode().split('|')
+            return datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position):
+        created_at, pk = position
+        token = base64.urlsafe_b64encode(f"{created_at.isoformat()}|{pk}".encode()).decode()
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, token)
+
+    def get_next_link(self):
+        return self.encode_cursor(self.next_position) if self.next_position else None
+
+    def get_page_metadata(self):
+        """next link and, when requested, count - for responses not shaped like get_paginated_response()."""
+        metadata = {"next": self.get_next_link()}
+        if self.count is not None:
+            metadata["count"] = self.count
+            metadata["count_is_estimate"] = self.count_is_estimate
+        return metadata
+
+    def get_paginated_response(self, data):
+        return Response({**self.get_page_metadata(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['next', 'results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'count': {'type': 'integer'},
+                'count_is_estimate': {'type': 'boolean'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {'name': self.cursor_query_param, 'required': False, 'in': 'query',
+             'description': 'Cursor from the previous page', 'schema': {'type': 'string'}},
+            {'name': self.page_size_query_param, 'required': False, 'in': 'query',
+             'description': 'Results per page', 'schema': {'type': 'integer'}},
+            {'name': self.count_query_param, 'required': False, 'in': 'query',
+             'description': 'none, estimate or exact', 'schema': {'type': 'string', 'enum': list(COUNT_MODES)}},
+            {'name': self.since_query_param, 'required': False, 'in': 'query',
+             'description': 'Oldest created_at to list (date or datetime), or "all"', 'schema': {'type': 'string'}},
+        ]
+
+
+class AdminKeysetPagination(KeysetPagination):
+    """Admin dashboard lists: ``?limit=`` page size (default 100), estimated count."""
+    page_size = 100
+    page_size_query_param = 'limit'
+    default_count = 'estimate'
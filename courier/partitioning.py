@@ -0,0 +1,195 @@
+"""
+Monthly range partitioning of orders and ftl_orders on PostgreSQL.
+
+Migration 0034 turns both tables into ``PARTITION BY RANGE (created_at)``
+parents with one partition per calendar month (``orders_y2026m10``) and a
+``*_default`` partition for anything outside them. Queries that bound
+``created_at`` - every listing does, see courier.pagination - only touch
+the matching partitions, and emptied months are dropped by the
+``archive_orders`` command instead of being vacuumed row by row.
+
+PostgreSQL requires the partition key in every unique constraint, so on a
+partitioned table the primary key is ``(id, created_at)`` and
+``order_number`` is unique per partition only; ids still come from one
+sequence and order numbers from courier.order_numbers, so neither can
+repeat. Django's model state is unchanged.
+
+Other databases (the SQLite dev setup) keep a single table and every
+function here is a no-op.
+"""
+import logging
+import re
+from datetime import date
+from typing import List
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+logger = logging.getLogger('courier')
+
+PARTITIONED_TABLES = ('orders', 'ftl_orders')
+
+
+def supports_partitioning(using: str = 'default') -> bool:
+    return connections[using].vendor == 'postgresql'
+
+
+def month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month:%Y}m{month:%m}"
+
+
+def is_partitioned(table: str, using: str = 'default') -> bool:
+    if not supports_partitioning(using):
+        return False
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions(table: str, using: str = 'default') -> List[str]:
+    """Monthly partitions of ``table``, oldest first (the default partition excluded)."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = %s AND pg_table_is_visible(p.oid)",
+            [table],
+        )
+        pattern = re.compile(rf"^{table}_y\d{{4}}m\d{{2}}$")
+        return sorted(name for (name,) in cursor.fetchall() if pattern.match(name))
+
+
+def partition_month(table: str, name: str) -> date:
+    year, month = name[len(table) + 2:].split('m')
+    return date(int(year), int(month), 1)
+
+
+def create_partition(cursor, table: str, month: date) -> str:
+    name = partition_name(table, month)
+    cursor.execute(
+        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+    return name
+
+
+def ensure_partitions(months_ahead: int = None, using: str = 'default') -> List[str]:
+    """
+    Make sure this month and the next ``months_ahead`` have partitions.
+
+    Rows for a month without a partition land in the default partition,
+    which every query has to scan, so this runs from archive_orders and
+    should run at least monthly.
+
+    Returns:
+        list: Partitions that exist afterwards for the covered months.
+    """
+    if months_ahead is None:
+        months_ahead = getattr(settings, 'COURIER_ORDER_PARTITION_MONTHS_AHEAD', 3)
+
+    this_month = month_start(timezone.now())
+    names = []
+    with connections[using].cursor() as cursor:
+        for table in PARTITIONED_TABLES:
+            if not is_partitioned(table, using):
+                continue
+            for offset in range(months_ahead + 1):
+                names.append(create_partition(cursor, table, add_months(this_month, offset)))
+    return names
+
+
+def drop_empty_partitions(before: date, using: str = 'default') -> List[str]:
+    """
+    Drop monthly partitions that end on or before ``before`` and hold no rows.
+
+    Returns:
+        list: Names of the dropped partitions.
+    """
+    dropped = []
+    with connections[using].cursor() as cursor:
+        for table in PARTITIONED_TABLES:
+            if not is_partitioned(table, using):
+                continue
+            for name in list_partitions(table, using):
+                if add_months(partition_month(table, name), 1) > before:
+                    break
+                cursor.execute(f'SELECT EXISTS (SELECT 1 FROM "{name}")')
+                if cursor.fetchone()[0]:
+                    continue
+                cursor.execute(f'DROP TABLE "{name}"')
+                dropped.append(name)
+                logger.info(f"ORDER_PARTITIONS: Dropped empty partition {name}")
+    return dropped
+
+
+def partition_table(schema_editor, table: str, months_ahead: int = 3):
+    """
+    Rebuild ``table`` as a monthly range-partitioned table, keeping its rows,
+    columns, indexes, foreign keys and id sequence. Used by migration 0034.
+    """
+    cursor = schema_editor.connection.cursor()
+    old = f"{table}_unpartitioned"
+
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype IN ('f', 'c')",
+        [table],
+    )
+    constraints = cursor.fetchall()
+    cursor.execute(
+        "SELECT indexdef FROM pg_indexes WHERE tablename = %s "
+        "AND indexname NOT IN (SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass)",
+        [table, table],
+    )
+    indexes = cursor.fetchall()
+    cursor.execute(f'SELECT min(created_at), max(id) FROM "{table}"')
+    oldest, max_id = cursor.fetchone()
+
+    cursor.execute(f'ALTER TABLE "{table}" RENAME TO "{old}"')
+    # NOT NULL and defaults come across; identity, keys and indexes are re-added below
+    cursor.execute(
+        f'CREATE TABLE "{table}" (LIKE "{old}" INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)'
+    )
+    # A serial default would tie the old sequence to the new table; it gets its own below
+    cursor.execute(f'ALTER TABLE "{table}" ALTER COLUMN id DROP DEFAULT')
+
+    month = month_start(oldest or timezone.now())
+    last = add_months(month_start(timezone.now()), months_ahead)
+    while month <= last:
+        create_partition(cursor, table, month)
+        month = add_months(month, 1)
+    cursor.execute(f'CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT')
+
+    cursor.execute(f'INSERT INTO "{table}" SELECT * FROM "{old}"')
+    cursor.execute(f'DROP TABLE "{old}"')
+
+    cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pkey" PRIMARY KEY (id, created_at)')
+    cursor.execute(
+        f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_order_number_key" UNIQUE (order_number, created_at)'
+    )
+    for name, definition in constraints:
+        cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+    # Read before the rename, so the definitions already name the new table
+    for (definition,) in indexes:
+        cursor.execute(definition)
+
+    sequence = f"{table}_id_seq"
+    cursor.execute(f'CREATE SEQUENCE IF NOT EXISTS "{sequence}" OWNED BY "{table}".id')
+    cursor.execute(f'ALTER TABLE "{table}" ALTER COLUMN id SET DEFAULT nextval(\'"{sequence}"\')')
+    if max_id:
+        cursor.execute("SELECT setval(%s, %s)", [f'"{sequence}"', max_id])
+    logger.info(f"ORDER_PARTITIONS: Partitioned {table} by month from {month_start(oldest or timezone.now())}")
@@ -2,10 +2,10 @@
 Custom permission classes for API endpoints.
 """
 from rest_framework import permissions
-from django.conf import settings
-from django.contrib.auth.hashers import check_password
 import logging
 
+from courier.authentication import check_admin_token
+
 logger = logging.getLogger('courier')
 
 
@@ -13,7 +13,8 @@ class IsAdminToken(permissions.BasePermission):
     """
     Permission class that checks for valid X-Admin-Token header.
     Used to protect admin-only endpoints.
-    Uses hashed password comparison for security.
+    Uses hashed password comparison for security (cached, see
+    courier.authentication.check_admin_token).
     """
 
     def has_permission(self, request, view):
@@ -28,7 +29,7 @@ class IsAdminToken(permissions.BasePermission):
             )
             return False
 
-        if not check_password(token, settings.ADMIN_PASSWORD_HASH):
+        if not check_admin_token(token):
             logger.warning(
                 f"ADMIN_ACCESS_DENIED: Invalid token - "
                 f"IP: {request.META.get('REMOTE_ADDR')}, "
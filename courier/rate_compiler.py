@@ -0,0 +1,199 @@
+"""
+Float-native rate card compiler.
+
+Builds the same carrier dicts as ``Courier.get_rate_dict()`` straight from
+``values_list`` rows, without instantiating models or walking the result
+with ``cast_decimal``. Decimal columns are cast to double precision in SQL
+(``CAST(... AS REAL)`` / ``::double precision``), so the database driver
+hands back floats and no ``Decimal`` object is ever created.
+
+Six queries compile any number of carriers: one for the carriers joined to
+their config tables, one per rate table. City routes and delivery slabs are
+only read for city-to-city carriers, custom zones only for custom matrices.
+"""
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db.models import FloatField, QuerySet
+from django.db.models.functions import Cast
+
+from courier.models import (
+    Courier, CourierZoneRate, CityRoute, DeliverySlab, CustomZone, CustomZoneRate
+)
+from courier.rate_import import FEE_FIELDS, FUEL_FIELDS
+
+# RoutingLogic.logic_type -> engine logic name
+LOGIC_NAMES = {
+    "City_To_City": "city_to_city",
+    "Zonal_Standard": "Zonal",
+    "Zonal_Custom": "Zonal",
+    "Region_CSV": "pincode_region_csv",
+}
+
+# Default CSV for Region_CSV carriers without one configured
+DEFAULT_REGION_CSV = "BlueDart_Serviceable Pincodes.csv"
+
+
+def _float(field):
+    return Cast(field, FloatField())
+
+
+COURIER_COLUMNS = (
+    ["pk", "name", "carrier_type", "carrier_mode", "is_active", "legacy_rate_card_backup"]
+    + ["fees_config__pk"] + [_float(f"fees_config__{field}") for _, _, field in FEE_FIELDS]
+    + ["constraints_config__pk", "constraints_config__min_weight", "constraints_config__max_weight",
+       "constraints_config__volumetric_divisor", "constraints_config__required_source_city"]
+    + ["fuel_config_obj__pk", "fuel_config_obj__is_dynamic"]
+    + [_float(f"fuel_config_obj__{field}") for _, field in FUEL_FIELDS[1:]]
+    + ["routing_config__pk", "routing_config__logic_type", "routing_config__serviceable_pincode_csv",
+       "routing_config__hub_city", "routing_config__hub_pincode_prefixes"]
+)
+
+
+def _grouped(queryset, *fields):
+    """Rows of a rate table grouped by courier id, in the model's ordering."""
+    groups = defaultdict(list)
+    for courier_id, *values in queryset.values_list("courier_id", *fields):
+        groups[courier_id].append(values)
+    return groups
+
+
+def compile_rate_cards(couriers: Optional[QuerySet] = None) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """
+    Compile carriers into engine rate cards.
+
+    Args:
+        couriers: Courier queryset to compile (default: active carriers).
+
+    Returns:
+        tuple: (rate card dicts, matching courier ids), in queryset order.
+    """
+    if couriers is None:
+        couriers = Courier.objects.filter(is_active=True)
+
+    rows = list(couriers.values_list(*COURIER_COLUMNS))
+    if not rows:
+        return [], []
+
+    courier_ids = [row[0] for row in rows]
+    logic_types = {row[0]: row[-4] for row in rows}
+    city_ids = [pk for pk, logic in logic_types.items() if logic == "City_To_City"]
+    custom_ids = [pk for pk, logic in logic_types.items() if logic == "Zonal_Custom"]
+
+    zone_rates = _grouped(
+        CourierZoneRate.objects.filter(courier__in=couriers.values("pk")),
+        "zone_code", "rate_type", _float("rate"),
+    )
+    city_routes = _grouped(
+        CityRoute.objects.filter(courier_id__in=city_ids), "city_name", _float("rate_per_kg")
+    ) if city_ids else {}
+    slabs = _grouped(
+        DeliverySlab.objects.filter(courier_id__in=city_ids), "min_weight", "max_weight", _float("rate")
+    ) if city_ids else {}
+    custom_zones = _grouped(
+        CustomZone.objects.filter(courier_id__in=custom_ids), "location_name", "zone_code"
+    ) if custom_ids else {}
+    custom_rates = _grouped(
+        CustomZoneRate.objects.filter(courier_id__in=custom_ids), "from_zone", "to_zone", _float("rate_per_kg")
+    ) if custom_ids else {}
+
+    carriers = [
+        _compile(row, zone_rates, city_routes, slabs, custom_zones, custom_rates)
+        for row in rows
+    ]
+    return carriers, courier_ids
+
+
+def _compile(row, zone_rates, city_routes, slabs, custom_zones, custom_rates) -> Dict[str, Any]:
+    """One rate card dict, mirroring Courier.get_rate_dict()."""
+    values = iter(row)
+    pk, name, carrier_type, carrier_mode, is_active, legacy = (next(values) for _ in range(6))
+    legacy = legacy or {}
+
+    fees_pk = next(values)
+    fees = [next(values) for _ in FEE_FIELDS]
+    constraints_pk, min_weight, max_weight, volumetric_divisor, required_source_city = (
+        next(values) for _ in range(5)
+    )
+    fuel_pk, fuel_is_dynamic = next(values), next(values)
+    fuel = [next(values) for _ in FUEL_FIELDS[1:]]
+    routing_pk, logic_type, pincode_csv, hub_city, hub_pincode_prefixes = (next(values) for _ in range(5))
+
+    fwd_rates, add_rates = {}, {}
+    for zone_code, rate_type, rate in zone_rates.get(pk, ()):
+        if rate_type == CourierZoneRate.RateType.FORWARD:
+            fwd_rates[zone_code] = rate
+        else:
+            add_rates[zone_code] = rate
+
+    fixed_fees, variable_fees = {}, {}
+    sections = {"fixed_fees": fixed_fees, "variable_fees": variable_fees}
+    for (section, key, _), value in zip(FEE_FIELDS, fees):
+        sections[section][key] = value if fees_pk is not None else 0.0
+
+    if constraints_pk is None:
+        min_weight, max_weight, volumetric_divisor = 0.5, 99999.0, 5000
+        required_source_city = legacy.get("required_source_city")
+
+    fuel_config = {"is_dynamic": fuel_is_dynamic if fuel_pk is not None else False}
+    for (key, _), value in zip(FUEL_FIELDS[1:], fuel):
+        fuel_config[key] = value if fuel_pk is not None else 0.0
+
+    if routing_pk is None:
+        logic_type = "Zonal_Standard"
+
+    routing_logic = {
+        "is_city_specific": False,
+        "zonal_rates": {"forward": fwd_rates, "additional": add_rates},
+        "city_rates": None,
+        "zone_mapping": None,
+        "door_delivery_slabs": [],
+    }
+    data = {
+        "carrier_name": name,
+        "type": carrier_type,
+        "mode": carrier_mode,
+        "active": is_active,
+        "min_weight": min_weight,
+        "max_weight": max_weight,
+        "volumetric_divisor": volumetric_divisor,
+        "logic": LOGIC_NAMES.get(logic_type, "Zonal"),
+        "required_source_city": required_source_city,
+        "hub_pincode_prefixes": hub_pincode_prefixes,
+        "fuel_config": fuel_config,
+        "fixed_fees": fixed_fees,
+        "variable_fees": variable_fees,
+        "routing_logic": routing_logic,
+    }
+
+    if logic_type == "City_To_City":
+        routing_logic["is_city_specific"] = True
+        if pincode_csv:
+            routing_logic["pincode_csv"] = pincode_csv
+        if hub_city:
+            routing_logic["hub_city"] = hub_city
+        routing_logic["city_rates"] = {city.lower(): rate for city, rate in city_routes.get(pk, ())}
+        routing_logic["door_delivery_slabs"] = [
+            {"min": low, "max": high, "rate": rate} for low, high, rate in slabs.get(pk, ())
+        ]
+
+    elif logic_type == "Zonal_Custom":
+        data["zone_mapping"] = {location: zone for location, zone in custom_zones.get(pk, ())}
+        matrix = {}
+        for from_zone, to_zone, rate in custom_rates.get(pk, ()):
+            matrix.setdefault(from_zone, {})[to_zone] = rate
+        routing_logic["zonal_rates"] = matrix
+
+    elif logic_type == "Region_CSV":
+        routing_logic["type"] = "pincode_region_csv"
+        routing_logic["csv_file"] = pincode_csv or DEFAULT_REGION_CSV
+        data["forward_rates"] = dict(fwd_rates)
+
+    # Legacy backup keys (EDL config, extra fees) are merged for all logic types
+    for key in ("edl_config", "edl_matrix"):
+        if key in legacy:
+            data[key] = legacy[key]
+    variable_fees.update(legacy.get("variable_fees", {}))
+    fixed_fees.update(legacy.get("fixed_fees", {}))
+
+    return data
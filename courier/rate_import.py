@@ -0,0 +1,481 @@
+"""
+Transactional bulk import of rate card documents into the database.
+
+A rate card document is a list of carrier dicts in the same shape that
+``Courier.get_rate_dict()`` produces (and that ``GET /api/admin/rates``
+returns), so an export can be edited and imported back.
+
+The importer diffs the document against the DB and applies only the
+changes, using ``bulk_create``/``bulk_update``/queryset deletes on
+``Courier``, the normalized config tables and the per-carrier rate tables,
+all in one transaction. The rate card version is bumped exactly once.
+"""
+import logging
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from courier.constants import CacheKeys
+from courier.exceptions import RateCardImportError
+from courier.models import (
+    Courier, CourierZoneRate, CityRoute, DeliverySlab, CustomZone, CustomZoneRate, SystemConfig
+)
+from courier.models_refactored import FeeStructure, ServiceConstraints, FuelConfiguration, RoutingLogic
+from courier.signals import defer_rate_card_invalidation, queue_requote, _invalidate_carrier_rate_cards
+
+logger = logging.getLogger('courier')
+
+
+# (document section, document key, model field)
+FEE_FIELDS = [
+    ("fixed_fees", "docket_fee", "docket_fee"),
+    ("fixed_fees", "eway_bill_fee", "eway_bill_fee"),
+    ("fixed_fees", "cod_fixed", "cod_fixed"),
+    ("fixed_fees", "appointment_delivery", "appointment_delivery_fee"),
+    ("variable_fees", "cod_percent", "cod_percent"),
+    ("variable_fees", "hamali_per_kg", "hamali_per_kg"),
+    ("variable_fees", "min_hamali", "min_hamali"),
+    ("variable_fees", "fov_insured_percent", "fov_insured_percent"),
+    ("variable_fees", "fov_uninsured_percent", "fov_uninsured_percent"),
+    ("variable_fees", "fov_min", "fov_min"),
+    ("variable_fees", "damage_claim_percent", "damage_claim_percent"),
+]
+
+FUEL_FIELDS = [
+    ("is_dynamic", "is_dynamic"),
+    ("base_diesel_price", "base_price"),
+    ("diesel_ratio", "ratio"),
+    ("flat_percent", "surcharge_percent"),
+]
+
+# Extra document keys kept verbatim in Courier.legacy_rate_card_backup
+LEGACY_KEYS = ["edl_config", "edl_matrix"]
+
+CONFIG_MODELS = {
+    "fees": (FeeStructure, "fees_config"),
+    "constraints": (ServiceConstraints, "constraints_config"),
+    "fuel": (FuelConfiguration, "fuel_config_obj"),
+    "routing": (RoutingLogic, "routing_config"),
+}
+
+
+def _decimal(value, model, field):
+    """Parse a document number the way the DecimalField will store it."""
+    places = model._meta.get_field(field).decimal_places
+    return Decimal(str(value if value is not None else 0)).quantize(Decimal(1).scaleb(-places))
+
+
+def _logic_type(doc):
+    """Map the engine's logic names back to RoutingLogic.logic_type."""
+    routing = doc.get("routing_logic") or {}
+    logic = doc.get("logic")
+    if routing.get("type") == "pincode_region_csv" or logic == "pincode_region_csv":
+        return "Region_CSV"
+    if logic == "city_to_city":
+        return "City_To_City"
+    # get_rate_dict() sets zone_mapping (possibly empty) only for custom matrices
+    if logic == "Zonal_Custom" or doc.get("zone_mapping") is not None:
+        return "Zonal_Custom"
+    return "Zonal_Standard"
+
+
+def parse_carrier(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert one carrier document into the rows it should produce.
+
+    Only the tables the carrier's logic type actually reads are described;
+    rows in other tables are left alone by the import.
+
+    Raises:
+        ValueError, TypeError, InvalidOperation: On malformed values.
+    """
+    name = doc.get("carrier_name")
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("carrier_name is required")
+    mode = doc.get("mode", "Surface")
+    if mode not in ("Surface", "Air"):
+        raise ValueError(f"Invalid mode '{mode}'")
+    carrier_type = doc.get("type", "Courier")
+    if carrier_type not in ("Courier", "PTL"):
+        raise ValueError(f"Invalid type '{carrier_type}'")
+
+    logic_type = _logic_type(doc)
+    routing_doc = doc.get("routing_logic") or {}
+    fuel_doc = doc.get("fuel_config") or {}
+
+    spec = {
+        "name": name.strip(),
+        "courier": {"is_active": bool(doc.get("active", True)), "carrier_type": carrier_type, "carrier_mode": mode},
+        "fees": {
+            field: _decimal((doc.get(section) or {}).get(key), FeeStructure, field)
+            for section, key, field in FEE_FIELDS
+        },
+        "constraints": {
+            "min_weight": float(doc.get("min_weight", 0.5)),
+            "max_weight": float(doc.get("max_weight", 99999.0)),
+            "volumetric_divisor": int(doc.get("volumetric_divisor", 5000)),
+            "required_source_city": doc.get("required_source_city"),
+        },
+        "fuel": {
+            field: (bool(fuel_doc.get(key, False)) if field == "is_dynamic"
+                    else _decimal(fuel_doc.get(key), FuelConfiguration, field))
+            for key, field in FUEL_FIELDS
+        },
+        "routing": {
+            "logic_type": logic_type,
+            "serviceable_pincode_csv": routing_doc.get("pincode_csv") or routing_doc.get("csv_file"),
+            "hub_city": routing_doc.get("hub_city"),
+            "hub_pincode_prefixes": doc.get("hub_pincode_prefixes"),
+        },
+        "children": {},
+    }
+
+    # Fee keys without a column survive in the legacy backup (merged by get_rate_dict)
+    legacy = {key: doc[key] for key in LEGACY_KEYS if key in doc}
+    for section in ("fixed_fees", "variable_fees"):
+        mapped = {key for sec, key, _ in FEE_FIELDS if sec == section}
+        extras = {k: v for k, v in (doc.get(section) or {}).items() if k not in mapped}
+        if extras:
+            legacy[section] = extras
+    spec["legacy"] = legacy
+
+    children = spec["children"]
+    if logic_type == "Zonal_Custom":
+        children[CustomZone] = {
+            location: {"zone_code": str(zone)} for location, zone in (doc.get("zone_mapping") or {}).items()
+        }
+        children[CustomZoneRate] = {
+            (from_zone, to_zone): {"rate_per_kg": _decimal(rate, CustomZoneRate, "rate_per_kg")}
+            for from_zone, row in (routing_doc.get("zonal_rates") or {}).items()
+            for to_zone, rate in row.items()
+        }
+    else:
+        zonal = routing_doc.get("zonal_rates") or {}
+        forward = dict(zonal.get("forward") or {})
+        if logic_type == "Region_CSV":
+            forward.update(doc.get("forward_rates") or {})
+        rates = {}
+        for rate_type, zone_rates in ((CourierZoneRate.RateType.FORWARD, forward),
+                                      (CourierZoneRate.RateType.ADDITIONAL, zonal.get("additional") or {})):
+            for zone_code, rate in zone_rates.items():
+                rates[(zone_code, rate_type)] = {"rate": _decimal(rate, CourierZoneRate, "rate")}
+        children[CourierZoneRate] = rates
+
+    if logic_type == "City_To_City":
+        children[CityRoute] = {
+            city.lower(): {"rate_per_kg": _decimal(rate, CityRoute, "rate_per_kg")}
+            for city, rate in (routing_doc.get("city_rates") or {}).items()
+        }
+        children[DeliverySlab] = {
+            (float(slab["min"]), float(slab["max"]) if slab.get("max") is not None else None):
+                {"rate": _decimal(slab["rate"], DeliverySlab, "rate")}
+            for slab in routing_doc.get("door_delivery_slabs") or []
+        }
+
+    return spec
+
+
+# Natural key of each per-carrier table, as used in parse_carrier()
+CHILD_KEYS = {
+    CourierZoneRate: lambda row: (row.zone_code, row.rate_type),
+    CityRoute: lambda row: row.city_name.lower(),
+    DeliverySlab: lambda row: (row.min_weight, row.max_weight),
+    CustomZone: lambda row: row.location_name,
+    CustomZoneRate: lambda row: (row.from_zone, row.to_zone),
+}
+
+CHILD_FIELDS = {
+    CourierZoneRate: lambda key: {"zone_code": key[0], "rate_type": key[1]},
+    CityRoute: lambda key: {"city_name": key},
+    DeliverySlab: lambda key: {"min_weight": key[0], "max_weight": key[1]},
+    CustomZone: lambda key: {"location_name": key},
+    CustomZoneRate: lambda key: {"from_zone": key[0], "to_zone": key[1]},
+}
+
+
+class _Changes:
+    """Pending creates, updates and deletes for one model."""
+
+    def __init__(self):
+        self.create = []
+        self.update = []
+        self.update_fields = set()
+        self.delete = []
+
+    def set_fields(self, obj, values):
+        """Assign changed values to ``obj``; True if anything changed."""
+        changed = [f for f, v in values.items() if getattr(obj, f) != v]
+        for f in changed:
+            setattr(obj, f, values[f])
+        if changed:
+            self.update.append(obj)
+            self.update_fields.update(changed)
+        return bool(changed)
+
+
+class RateCardImporter:
+    """
+    Diff a rate card document against the DB and apply it in one transaction.
+
+    Usage:
+        summary = RateCardImporter(carriers, deactivate_missing=True).run()
+    """
+
+    MODELS = [Courier, FeeStructure, ServiceConstraints, FuelConfiguration, RoutingLogic,
+              CourierZoneRate, CityRoute, DeliverySlab, CustomZone, CustomZoneRate]
+
+    def __init__(self, carriers: List[Dict[str, Any]], deactivate_missing: bool = False):
+        self.documents = carriers
+        self.deactivate_missing = deactivate_missing
+        self.specs = self._validate(carriers)
+
+    @staticmethod
+    def _validate(carriers):
+        if not isinstance(carriers, list):
+            raise RateCardImportError([{"carrier": None, "error": "Rate card document must be a list of carriers"}])
+
+        specs, errors, seen = [], [], set()
+        for index, doc in enumerate(carriers):
+            label = doc.get("carrier_name", f"#{index}") if isinstance(doc, dict) else f"#{index}"
+            try:
+                if not isinstance(doc, dict):
+                    raise TypeError("carrier entry must be an object")
+                spec = parse_carrier(doc)
+            except (ValueError, TypeError, KeyError, AttributeError, InvalidOperation) as e:
+                errors.append({"carrier": label, "error": str(e) or e.__class__.__name__})
+                continue
+            if spec["name"] in seen:
+                errors.append({"carrier": label, "error": "Duplicate carrier_name in document"})
+                continue
+            seen.add(spec["name"])
+            specs.append(spec)
+
+        if errors:
+            raise RateCardImportError(errors)
+        return specs
+
+    def _diff(self):
+        """Work out every row change without writing anything."""
+        changes = {model: _Changes() for model in self.MODELS}
+        summary = {"created": [], "updated": [], "deactivated": [], "unchanged": []}
+
+        names = [spec["name"] for spec in self.specs]
+        existing = {
+            c.name: c for c in Courier.objects.filter(name__in=names).select_related(
+                *[attr for _, attr in CONFIG_MODELS.values()]
+            )
+        }
+        ids = [c.pk for c in existing.values()]
+        rows = {}
+        for model in CHILD_KEYS:
+            for row in model.objects.filter(courier_id__in=ids):
+                rows.setdefault((model, row.courier_id), {})[CHILD_KEYS[model](row)] = row
+
+        self._new_specs = []
+        for spec in self.specs:
+            courier = existing.get(spec["name"])
+            if courier is None:
+                self._new_specs.append(spec)
+                summary["created"].append(spec["name"])
+                continue
+
+            changed = changes[Courier].set_fields(
+                courier, dict(spec["courier"], legacy_rate_card_backup=spec["legacy"])
+            )
+
+            for section, (model, attr) in CONFIG_MODELS.items():
+                config = getattr(courier, attr, None)
+                if config is None:
+                    changes[model].create.append(model(courier_link=courier, **spec[section]))
+                    changed = True
+                else:
+                    changed |= changes[model].set_fields(config, spec[section])
+
+            for model, desired in spec["children"].items():
+                current = rows.get((model, courier.pk), {})
+                for key, values in desired.items():
+                    row = current.get(key)
+                    if row is None:
+                        changes[model].create.append(model(courier=courier, **CHILD_FIELDS[model](key), **values))
+                        changed = True
+                    else:
+                        changed |= changes[model].set_fields(row, values)
+                stale = [row.pk for key, row in current.items() if key not in desired]
+                changes[model].delete.extend(stale)
+                changed |= bool(stale)
+
+            summary["updated" if changed else "unchanged"].append(spec["name"])
+
+        if self.deactivate_missing:
+            missing = Courier.objects.filter(is_active=True).exclude(name__in=names)
+            for courier in missing:
+                changes[Courier].set_fields(courier, {"is_active": False})
+                summary["deactivated"].append(courier.name)
+
+        return changes, summary
+
+    def _apply(self, changes):
+        now = timezone.now()
+        courier_changes = changes[Courier]
+
+        if self._new_specs:
+            Courier.objects.bulk_create([
+                Courier(name=spec["name"], legacy_rate_card_backup=spec["legacy"], **spec["courier"])
+                for spec in self._new_specs
+            ])
+            # Re-read pks: not every backend returns them from bulk_create
+            new_ids = dict(Courier.objects.filter(
+                name__in=[spec["name"] for spec in self._new_specs]
+            ).values_list('name', 'pk'))
+            for spec in self._new_specs:
+                courier_id = new_ids[spec["name"]]
+                for section, (model, _) in CONFIG_MODELS.items():
+                    changes[model].create.append(model(courier_link_id=courier_id, **spec[section]))
+                for model, desired in spec["children"].items():
+                    changes[model].create.extend(
+                        model(courier_id=courier_id, **CHILD_FIELDS[model](key), **values)
+                        for key, values in desired.items()
+                    )
+
+        if courier_changes.update:
+            for courier in courier_changes.update:
+                courier.updated_at = now
+            Courier.objects.bulk_update(
+                courier_changes.update, sorted(courier_changes.update_fields | {"updated_at"})
+            )
+
+        for model in self.MODELS[1:]:
+            model_changes = changes[model]
+            if model_changes.delete:
+                model.objects.filter(pk__in=model_changes.delete).delete()
+            if model_changes.update:
+                model.objects.bulk_update(model_changes.update, sorted(model_changes.update_fields), batch_size=500)
+            if model_changes.create:
+                model.objects.bulk_create(model_changes.create, batch_size=500)
+
+    def run(self, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Apply the document.
+
+        Args:
+            dry_run: Only report what would change.
+
+        Returns:
+            dict: Carriers created/updated/deactivated/unchanged, per-table
+            row counts and the resulting rate card version.
+        """
+        with transaction.atomic(), defer_rate_card_invalidation():
+            changes, summary = self._diff()
+            summary["rows"] = {
+                model._meta.db_table: {
+                    "created": len(c.create), "updated": len(c.update), "deleted": len(c.delete)
+                }
+                for model, c in changes.items() if c.create or c.update or c.delete
+            }
+            # New carriers' rows are only built in _apply(), once they have an id
+            for spec in self._new_specs:
+                tables = [Courier] + [model for model, _ in CONFIG_MODELS.values()] + list(spec["children"])
+                for model in tables:
+                    counts = summary["rows"].setdefault(
+                        model._meta.db_table, {"created": 0, "updated": 0, "deleted": 0}
+                    )
+                    counts["created"] += len(spec["children"][model]) if model in spec["children"] else 1
+
+            has_changes = bool(summary["created"] or summary["updated"] or summary["deactivated"])
+            if not dry_run and has_changes:
+                self._apply(changes)
+                SystemConfig.get_solo()
+                SystemConfig.bump_rate_card_version()
+                cache.delete(CacheKeys.CARRIER_RATE_CARDS)
+                transaction.on_commit(lambda: cache.delete(CacheKeys.CARRIER_RATE_CARDS))
+                # New carriers have no quoted drafts yet
+                if summary["updated"] or summary["deactivated"]:
+                    repriced = Courier.objects.filter(name__in=summary["updated"] + summary["deactivated"])
+                    queue_requote(list(repriced.values_list('id', flat=True)), "Rate card import")
+
+        summary["dry_run"] = dry_run
+        summary["rate_card_version"] = SystemConfig.get_rate_card_version()
+        if not dry_run and has_changes:
+            logger.info(
+                f"Rate card import applied: {len(summary['created'])} created, "
+                f"{len(summary['updated'])} updated, {len(summary['deactivated'])} deactivated "
+                f"(version {summary['rate_card_version']})"
+            )
+        return summary
+
+
+def export_rate_cards() -> List[Dict[str, Any]]:
+    """All carriers (active and inactive) as an importable rate card document."""
+    from courier.rate_compiler import compile_rate_cards
+
+    carriers, _ = compile_rate_cards(Courier.objects.all())
+    return carriers
+
+
+def update_carrier_rate_card(carrier_name: str, changes: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply a partial carrier update (``NewCarrierSerializer`` fields) through the importer.
+
+    Returns:
+        dict: The carrier's rate card after the update.
+
+    Raises:
+        Courier.DoesNotExist: If no carrier has this name.
+        RateCardImportError: If the result does not validate or the new name is taken.
+    """
+    courier = Courier.objects.get(name=carrier_name)
+    doc = courier.get_rate_dict()
+
+    if "mode" in changes:
+        doc["mode"] = changes["mode"]
+    if "active" in changes:
+        doc["active"] = changes["active"]
+    if "min_weight" in changes:
+        doc["min_weight"] = changes["min_weight"]
+    if "cod_fixed" in changes:
+        doc["fixed_fees"]["cod_fixed"] = changes["cod_fixed"]
+    if "cod_percent" in changes:
+        doc["variable_fees"]["cod_percent"] = changes["cod_percent"]
+    if doc.get("zone_mapping") is not None and ({"forward_rates", "additional_rates"} & set(changes)):
+        raise RateCardImportError([{
+            "carrier": carrier_name, "error": "Zone rates do not apply to a custom zone matrix carrier"
+        }])
+    zonal = doc["routing_logic"]["zonal_rates"]
+    if "forward_rates" in changes:
+        zonal.setdefault("forward", {}).update(changes["forward_rates"])
+        if "forward_rates" in doc:
+            doc["forward_rates"].update(changes["forward_rates"])
+    if "additional_rates" in changes:
+        zonal.setdefault("additional", {}).update(changes["additional_rates"])
+
+    new_name = changes.get("carrier_name", carrier_name)
+    with transaction.atomic():
+        if new_name != carrier_name:
+            if Courier.objects.filter(name=new_name).exists():
+                raise RateCardImportError([{"carrier": new_name, "error": "Carrier name already exists"}])
+            # Queryset update skips the signals; the rate cards are keyed by name
+            Courier.objects.filter(pk=courier.pk).update(name=new_name)
+            _invalidate_carrier_rate_cards(courier.pk, "Carrier renamed")
+            doc["carrier_name"] = new_name
+        RateCardImporter([doc]).run()
+    if new_name != carrier_name:
+        cache.delete(CacheKeys.CARRIER_RATE_CARDS)
+
+    return Courier.objects.get(pk=courier.pk).get_rate_dict()
+
+
+def delete_carrier_rate_card(courier: Courier):
+    """
+    Delete a carrier with all its rate tables, bumping the rate card version once.
+
+    Raises:
+        ProtectedError: If orders still reference the carrier.
+    """
+    with transaction.atomic(), defer_rate_card_invalidation():
+        courier.delete()
+        SystemConfig.get_solo()
+        SystemConfig.bump_rate_card_version()
+    cache.delete(CacheKeys.CARRIER_RATE_CARDS)
@@ -0,0 +1,164 @@
+"""
+Effective-dated, immutable rate card versions.
+
+Publishing a version freezes the compiled rate cards and system config
+into a ``RateCardVersion`` row. Because a published version never changes,
+its snapshot is cached in-process forever (keyed by id); only the small
+schedule of (effective_from, id) pairs goes through the shared cache.
+
+Which version prices a quote is decided purely by the clock: the latest
+version whose ``effective_from`` has passed. A version scheduled for the
+1st of next month therefore activates on its own, with no cache
+invalidation. Until the first version is published, pricing keeps using
+the live rate tables; after that, edits to the live tables are drafts that
+reach quotes only with the next published version. Publishing queues a
+re-quote of DRAFT orders that starts when the version takes effect.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from courier.constants import CacheKeys
+from courier.snapshot import RateCardSnapshot, build_snapshot
+
+logger = logging.getLogger('courier')
+
+# Short TTL so a version published from another worker is picked up quickly
+SCHEDULE_CACHE_TIMEOUT = 60
+# Published versions kept in memory (active one plus recently quoted ones)
+MAX_CACHED_VERSIONS = 8
+
+_lock = threading.Lock()
+_snapshots: "OrderedDict[int, RateCardSnapshot]" = OrderedDict()
+
+
+def get_schedule() -> List[Tuple[datetime, int]]:
+    """All published versions as (effective_from, id), newest first."""
+    from courier.models import RateCardVersion
+
+    schedule = cache.get(CacheKeys.RATE_CARD_SCHEDULE)
+    if schedule is None:
+        schedule = list(
+            RateCardVersion.objects.order_by('-effective_from', '-id').values_list('effective_from', 'id')
+        )
+        cache.set(CacheKeys.RATE_CARD_SCHEDULE, schedule, SCHEDULE_CACHE_TIMEOUT)
+    return schedule
+
+
+def get_active_version_id(at: Optional[datetime] = None) -> Optional[int]:
+    """Id of the version in effect at ``at`` (default: now), or None if none is."""
+    at = at or timezone.now()
+    for effective_from, version_id in get_schedule():
+        if effective_from <= at:
+            return version_id
+    return None
+
+
+def get_version_snapshot(version_id: int) -> RateCardSnapshot:
+    """
+    Snapshot of a published version, cached in-process.
+
+    Raises:
+        RateCardVersion.DoesNotExist: If the version does not exist.
+    """
+    from courier.models import RateCardVersion
+
+    with _lock:
+        snapshot = _snapshots.get(version_id)
+        if snapshot is not None:
+            _snapshots.move_to_end(version_id)
+            return snapshot
+
+    version = RateCardVersion.objects.get(pk=version_id)
+    snapshot = RateCardSnapshot.from_payload(version.payload, version_id=version.pk)
+
+    with _lock:
+        _snapshots[version_id] = snapshot
+        while len(_snapshots) > MAX_CACHED_VERSIONS:
+            _snapshots.popitem(last=False)
+    return snapshot
+
+
+def peek_version_snapshot(version_id: int) -> Optional[RateCardSnapshot]:
+    """Snapshot of a published version if it is already in memory; never queries."""
+    with _lock:
+        return _snapshots.get(version_id)
+
+
+def get_active_version_snapshot() -> Optional[RateCardSnapshot]:
+    """Snapshot of the version in effect now, or None before the first publish."""
+    version_id = get_active_version_id()
+    if version_id is None:
+        return None
+    return get_version_snapshot(version_id)
+
+
+def draft_warning() -> Optional[str]:
+    """
+    Warning for an edit to the live rate tables, or None if the edit is live.
+
+    Once a published version is in effect, edits only reach quotes when the
+    next version is published; admin endpoints pass this on to the caller.
+    """
+    version_id = get_active_version_id()
+    if version_id is None:
+        return None
+    return (
+        f"Saved as a draft: quotes use published rate card version {version_id} "
+        f"until a new version is published."
+    )
+
+
+def publish_rate_card_version(effective_from: Optional[datetime] = None, notes: str = ""):
+    """
+    Freeze the current rate tables and system config into a new version.
+
+    Args:
+        effective_from: When the version takes effect (default: now).
+        notes: Free-text description, e.g. "March diesel revision".
+
+    Returns:
+        RateCardVersion: The published version.
+    """
+    from courier.models import RateCardVersion
+
+    snapshot = build_snapshot()
+    payload = snapshot.to_payload()
+    # FTL rates are file-based and not versioned
+    payload.pop("ftl_rates", None)
+    payload.pop("ftl_source_mtime", None)
+
+    version = RateCardVersion.objects.create(
+        effective_from=effective_from or timezone.now(),
+        payload=payload,
+        source_version=snapshot.version,
+        notes=notes,
+    )
+    cache.delete(CacheKeys.RATE_CARD_SCHEDULE)
+    if getattr(settings, 'COURIER_REQUOTE_ON_RATE_CHANGE', True):
+        transaction.on_commit(lambda: _requote_on_publish(version))
+    logger.info(
+        f"Rate card version {version.pk} published ({len(snapshot)} carriers, "
+        f"effective {version.effective_from.isoformat()})"
+    )
+    return version
+
+
+def _requote_on_publish(version):
+    from courier.requote import enqueue_requote
+
+    enqueue_requote(reason=f"Rate card version {version.pk} published", run_after=version.effective_from)
+
+
+def clear_version_cache():
+    """Forget cached version snapshots (tests and after restoring a DB)."""
+    with _lock:
+        _snapshots.clear()
+    cache.delete(CacheKeys.RATE_CARD_SCHEDULE)
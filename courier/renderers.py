@@ -0,0 +1,76 @@
+"""
+Fast JSON renderer and parser.
+
+msgspec-backed drop-ins for DRF's JSONRenderer / JSONParser, used on the
+hot endpoints (quotes, order lists, FTL routes). The wire format matches
+JSONRenderer: compact separators, UTF-8, Decimals as JSON numbers
+(DRF's COERCE_DECIMAL_TO_STRING still applies in serializers), dates and
+UUIDs as strings, and ``; indent=N`` honoured for pretty printing.
+"""
+import contextlib
+
+import msgspec
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, FormParser, MultiPartParser
+from rest_framework.renderers import BaseRenderer, BrowsableAPIRenderer
+from rest_framework.utils import encoders
+from rest_framework.utils.mediatypes import parse_header_parameters
+
+# Anything msgspec does not know natively goes through DRF's encoder
+_drf_encoder = encoders.JSONEncoder()
+
+
+def _enc_hook(obj):
+    # DRF ErrorDetail and other str subclasses in validation errors
+    if isinstance(obj, str):
+        return str(obj)
+    try:
+        return _drf_encoder.default(obj)
+    except TypeError as e:
+        raise NotImplementedError(str(e))
+
+
+encoder = msgspec.json.Encoder(enc_hook=_enc_hook, decimal_format='number')
+
+
+class MsgspecJSONRenderer(BaseRenderer):
+    """Renderer which serializes to JSON with msgspec."""
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def get_indent(self, accepted_media_type, renderer_context):
+        if accepted_media_type:
+            base_media_type, params = parse_header_parameters(accepted_media_type)
+            with contextlib.suppress(KeyError, ValueError, TypeError):
+                return max(min(int(params['indent']), 8), 0) or None
+        return renderer_context.get('indent', None)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        ret = encoder.encode(data)
+        if indent:
+            ret = msgspec.json.format(ret, indent=indent)
+        return ret
+
+
+class MsgspecJSONParser(BaseParser):
+    """Parses JSON request bodies with msgspec."""
+    media_type = 'application/json'
+    renderer_class = MsgspecJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgspec.json.decode(stream.read() if stream is not None else b'')
+        except msgspec.DecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+# For @renderer_classes / @parser_classes and ViewSet attributes
+FAST_RENDERER_CLASSES = [MsgspecJSONRenderer, BrowsableAPIRenderer]
+FAST_PARSER_CLASSES = [MsgspecJSONParser]
+# DRF's stock parsers with msgspec taking JSON, for views that also accept forms
+FAST_DEFAULT_PARSER_CLASSES = [MsgspecJSONParser, FormParser, MultiPartParser]
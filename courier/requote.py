@@ -0,0 +1,248 @@
+"""
+Re-quoting of DRAFT orders after rate or fuel changes.
+
+A DRAFT order can carry a stored quote (carrier, mode, total_cost,
+cost_breakdown). When SystemConfig or a carrier's rate tables change, that
+quote goes stale until BookingService prices the order again. Every such
+change queues a ``RequoteJob`` (courier.signals, rate card import); the
+requote_drafts command works the jobs off in the background:
+
+- Only DRAFT orders with a stored quote are looked at, narrowed to the
+  changed carriers (a SystemConfig change touches all of them) and, for
+  manual jobs, to one lane.
+- Orders are taken in id order, ``COURIER_REQUOTE_BATCH_SIZE`` at a time.
+  Within a batch every distinct (carrier, mode, lane, weight, COD value)
+  is priced once and the changed quotes are written with one bulk UPDATE.
+- Each batch locks its orders (like booking does), so a concurrent booking
+  is never overwritten, and saves the job's cursor in the same transaction.
+  A job that dies is resumed from its cursor by the next run.
+- The command sleeps ``COURIER_REQUOTE_PAUSE_SECONDS`` between batches and
+  can be given a time budget, so it never holds locks or a CPU for long.
+
+Queued jobs for all lanes are merged while they wait, so a burst of rate
+edits costs one pass over the drafts. Once a published rate card version is
+in effect, edits to the live tables are drafts and queue nothing; publishing
+queues one job instead, held back until the version takes effect.
+"""
+import logging
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from courier.engine import calculate_cost
+from courier.models import Order, OrderStatus, PaymentMode, RequoteJob
+from courier.views.base import get_rate_snapshot
+
+logger = logging.getLogger('courier')
+
+CENTS = Decimal('0.01')
+QUOTE_FIELDS = ['total_cost', 'cost_breakdown', 'zone_applied', 'rate_card_version', 'updated_at']
+
+
+def enqueue_requote(carrier_ids: Optional[Iterable[int]] = None, reason: str = "",
+                    source_pincode: Optional[int] = None, dest_pincode: Optional[int] = None,
+                    run_after: Optional[datetime] = None) -> RequoteJob:
+    """
+    Queue a re-quote of the drafts quoted by ``carrier_ids`` (None: all carriers),
+    not to be started before ``run_after``.
+
+    A job for all lanes is merged into a pending one with the same start time
+    if there is one; jobs already running are left alone, their earlier
+    batches predate the change.
+    """
+    carrier_ids = sorted(set(carrier_ids)) if carrier_ids is not None else None
+    reason = reason[:255]
+    if source_pincode is None and dest_pincode is None:
+        with transaction.atomic():
+            pending = (
+                RequoteJob.objects.select_for_update()
+                .filter(status=RequoteJob.Status.PENDING, source_pincode=None, dest_pincode=None,
+                        run_after=run_after)
+                .order_by('id').first()
+            )
+            if pending is not None:
+                if pending.carrier_ids is None or carrier_ids is None:
+                    pending.carrier_ids = None
+                else:
+                    pending.carrier_ids = sorted(set(pending.carrier_ids) | set(carrier_ids))
+                pending.save(update_fields=['carrier_ids'])
+                return pending
+
+    job = RequoteJob.objects.create(
+        carrier_ids=carrier_ids, reason=reason, source_pincode=source_pincode, dest_pincode=dest_pincode,
+        run_after=run_after,
+    )
+    logger.info(f"REQUOTE: Queued job {job.pk} ({reason or 'manual'})")
+    return job
+
+
+def draft_quotes(job: RequoteJob):
+    """DRAFT orders with a stored quote that ``job`` covers."""
+    orders = Order.objects.filter(status=OrderStatus.DRAFT, carrier__isnull=False, total_cost__isnull=False)
+    if job.carrier_ids is not None:
+        orders = orders.filter(carrier_id__in=job.carrier_ids)
+    if job.source_pincode is not None:
+        orders = orders.filter(sender_pincode=job.source_pincode)
+    if job.dest_pincode is not None:
+        orders = orders.filter(recipient_pincode=job.dest_pincode)
+    return orders
+
+
+def _price_batch(orders: List[Order], snapshot, job: RequoteJob) -> List[Order]:
+    """
+    New quotes for ``orders``; returns the orders whose quote changed (updated
+    in memory) and adds the batch to ``job``'s report.
+    """
+    carriers = snapshot.carriers
+    system_config = carriers.system_config
+    now = timezone.now()
+    prices: Dict[tuple, Optional[Dict]] = {}
+    changed = []
+
+    for order in orders:
+        name = order.carrier.name
+        mode = order.mode or order.carrier.carrier_mode
+        is_cod = order.payment_mode == PaymentMode.COD
+        weight = order.applicable_weight or order.weight
+        order_value = order.order_value if is_cod else 0
+        key = (name, mode.lower(), order.sender_pincode, order.recipient_pincode, is_cod, weight, order_value)
+
+        if key not in prices:
+            carrier_data = carriers.get(name, mode)
+            result = None
+            if carrier_data and carrier_data.get("active", True):
+                try:
+                    result = calculate_cost(
+                        weight=weight,
+                        source_pincode=order.sender_pincode,
+                        dest_pincode=order.recipient_pincode,
+                        carrier_data=carrier_data,
+                        is_cod=is_cod,
+                        order_value=order_value,
+                        system_config=system_config,
+                    )
+                except Exception as e:
+                    logger.warning(f"REQUOTE: {name} could not price {order.order_number}: {e}")
+            prices[key] = result if result and result.get("serviceable") is not False else None
+
+        result = prices[key]
+        if result is None:
+            # Left as quoted; booking will refuse the route anyway
+            job.unserviceable += 1
+            continue
+
+        total = Decimal(str(result["total_cost"])).quantize(CENTS)
+        breakdown = result.get("breakdown", {})
+        zone = result.get("zone", "")
+        if total == order.total_cost and breakdown == order.cost_breakdown and zone == order.zone_applied:
+            continue
+
+        delta = total - order.total_cost
+        order.total_cost = total
+        order.cost_breakdown = breakdown
+        order.zone_applied = zone
+        order.rate_card_version_id = snapshot.version_id
+        order.updated_at = now
+        changed.append(order)
+
+        job.changed += 1
+        job.total_delta += delta
+        job.largest_increase = max(job.largest_increase, delta)
+        job.largest_decrease = max(job.largest_decrease, -delta)
+        stats = job.by_carrier.setdefault(name, {"changed": 0, "delta": 0.0})
+        stats["changed"] += 1
+        stats["delta"] = round(stats["delta"] + float(delta), 2)
+
+    job.scanned += len(orders)
+    return changed
+
+
+def run_job(job: RequoteJob, batch_size: int = None, pause: float = None,
+            deadline: float = None) -> RequoteJob:
+    """
+    Work ``job`` off from its cursor, batch by batch.
+
+    Args:
+        batch_size: Orders per transaction (default COURIER_REQUOTE_BATCH_SIZE).
+        pause: Seconds to sleep between batches (default COURIER_REQUOTE_PAUSE_SECONDS).
+        deadline: time.monotonic() value after which the job is left RUNNING
+            for the next run to resume.
+
+    Returns:
+        RequoteJob: The job as last saved (DONE, FAILED or, past the deadline, RUNNING).
+    """
+    batch_size = batch_size or getattr(settings, 'COURIER_REQUOTE_BATCH_SIZE', 200)
+    if pause is None:
+        pause = getattr(settings, 'COURIER_REQUOTE_PAUSE_SECONDS', 0.2)
+
+    RequoteJob.objects.filter(pk=job.pk, started_at=None).update(started_at=timezone.now())
+    RequoteJob.objects.filter(pk=job.pk).exclude(status=RequoteJob.Status.DONE).update(
+        status=RequoteJob.Status.RUNNING, error="")
+
+    while True:
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        try:
+            with transaction.atomic():
+                # The job row lock serializes workers: each batch starts from the saved cursor
+                job = RequoteJob.objects.select_for_update().get(pk=job.pk)
+                if job.status != RequoteJob.Status.RUNNING:
+                    return job
+                orders = list(
+                    draft_quotes(job).filter(pk__gt=job.cursor)
+                    .select_related('carrier').select_for_update(of=('self',))
+                    .order_by('pk')[:batch_size]
+                )
+                if not orders:
+                    job.status = RequoteJob.Status.DONE
+                    job.finished_at = timezone.now()
+                    job.save()
+                    logger.info(
+                        f"REQUOTE: Job {job.pk} done: {job.changed} of {job.scanned} draft(s) re-quoted, "
+                        f"total change {job.total_delta}"
+                    )
+                    return job
+
+                changed = _price_batch(orders, get_rate_snapshot(), job)
+                if changed:
+                    Order.objects.bulk_update(changed, QUOTE_FIELDS)
+                job.cursor = orders[-1].pk
+                job.save()
+        except Exception as e:
+            logger.error(f"REQUOTE: Job {job.pk} failed after order {job.cursor}: {e}")
+            RequoteJob.objects.filter(pk=job.pk).update(status=RequoteJob.Status.FAILED, error=str(e))
+            job.refresh_from_db()
+            return job
+        if pause:
+            time.sleep(pause)
+    job.refresh_from_db()
+    return job
+
+
+def run_pending_jobs(max_seconds: float = None, **kwargs) -> List[RequoteJob]:
+    """
+    Resume interrupted jobs, then run queued ones that are due, oldest first.
+
+    Stops starting batches after ``max_seconds``; unfinished jobs stay
+    RUNNING and are resumed by the next call. Keyword arguments go to run_job.
+    """
+    deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+    done = []
+    while deadline is None or time.monotonic() < deadline:
+        job = (
+            RequoteJob.objects
+            .filter(status__in=[RequoteJob.Status.RUNNING, RequoteJob.Status.PENDING])
+            .filter(Q(run_after__isnull=True) | Q(run_after__lte=timezone.now()))
+            .exclude(pk__in=[j.pk for j in done])
+            .order_by('id').first()
+        )
+        if job is None:
+            break
+        done.append(run_job(job, deadline=deadline, **kwargs))
+    return done
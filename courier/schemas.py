@@ -0,0 +1,58 @@
+"""
+Typed request and response schemas (msgspec).
+
+The response structs describe the JSON the quote endpoints return, so
+clients and tests can decode responses strictly with
+``msgspec.json.decode(body, type=...)``. Field order follows the wire format.
+
+The request structs mirror RateRequestSerializer's constraints for the
+validation fast path in courier.serializers.validate_rate_request.
+"""
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
+
+import msgspec
+
+Pincode = Annotated[int, msgspec.Meta(ge=100000, le=999999)]
+
+
+class Box(msgspec.Struct):
+    """BoxSerializer"""
+    weight: Annotated[float, msgspec.Meta(ge=0.01)]
+    length: Annotated[float, msgspec.Meta(ge=0.1)]
+    width: Annotated[float, msgspec.Meta(ge=0.1)]
+    height: Annotated[float, msgspec.Meta(ge=0.1)]
+
+
+class RateRequest(msgspec.Struct):
+    """RateRequestSerializer (without its cross-field check)"""
+    source_pincode: Pincode
+    dest_pincode: Pincode
+    weight: Union[Annotated[float, msgspec.Meta(ge=0.01, le=999.99)], msgspec.UnsetType] = msgspec.UNSET
+    orders: Union[List[Box], msgspec.UnsetType] = msgspec.UNSET
+    is_cod: bool = False
+    order_value: Annotated[float, msgspec.Meta(ge=0)] = 0.0
+    mode: Literal['Both', 'Surface', 'Air'] = 'Both'
+
+
+class Quote(msgspec.Struct):
+    """One serviceable carrier quote from /api/compare-rates"""
+    carrier: str
+    # Matrix carriers price on an (origin, destination) zone pair
+    zone_id: Union[str, List[str], None]
+    zone: str
+    total_cost: float
+    breakdown: Dict[str, Union[float, str, None]]
+    serviceable: bool
+    applied_zone: str
+    mode: str
+    rate_card_version_id: Optional[int] = None
+
+
+class BatchQuoteLine(msgspec.Struct, omit_defaults=True):
+    """One NDJSON line from /api/compare-rates/batch"""
+    index: int
+    status: int
+    reference: Optional[Union[str, int]] = None
+    rates: Optional[List[Quote]] = None
+    errors: Optional[Dict[str, Any]] = None
+    detail: Optional[str] = None
@@ -2,8 +2,12 @@
 Django REST Framework Serializers.
 Converted from Pydantic V2 schemas to DRF serializers.
 """
+import msgspec
+from django.conf import settings
 from rest_framework import serializers
+from rest_framework.fields import SkipField
 from .models import Order, OrderStatus, PaymentMode, FTLOrder
+from .schemas import RateRequest
 import re
 
 
@@ -53,6 +57,123 @@ class RateRequestSerializer(serializers.Serializer):
         return data
 
 
+def _fast_rate_request(payload):
+    """
+    RateRequestSerializer's validated_data for well-formed requests, or None.
+
+    Accepts only what the serializer would accept unchanged (native JSON
+    types, in range), so the result is identical; anything else - string
+    numbers, nulls, errors - returns None for the serializer to handle.
+    """
+    if type(payload) is not dict:
+        return None
+    try:
+        request = msgspec.convert(payload, RateRequest, strict=True)
+    except Exception:
+        return None
+    if not request.weight and not request.orders:
+        return None
+
+    data = {
+        "source_pincode": request.source_pincode,
+        "dest_pincode": request.dest_pincode,
+    }
+    if request.weight is not msgspec.UNSET:
+        data["weight"] = request.weight
+    if request.orders is not msgspec.UNSET:
+        data["orders"] = [msgspec.structs.asdict(box) for box in request.orders]
+    data["is_cod"] = request.is_cod
+    data["order_value"] = request.order_value
+    data["mode"] = request.mode
+    return data
+
+
+def validate_rate_request(payload):
+    """
+    Validate a rate request with RateRequestSerializer's rules and messages.
+
+    Well-formed requests are validated and coerced by a compiled msgspec
+    schema in microseconds; the rest go through the serializer, so errors
+    are exactly DRF's.
+
+    Returns:
+        dict: Validated data, as RateRequestSerializer.validated_data.
+
+    Raises:
+        serializers.ValidationError: With DRF-shaped per-field errors.
+    """
+    data = _fast_rate_request(payload)
+    if data is not None:
+        return data
+    serializer = RateRequestSerializer(data=payload)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+class RateBatchSerializer(serializers.Serializer):
+    """
+    Batch rate comparison request.
+
+    Only the envelope is validated here. Each shipment is validated on its
+    own with validate_shipment() while the batch is priced, so one bad row
+    does not reject the others.
+    """
+    shipments = serializers.ListField(allow_empty=False, help_text="Rate requests to price")
+
+    def validate_shipments(self, value):
+        max_size = getattr(settings, 'COURIER_RATE_BATCH_MAX_SIZE', 1000)
+        if len(value) > max_size:
+            raise serializers.ValidationError(f"Ensure this field has no more than {max_size} elements.")
+        return value
+
+
+_shipment_serializer = None
+
+
+def validate_shipment(row):
+    """
+    Validate one batch row with RateRequestSerializer's rules and messages.
+
+    Runs the fields of a single shared RateRequestSerializer instead of
+    building (and deep-copying the fields of) a serializer per row.
+
+    Returns:
+        dict: Validated data, as RateRequestSerializer.validated_data.
+
+    Raises:
+        serializers.ValidationError: With DRF-shaped per-field errors.
+    """
+    data = _fast_rate_request(row)
+    if data is not None:
+        return data
+
+    global _shipment_serializer
+    if _shipment_serializer is None:
+        _shipment_serializer = RateRequestSerializer()
+    serializer = _shipment_serializer
+
+    if not isinstance(row, dict):
+        raise serializers.ValidationError({
+            "non_field_errors": [f"Invalid data. Expected a dictionary, but got {type(row).__name__}."]
+        })
+
+    data, errors = {}, {}
+    for name, field in serializer.fields.items():
+        try:
+            data[name] = field.run_validation(field.get_value(row))
+        except serializers.ValidationError as exc:
+            errors[name] = exc.detail
+        except SkipField:
+            pass
+    if errors:
+        raise serializers.ValidationError(errors)
+
+    try:
+        return serializer.validate(data)
+    except serializers.ValidationError as exc:
+        raise serializers.ValidationError(serializers.as_serializer_error(exc))
+
+
 class CostBreakdownSerializer(serializers.Serializer):
     """Cost breakdown details"""
     base_forward = serializers.FloatField()
@@ -100,8 +221,62 @@ class NewCarrierSerializer(serializers.Serializer):
         return value
 
 
-class OrderSerializer(serializers.ModelSerializer):
-    """Order creation and updates"""
+def _field_list(value):
+    return [name.strip() for name in value.split(',') if name.strip()] if value else None
+
+
+class SparseFieldsetMixin:
+    """
+    ``?fields=a,b`` / ``?exclude=c`` sparse fieldsets for a ModelSerializer.
+
+    The serializer takes ``fields`` / ``exclude`` keyword arguments and drops
+    the other fields; ``sparse_queryset()`` narrows the matching queryset
+    with ``only()`` / ``defer()`` so unrequested columns (JSON blobs,
+    notes) are never read from the database.
+    """
+    # Columns every queryset keeps: the pk and the keyset pagination key
+    always_load = ('id', 'created_at')
+
+    def __init__(self, *args, fields=None, exclude=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in set(self.fields) - set(self.selected_fields(fields, exclude)):
+            self.fields.pop(name)
+
+    @classmethod
+    def selected_fields(cls, fields=None, exclude=None):
+        selected = fields if fields is not None else cls.Meta.fields
+        return [name for name in selected if name not in (exclude or ())]
+
+    @classmethod
+    def parse_fieldset(cls, query_params):
+        """
+        ``(fields, exclude)`` from the query string (None when absent).
+
+        Raises:
+            serializers.ValidationError: If a name is not a field of this serializer.
+        """
+        fields = _field_list(query_params.get('fields'))
+        exclude = _field_list(query_params.get('exclude'))
+        for param, names in (('fields', fields), ('exclude', exclude)):
+            unknown = [name for name in names or () if name not in cls.Meta.fields]
+            if unknown:
+                raise serializers.ValidationError({param: [f"Unknown field(s): {', '.join(unknown)}"]})
+        return fields, exclude
+
+    @classmethod
+    def sparse_queryset(cls, queryset, fields=None, exclude=None):
+        """Load only the columns the selected fields read."""
+        if fields is None and not exclude:
+            return queryset
+        concrete = {field.name for field in cls.Meta.model._meta.concrete_fields}
+        if fields is not None:
+            columns = set(cls.selected_fields(fields, exclude)) | set(cls.always_load)
+            return queryset.only(*sorted(columns & concrete))
+        return queryset.defer(*sorted((set(exclude) & concrete) - set(cls.always_load)))
+
+
+class OrderSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Order creation and updates (supports sparse fieldsets for reads)"""
 
     class Meta:
         model = Order
@@ -114,12 +289,12 @@ class OrderSerializer(serializers.ModelSerializer):
             'applicable_weight', 'payment_mode', 'order_value', 'item_type',
             'sku', 'quantity', 'item_amount', 'status',
             'total_cost', 'cost_breakdown', 'awb_number', 'zone_applied',
-            'mode', 'created_at', 'updated_at', 'booked_at', 'notes'
+            'mode', 'rate_card_version', 'created_at', 'updated_at', 'booked_at', 'notes'
         ]
 
         read_only_fields = [
             'id', 'order_number', 'volumetric_weight', 'applicable_weight',
-            'created_at', 'updated_at'
+            'rate_card_version', 'created_at', 'updated_at'
         ]
 
 
@@ -215,6 +390,27 @@ class CarrierSelectionSerializer(serializers.Serializer):
     )
     carrier_name = serializers.CharField(min_length=1)
     mode = serializers.ChoiceField(choices=['Surface', 'Air'])
+    rate_card_version_id = serializers.IntegerField(required=False, allow_null=True)
+
+
+class InvoiceBulkSerializer(serializers.Serializer):
+    """Orders to export as one ZIP of invoice PDFs"""
+    order_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        min_length=1
+    )
+
+    def validate_order_ids(self, value):
+        limit = getattr(settings, 'COURIER_INVOICE_BULK_MAX_ORDERS', 500)
+        if len(value) > limit:
+            raise serializers.ValidationError(f"At most {limit} orders per export")
+        return list(dict.fromkeys(value))
+
+
+class RateCardVersionPublishSerializer(serializers.Serializer):
+    """Publish the current rate tables as a new rate card version"""
+    effective_from = serializers.DateTimeField(required=False)
+    notes = serializers.CharField(max_length=255, required=False, allow_blank=True, default="")
 
 
 class FTLOrderSerializer(serializers.ModelSerializer):
@@ -1,91 +1,198 @@
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
-from courier.models import Order, OrderStatus, PaymentMode, Courier
+from courier.models import Order, OrderStatus, PaymentMode, Courier, RateCardVersion
 from courier.engine import calculate_cost
-from courier.views.base import load_rates
+from courier.views.base import get_rate_snapshot
+from courier.rate_versions import get_version_snapshot
 
 logger = logging.getLogger('courier')
 
+# Orders on the same lane ship together and are priced as one consignment
+LANE_FIELDS = ('sender_pincode', 'recipient_pincode', 'payment_mode')
+
+
+def _lane_key(order) -> Tuple[int, int, str]:
+    return order.sender_pincode, order.recipient_pincode, order.payment_mode
+
+
+def _price_lane(carrier_data, lane: Dict[str, Any], system_config) -> Dict[str, Any]:
+    """calculate_cost for a lane's aggregated weight (and COD value on COD lanes)."""
+    is_cod = lane["payment_mode"] == PaymentMode.COD
+    return calculate_cost(
+        weight=lane["total_weight"],
+        source_pincode=lane["source_pincode"],
+        dest_pincode=lane["dest_pincode"],
+        carrier_data=carrier_data,
+        is_cod=is_cod,
+        order_value=lane["order_value"] if is_cod else 0,
+        system_config=system_config
+    )
+
+
 class CarrierService:
     """Service to handle carrier rate comparisons"""
     
+    @staticmethod
+    def get_lanes(order_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Group orders by lane (sender pincode, recipient pincode, payment mode)
+        in one aggregate query.
+
+        Returns:
+            List[Dict[str, Any]]: One dict per lane with source_pincode,
+            dest_pincode, payment_mode, order_count, total_weight (applicable
+            weight, else actual) and order_value, in a stable order.
+        """
+        rows = (
+            Order.objects
+            .filter(id__in=order_ids)
+            .values(*LANE_FIELDS)
+            .annotate(
+                order_count=Count('id'),
+                total_weight=Sum(Coalesce('applicable_weight', 'weight')),
+                order_value=Sum('order_value'),
+            )
+            .order_by(*LANE_FIELDS)
+        )
+        return [
+            {
+                "lane": index,
+                "source_pincode": row["sender_pincode"],
+                "dest_pincode": row["recipient_pincode"],
+                "payment_mode": row["payment_mode"],
+                "order_count": row["order_count"],
+                "total_weight": row["total_weight"],
+                "order_value": row["order_value"],
+            }
+            for index, row in enumerate(rows)
+        ]
+
     @staticmethod
     def compare_rates(order_ids: List[int]) -> Dict[str, Any]:
         """
         Compare rates for a list of orders across all active couriers.
 
+        Orders are grouped into lanes (see get_lanes) and each lane is priced
+        once per carrier, so the work grows with the number of distinct lanes,
+        not orders.
+
         Args:
             order_ids (List[int]): List of Order IDs to compare.
 
         Returns:
             Dict[str, Any]: A dictionary containing:
-                - orders: QuerySet of Order objects.
-                - carriers: List of dicts with cost details, sorted by total_cost.
-                - source_pincode: Verified source pincode.
-                - dest_pincode: Verified destination pincode.
+                - orders: id, order_number, recipient_name and weight per order.
+                - lanes: Each lane with its orders and carrier ranking (cheapest first).
+                - carriers: Carriers serviceable on every lane, with the summed
+                  cost of booking all orders with them, sorted by total_cost.
+                - assignment: Cheapest carrier per lane and the combined cost.
+                - source_pincode / dest_pincode: The route when there is one lane, else None.
                 - total_weight: Aggregated weight of all orders.
 
         Raises:
             ValueError: If orders are missing or invalid.
         """
-        orders = Order.objects.filter(id__in=order_ids)
-        if orders.count() != len(order_ids):
+        lanes = CarrierService.get_lanes(order_ids)
+        if not lanes:
+            raise ValueError("No orders provided")
+        if sum(lane["order_count"] for lane in lanes) != len(order_ids):
             raise ValueError("One or more orders not found")
 
-        # Aggregate inputs
-        total_weight = sum(order.applicable_weight or order.weight for order in orders)
-        first_order = orders.first()
-        # Use simple fallback if no orders (should check earlier, but type safety)
-        if not first_order:
-            raise ValueError("No orders provided")
-            
-        source_pincode = first_order.sender_pincode
-        dest_pincode = first_order.recipient_pincode
-
-        is_cod = any(order.payment_mode == PaymentMode.COD for order in orders)
-        total_order_value = sum(
-            order.order_value for order in orders
-            if order.payment_mode == PaymentMode.COD
+        orders = list(
+            Order.objects.filter(id__in=order_ids).order_by('id')
+            .values('id', 'order_number', 'recipient_name', 'weight', 'applicable_weight', *LANE_FIELDS)
         )
+        lane_index = {(lane["source_pincode"], lane["dest_pincode"], lane["payment_mode"]): lane for lane in lanes}
+        for lane in lanes:
+            lane["order_ids"] = []
+        for order in orders:
+            lane_index[(order["sender_pincode"], order["recipient_pincode"], order["payment_mode"])]["order_ids"].append(order["id"])
 
-        rates = load_rates()
-        results = []
-
-        for carrier in rates:
-            if not carrier.get("active", True):
-                continue
-
-            try:
-                res = calculate_cost(
-                    weight=total_weight,
-                    source_pincode=source_pincode,
-                    dest_pincode=dest_pincode,
-                    carrier_data=carrier,
-                    is_cod=is_cod,
-                    order_value=total_order_value
-                )
+        snapshot = get_rate_snapshot()
+        system_config = snapshot.carriers.system_config
+        active = [carrier for carrier in snapshot.carriers if carrier.get("active", True)]
 
+        for lane in lanes:
+            results = []
+            for carrier in active:
+                try:
+                    res = _price_lane(carrier, lane, system_config)
+                except Exception as e:
+                    logger.warning(f"Carrier {carrier.get('carrier_name')} failed: {e}")
+                    continue
                 if res.get("serviceable") is False:
                     continue
 
                 res["mode"] = carrier.get("mode", "Surface")
                 res["applied_zone"] = res.get("zone", "")
-                res["order_count"] = len(order_ids)
-                res["total_weight"] = total_weight
+                res["order_count"] = lane["order_count"]
+                res["total_weight"] = lane["total_weight"]
+                res["rate_card_version_id"] = snapshot.version_id
                 results.append(res)
+            lane["carriers"] = sorted(results, key=lambda x: x["total_cost"])
+
+        total_weight = sum(lane["total_weight"] for lane in lanes)
+        single_lane = lanes[0] if len(lanes) == 1 else None
+        return {
+            "orders": orders,
+            "lanes": lanes,
+            "carriers": CarrierService._combine_lanes(lanes, total_weight, snapshot.version_id),
+            "assignment": CarrierService._optimal_assignment(lanes),
+            "source_pincode": single_lane["source_pincode"] if single_lane else None,
+            "dest_pincode": single_lane["dest_pincode"] if single_lane else None,
+            "total_weight": total_weight,
+            "rate_card_version_id": snapshot.version_id
+        }
 
-            except Exception as e:
-                logger.warning(f"Carrier {carrier.get('carrier_name')} failed: {e}")
+    @staticmethod
+    def _combine_lanes(lanes, total_weight, version_id) -> List[Dict[str, Any]]:
+        """Carriers that serve every lane, costed for booking all orders with them."""
+        if len(lanes) == 1:
+            return lanes[0]["carriers"]
+
+        per_carrier = {}
+        for lane in lanes:
+            for res in lane["carriers"]:
+                per_carrier.setdefault((res["carrier"], res["mode"]), []).append(res)
+
+        combined = []
+        for (carrier, mode), lane_results in per_carrier.items():
+            if len(lane_results) != len(lanes):
                 continue
+            combined.append({
+                "carrier": carrier,
+                "mode": mode,
+                "total_cost": round(sum(res["total_cost"] for res in lane_results), 2),
+                "applied_zone": ", ".join(sorted({res["applied_zone"] for res in lane_results})),
+                "lane_costs": [res["total_cost"] for res in lane_results],
+                "serviceable": True,
+                "order_count": sum(lane["order_count"] for lane in lanes),
+                "total_weight": total_weight,
+                "rate_card_version_id": version_id,
+            })
+        return sorted(combined, key=lambda x: x["total_cost"])
 
+    @staticmethod
+    def _optimal_assignment(lanes) -> Dict[str, Any]:
+        """Cheapest carrier for each lane; lanes nobody serves are listed apart."""
+        assigned = [
+            {
+                "lane": lane["lane"],
+                "carrier": lane["carriers"][0]["carrier"],
+                "mode": lane["carriers"][0]["mode"],
+                "total_cost": lane["carriers"][0]["total_cost"],
+            }
+            for lane in lanes if lane["carriers"]
+        ]
         return {
-            "orders": orders,
-            "carriers": sorted(results, key=lambda x: x["total_cost"]),
-            "source_pincode": source_pincode,
-            "dest_pincode": dest_pincode,
-            "total_weight": total_weight
+            "lanes": assigned,
+            "total_cost": round(sum(item["total_cost"] for item in assigned), 2),
+            "unserviceable_lanes": [lane["lane"] for lane in lanes if not lane["carriers"]],
         }
 
 
@@ -93,86 +200,115 @@ class BookingService:
     """Service to handle booking operations"""
     
     @staticmethod
-    def book_orders(order_ids: List[int], carrier_name: str, mode: str) -> Dict[str, Any]:
+    def book_orders(order_ids: List[int], carrier_name: str, mode: str,
+                    rate_card_version_id: Optional[int] = None) -> Dict[str, Any]:
         """
         Book a list of orders with a specific carrier.
 
+        The orders are locked (SELECT ... FOR UPDATE) and booked in one
+        transaction, so a concurrent booking or edit cannot interleave.
+
         Args:
             order_ids (List[int]): List of Order IDs to book.
             carrier_name (str): Name of the carrier (referenced in Courier model).
             mode (str): Transport mode (e.g., 'Surface', 'Air').
+            rate_card_version_id (int, optional): Published rate card version the
+                customer was quoted. Re-prices against exactly that version;
+                defaults to the version currently in effect.
 
         Returns:
             Dict[str, Any]: Booking result details including status and cost.
 
         Raises:
-            ValueError: If carrier not found, route not serviceable, or orders invalid.
+            ValueError: If carrier not found, route not serviceable, orders invalid
+                or any order is not DRAFT.
         """
-        orders = Order.objects.filter(id__in=order_ids)
-        if orders.count() != len(order_ids):
-             raise ValueError("One or more orders not found")
+        with transaction.atomic():
+            # One query fetches and locks every order (in id order, so concurrent bookings cannot deadlock)
+            orders = list(Order.objects.select_for_update().filter(id__in=order_ids).order_by('id'))
+            if len(orders) != len(order_ids):
+                raise ValueError("One or more orders not found")
+
+            not_draft = [order.order_number for order in orders if order.status != OrderStatus.DRAFT]
+            if not_draft:
+                raise ValueError(f"Only DRAFT orders can be booked: {', '.join(not_draft)}")
+
+            return BookingService._book(orders, carrier_name, mode, rate_card_version_id)
 
+    @staticmethod
+    def _book(orders: List[Order], carrier_name: str, mode: str,
+              rate_card_version_id: Optional[int]) -> Dict[str, Any]:
+        """Price and book already locked orders (see book_orders), one lane at a time."""
         # Calculate cost again to ensure data integrity
         # (Alternatively we could trust the frontend, but backend calc is safer)
-        total_weight = sum(order.applicable_weight or order.weight for order in orders)
-        first_order = orders.first()
-        source_pincode = first_order.sender_pincode
-        dest_pincode = first_order.recipient_pincode
-        is_cod = any(order.payment_mode == PaymentMode.COD for order in orders)
-        total_order_value = sum(
-            order.order_value for order in orders
-            if order.payment_mode == PaymentMode.COD
-        )
+        by_lane = {}
+        for order in orders:
+            by_lane.setdefault(_lane_key(order), []).append(order)
 
-        # Find Carrier
-        rates = load_rates()
-        carrier_data = None
-        for carrier in rates:
-            if (carrier.get("carrier_name") == carrier_name and
-                    carrier.get("mode") == mode):
-                carrier_data = carrier
-                break
+        # Find Carrier (in the quoted version if one was given)
+        if rate_card_version_id is not None:
+            try:
+                snapshot = get_version_snapshot(rate_card_version_id)
+            except RateCardVersion.DoesNotExist:
+                raise ValueError(f"Rate card version {rate_card_version_id} not found")
+        else:
+            snapshot = get_rate_snapshot()
+        carriers = snapshot.carriers
+        carrier_data = carriers.get(carrier_name, mode)
         
         if not carrier_data:
             raise ValueError("Carrier not found")
 
-        # Re-Calculate
-        cost_result = calculate_cost(
-            weight=total_weight,
-            source_pincode=source_pincode,
-            dest_pincode=dest_pincode,
-            carrier_data=carrier_data,
-            is_cod=is_cod,
-            order_value=total_order_value
-        )
-
-        if cost_result.get("servicable") is False:
-             raise ValueError(f"Route not serviceable by {carrier_name}")
+        # Re-Calculate each lane on its own aggregated weight
+        lanes = []
+        for (source_pincode, dest_pincode, payment_mode), lane_orders in by_lane.items():
+            lane = {
+                "source_pincode": source_pincode,
+                "dest_pincode": dest_pincode,
+                "payment_mode": payment_mode,
+                "order_count": len(lane_orders),
+                "total_weight": sum(order.applicable_weight or order.weight for order in lane_orders),
+                "order_value": sum(order.order_value for order in lane_orders),
+            }
+            cost_result = _price_lane(carrier_data, lane, carriers.system_config)
+            if cost_result.get("serviceable") is False:
+                raise ValueError(f"Route {source_pincode} -> {dest_pincode} not serviceable by {carrier_name}")
+            lanes.append((lane, lane_orders, cost_result))
              
-        # Get Courier DB Object
+        # Get Courier DB Object (by pk when the snapshot knows it)
+        courier_id = carriers.courier_id(carrier_name, mode)
         try:
-            courier_obj = Courier.objects.get(name=carrier_name)
+            if courier_id is not None:
+                courier_obj = Courier.objects.get(pk=courier_id)
+            else:
+                courier_obj = Courier.objects.get(name=carrier_name)
         except Courier.DoesNotExist:
             raise ValueError("Carrier object not found in DB")
 
-        # Update Orders
-        updated_numbers = []
-        for order in orders:
-            order.carrier = courier_obj
-            order.mode = mode
-            order.zone_applied = cost_result.get("zone", "")
-            order.total_cost = cost_result["total_cost"]
-            order.cost_breakdown = cost_result.get("breakdown", {})
-            order.status = OrderStatus.BOOKED
-            order.booked_at = timezone.now()
-            order.save()
-            updated_numbers.append(order.order_number)
+        # Orders on a lane share the lane's cost, so one UPDATE per lane books them
+        now = timezone.now()
+        for lane, lane_orders, cost_result in lanes:
+            Order.objects.filter(pk__in=[order.pk for order in lane_orders]).update(
+                carrier=courier_obj,
+                mode=mode,
+                zone_applied=cost_result.get("zone", ""),
+                total_cost=cost_result["total_cost"],
+                cost_breakdown=cost_result.get("breakdown", {}),
+                rate_card_version_id=snapshot.version_id,
+                status=OrderStatus.BOOKED,
+                booked_at=now,
+                updated_at=now,
+            )
+            lane["total_cost"] = cost_result["total_cost"]
+            lane["zone"] = cost_result.get("zone", "")
 
         return {
             "status": "success",
-            "message": f"{orders.count()} order(s) booked with {carrier_name}",
-            "orders_updated": updated_numbers,
-            "total_cost": cost_result["total_cost"],
+            "message": f"{len(orders)} order(s) booked with {carrier_name}",
+            "orders_updated": [order.order_number for order in orders],
+            "total_cost": round(sum(lane["total_cost"] for lane, _, _ in lanes), 2),
+            "lanes": [lane for lane, _, _ in lanes],
             "carrier": carrier_name,
-            "mode": mode
+            "mode": mode,
+            "rate_card_version_id": snapshot.version_id
         }
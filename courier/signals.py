@@ -4,6 +4,11 @@ Django signals for automatic cache invalidation.
 Automatically invalidates rate card caches when Courier-related models change.
 Eliminates the need for manual cache.delete() calls throughout the codebase.
 """
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.core.cache import cache
@@ -16,6 +21,69 @@ from courier.logging_utils import log_cache_operation
 # to avoid circular imports
 
 
+_deferred = threading.local()
+
+
+@contextmanager
+def defer_rate_card_invalidation():
+    """
+    Suppress per-row invalidation inside the block.
+
+    Bulk writers (rate card import, carrier deletion) would otherwise bump
+    the rate card version once per deleted row. The caller is responsible
+    for invalidating once when the block is done.
+    """
+    depth = getattr(_deferred, 'depth', 0)
+    _deferred.depth = depth + 1
+    try:
+        yield
+    finally:
+        _deferred.depth = depth
+
+
+def queue_requote(carrier_ids=None, reason=""):
+    """
+    Re-quote the DRAFT orders quoted by ``carrier_ids`` (None: all carriers)
+    once the current transaction commits. See courier.requote.
+
+    Nothing is queued while a published rate card version is in effect:
+    quotes use that version, so the edit is a draft until the next publish,
+    which queues its own re-quote.
+    """
+    if not getattr(settings, 'COURIER_REQUOTE_ON_RATE_CHANGE', True):
+        return
+
+    def enqueue():
+        from courier.rate_versions import get_active_version_id
+        from courier.requote import enqueue_requote
+        if get_active_version_id() is not None:
+            return
+        enqueue_requote(carrier_ids, reason=reason)
+
+    transaction.on_commit(enqueue)
+
+
+def _invalidate_carrier_rate_cards(carrier_id=None, reason=""):
+    """
+    Drop the cached rate cards, bump the rate card version and queue a
+    re-quote of the carrier's (None: every carrier's) DRAFT orders.
+
+    The version bump is what lets a precompiled snapshot loaded at boot
+    notice that the database has moved on since it was exported.
+
+    Returns:
+        bool: False if invalidation is currently deferred (nothing done).
+    """
+    from courier.models import SystemConfig
+
+    if getattr(_deferred, 'depth', 0):
+        return False
+    cache.delete(CacheKeys.CARRIER_RATE_CARDS)
+    SystemConfig.bump_rate_card_version()
+    queue_requote([carrier_id] if carrier_id is not None else None, reason)
+    return True
+
+
 @receiver([post_save, post_delete], sender='courier.Courier')
 def invalidate_carrier_cache_on_courier_change(sender, instance, **kwargs):
     """
@@ -29,7 +97,8 @@ def invalidate_carrier_cache_on_courier_change(sender, instance, **kwargs):
     signal = kwargs.get('signal')
     signal_name = signal.__name__ if hasattr(signal, '__name__') else str(signal)
     
-    cache.delete(CacheKeys.CARRIER_RATE_CARDS)
+    if not _invalidate_carrier_rate_cards(instance.pk, f"{instance.name} changed"):
+        return
     log_cache_operation(
         f"Invalidated carrier cache due to Courier change",
         carrier=instance.name,
@@ -44,7 +113,8 @@ def invalidate_carrier_cache_on_zone_rate_change(sender, instance, **kwargs):
     
     Triggered when zone rates are added, updated, or deleted.
     """
-    cache.delete(CacheKeys.CARRIER_RATE_CARDS)
+    if not _invalidate_carrier_rate_cards(instance.courier_id, "Zone rate changed"):
+        return
     log_cache_operation(
         f"Invalidated carrier cache due to CourierZoneRate change",
         courier=instance.courier.name,
@@ -60,7 +130,8 @@ def invalidate_carrier_cache_on_city_route_change(sender, instance, **kwargs):
     
     Triggered when city routes are added, updated, or deleted.
     """
-    cache.delete(CacheKeys.CARRIER_RATE_CARDS)
+    if not _invalidate_carrier_rate_cards(instance.courier_id, "City route changed"):
+        return
     log_cache_operation(
         f"Invalidated carrier cache due to CityRoute change",
         courier=instance.courier.name,
@@ -75,7 +146,8 @@ def invalidate_carrier_cache_on_custom_zone_change(sender, instance, **kwargs):
     
     Triggered when custom zones are added, updated, or deleted.
     """
-    cache.delete(CacheKeys.CARRIER_RATE_CARDS)
+    if not _invalidate_carrier_rate_cards(instance.courier_id, "Custom zone changed"):
+        return
     log_cache_operation(
         f"Invalidated carrier cache due to CustomZone change",
         courier=instance.courier.name,
@@ -91,7 +163,8 @@ def invalidate_carrier_cache_on_custom_zone_rate_change(sender, instance, **kwar
     
     Triggered when custom zone rates are added, updated, or deleted.
     """
-    cache.delete(CacheKeys.CARRIER_RATE_CARDS)
+    if not _invalidate_carrier_rate_cards(instance.courier_id, "Custom zone rate changed"):
+        return
     log_cache_operation(
         f"Invalidated carrier cache due to CustomZoneRate change",
         courier=instance.courier.name,
@@ -107,7 +180,8 @@ def invalidate_carrier_cache_on_delivery_slab_change(sender, instance, **kwargs)
     
     Triggered when delivery slabs are added, updated, or deleted.
     """
-    cache.delete(CacheKeys.CARRIER_RATE_CARDS)
+    if not _invalidate_carrier_rate_cards(instance.courier_id, "Delivery slab changed"):
+        return
     log_cache_operation(
         f"Invalidated carrier cache due to DeliverySlab change",
         courier=instance.courier.name,
@@ -116,6 +190,42 @@ def invalidate_carrier_cache_on_delivery_slab_change(sender, instance, **kwargs)
     )
 
 
+@receiver([post_save, post_delete], sender='courier.FeeStructure')
+@receiver([post_save, post_delete], sender='courier.ServiceConstraints')
+@receiver([post_save, post_delete], sender='courier.FuelConfiguration')
+@receiver([post_save, post_delete], sender='courier.RoutingLogic')
+def invalidate_carrier_cache_on_config_change(sender, instance, **kwargs):
+    """
+    Invalidate carrier rate card cache when a normalized config row changes.
+    
+    Triggered when fees, constraints, fuel or routing configuration is edited.
+    """
+    if not _invalidate_carrier_rate_cards(instance.courier_link_id, f"{sender.__name__} changed"):
+        return
+    log_cache_operation(
+        f"Invalidated carrier cache due to {sender.__name__} change",
+        courier_id=instance.courier_link_id
+    )
+
+
+@receiver(post_save, sender='courier.SystemConfig')
+def invalidate_carrier_cache_on_system_config_change(sender, instance, **kwargs):
+    """
+    Invalidate carrier rate card cache when SystemConfig changes.
+    
+    The cached rate-card snapshot embeds the system config, so it must be
+    rebuilt. SystemConfig.save() bumps the rate card version itself. Fuel,
+    GST and escalation feed every quote, so all DRAFT quotes are re-priced.
+    """
+    cache.delete(CacheKeys.CARRIER_RATE_CARDS)
+    if not kwargs.get('created'):
+        queue_requote(reason="System config changed")
+    log_cache_operation(
+        "Invalidated carrier cache due to SystemConfig change",
+        rate_card_version=instance.rate_card_version
+    )
+
+
 # Utility function for manual cache invalidation if needed
 def invalidate_all_carrier_caches():
     """
@@ -123,6 +233,6 @@ def invalidate_all_carrier_caches():
     
     Use sparingly - signals should handle most cases automatically.
     """
-    cache.delete(CacheKeys.CARRIER_RATE_CARDS)
+    _invalidate_carrier_rate_cards()
     cache.delete(CacheKeys.FTL_RATE_CARDS)
     log_cache_operation("Manually invalidated all carrier caches")
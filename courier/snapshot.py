@@ -0,0 +1,408 @@
+"""
+Precompiled rate-card snapshots.
+
+A snapshot bundles everything the pricing path reads per request - the
+compiled carrier rate cards, the FTL rate table and the system config -
+together with the rate card version it was built from.
+
+Snapshots can be exported to a binary artifact (msgpack + SHA-256 checksum)
+with ``python manage.py export_rate_snapshot``. A worker that finds the
+artifact at boot serves from it immediately and checks its version against
+the database in a background thread, so cold starts and rolling deploys do
+not have to rebuild rate cards from PostgreSQL.
+"""
+import hashlib
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+import msgspec
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+
+from courier.constants import CacheKeys
+from courier.exceptions import SnapshotError
+
+logger = logging.getLogger('courier')
+
+# Bump when the payload layout changes; older artifacts are then rejected.
+SNAPSHOT_FORMAT = 1
+
+FTL_RATES_PATH = os.path.join(settings.BASE_DIR, "courier", "data", "ftl_rates.json")
+DEFAULT_SNAPSHOT_PATH = os.path.join(settings.BASE_DIR, "courier", "data", "rate_snapshot.msgpack")
+
+
+class CarrierList(list):
+    """
+    List of compiled carrier rate cards with prebuilt lookup indexes.
+
+    Behaves exactly like the plain list ``load_rates()`` always returned,
+    plus O(1) lookups by name and (name, mode) and O(k) iteration over
+    carriers of one mode or routing logic. Mode keys are lower-cased.
+    """
+
+    def __init__(self, carriers=(), courier_ids=None, version_id=None, system_config=None):
+        super().__init__(carriers)
+        # Where these rate cards came from, so quotes can record it
+        self.version_id = version_id
+        self.system_config = system_config
+        ids = list(courier_ids) if courier_ids is not None else [None] * len(self)
+
+        self.by_name: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_name_mode: Dict[tuple, Dict[str, Any]] = {}
+        self.by_mode: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_logic: Dict[str, List[Dict[str, Any]]] = {}
+        self.courier_ids: Dict[tuple, Optional[int]] = {}
+
+        for carrier, courier_id in zip(self, ids):
+            name = carrier.get("carrier_name")
+            mode = carrier.get("mode", "Surface")
+            key = (name, mode.lower())
+            self.by_name.setdefault(name, []).append(carrier)
+            # First match wins, as with the old linear scans
+            if key not in self.by_name_mode:
+                self.by_name_mode[key] = carrier
+                self.courier_ids[key] = courier_id
+            self.by_mode.setdefault(mode.lower(), []).append(carrier)
+            self.by_logic.setdefault(carrier.get("logic"), []).append(carrier)
+
+    def get(self, name: str, mode: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Carrier by exact name, optionally restricted to a mode."""
+        if mode is None:
+            matches = self.by_name.get(name)
+            return matches[0] if matches else None
+        return self.by_name_mode.get((name, mode.lower()))
+
+    def for_mode(self, mode: str) -> List[Dict[str, Any]]:
+        """Carriers of one mode; ``"Both"`` returns all carriers."""
+        if mode.lower() == "both":
+            return list(self)
+        return self.by_mode.get(mode.lower(), [])
+
+    def for_logic(self, logic: str) -> List[Dict[str, Any]]:
+        """Carriers using one routing logic (e.g. ``"Zonal"``, ``"city_to_city"``)."""
+        return self.by_logic.get(logic, [])
+
+    def courier_id(self, name: str, mode: str) -> Optional[int]:
+        """Primary key of the Courier row the rate card was compiled from."""
+        return self.courier_ids.get((name, mode.lower()))
+
+
+def filter_by_mode(carriers: List[Dict[str, Any]], mode: str) -> List[Dict[str, Any]]:
+    """Use the mode index when ``carriers`` has one, else scan."""
+    if isinstance(carriers, CarrierList):
+        return carriers.for_mode(mode)
+    if mode.lower() == "both":
+        return carriers
+    return [c for c in carriers if c.get("mode", "Surface").lower() == mode.lower()]
+
+
+class RateCardSnapshot:
+    """
+    Compiled rate cards plus the data they were priced against.
+
+    Treat instances as read-only: they are shared between requests and
+    may be stored in the cache.
+    """
+
+    def __init__(
+        self,
+        carriers: List[Dict[str, Any]],
+        ftl_rates: Optional[Dict[str, Any]] = None,
+        system_config: Optional[Dict[str, Any]] = None,
+        version: int = 0,
+        built_at: Optional[str] = None,
+        ftl_source_mtime: Optional[int] = None,
+        courier_ids: Optional[List[int]] = None,
+        version_id: Optional[int] = None,
+    ):
+        self.system_config = system_config or {}
+        # Published RateCardVersion id; None when compiled from the live tables
+        self.version_id = version_id
+        self.carriers = CarrierList(carriers, courier_ids, version_id, self.system_config or None)
+        self._courier_ids = courier_ids
+        self.ftl_rates = ftl_rates or {}
+        self.version = version
+        self.built_at = built_at or timezone.now().isoformat()
+        self.ftl_source_mtime = ftl_source_mtime
+
+    def __len__(self):
+        return len(self.carriers)
+
+    def __repr__(self):
+        return f"<RateCardSnapshot v{self.version}: {len(self.carriers)} carriers>"
+
+    def ftl_is_current(self, path: str = FTL_RATES_PATH) -> bool:
+        """True if the FTL rates were captured from the file as it is on disk now."""
+        try:
+            return self.ftl_source_mtime is not None and os.stat(path).st_mtime_ns == self.ftl_source_mtime
+        except OSError:
+            return False
+
+    def to_payload(self) -> Dict[str, Any]:
+        return {
+            "carriers": list(self.carriers),
+            "courier_ids": self._courier_ids,
+            "ftl_rates": self.ftl_rates,
+            "system_config": self.system_config,
+            "version": self.version,
+            "built_at": self.built_at,
+            "ftl_source_mtime": self.ftl_source_mtime,
+        }
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any], version_id: Optional[int] = None) -> "RateCardSnapshot":
+        return cls(
+            version_id=version_id,
+            carriers=payload["carriers"],
+            ftl_rates=payload.get("ftl_rates"),
+            system_config=payload.get("system_config"),
+            version=payload.get("version", 0),
+            built_at=payload.get("built_at"),
+            ftl_source_mtime=payload.get("ftl_source_mtime"),
+            courier_ids=payload.get("courier_ids"),
+        )
+
+
+# --- BUILDING ---
+
+def system_config_dict(conf) -> Dict[str, Any]:
+    """Flatten a SystemConfig row into plain floats for the pricing engine."""
+    return {
+        "diesel_price_current": float(conf.diesel_price_current),
+        "base_diesel_price": float(conf.base_diesel_price),
+        "fuel_surcharge_ratio": float(conf.fuel_surcharge_ratio),
+        "gst_rate": float(conf.gst_rate),
+        "escalation_rate": float(conf.escalation_rate),
+        "default_servicable_csv": conf.default_servicable_csv,
+        "rate_card_version": conf.rate_card_version,
+    }
+
+
+def read_ftl_rates(path: str = FTL_RATES_PATH):
+    """
+    Read the FTL rate table from disk.
+
+    Returns:
+        tuple: (rates dict, file mtime in ns) or ({}, None) if the file is missing.
+    """
+    if not os.path.exists(path):
+        logger.warning(f"FTL rates file not found at {path}")
+        return {}, None
+    mtime = os.stat(path).st_mtime_ns
+    with open(path, "rb") as f:
+        return msgspec.json.decode(f.read()), mtime
+
+
+def build_snapshot() -> RateCardSnapshot:
+    """Compile a fresh snapshot of all active carriers from the database."""
+    from courier.models import SystemConfig
+    from courier.rate_compiler import compile_rate_cards
+
+    # Read the version first: if rates change while we compile, the snapshot
+    # carries the older version and is correctly treated as stale.
+    conf = SystemConfig.get_solo()
+
+    carriers, courier_ids = compile_rate_cards()
+
+    try:
+        ftl_rates, ftl_mtime = read_ftl_rates()
+    except (OSError, msgspec.DecodeError) as e:
+        logger.error(f"Error loading FTL rates for snapshot: {e}")
+        ftl_rates, ftl_mtime = {}, None
+
+    return RateCardSnapshot(
+        carriers=carriers,
+        ftl_rates=ftl_rates,
+        system_config=system_config_dict(conf),
+        version=conf.rate_card_version,
+        ftl_source_mtime=ftl_mtime,
+        courier_ids=courier_ids,
+    )
+
+
+# --- SERIALIZATION ---
+
+def dump_snapshot(snapshot: RateCardSnapshot, path: str) -> int:
+    """
+    Write a snapshot artifact atomically.
+
+    The file is a msgpack envelope holding the format number, version,
+    SHA-256 of the payload and the payload itself, so a truncated or
+    hand-edited file is rejected on load.
+
+    Returns:
+        int: Size of the written file in bytes.
+    """
+    payload = msgspec.msgpack.encode(snapshot.to_payload())
+    envelope = msgspec.msgpack.encode({
+        "format": SNAPSHOT_FORMAT,
+        "version": snapshot.version,
+        "built_at": snapshot.built_at,
+        "sha256": hashlib.sha256(payload).hexdigest(),
+        "payload": payload,
+    })
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(envelope)
+    # Readers either see the old artifact or the new one, never a partial write
+    os.replace(tmp_path, path)
+    return len(envelope)
+
+
+def read_snapshot(path: str) -> RateCardSnapshot:
+    """
+    Load and validate a snapshot artifact.
+
+    Raises:
+        SnapshotError: If the file is unreadable, corrupt or from another format.
+    """
+    try:
+        with open(path, "rb") as f:
+            envelope = msgspec.msgpack.decode(f.read())
+    except OSError as e:
+        raise SnapshotError(path, f"unreadable ({e})")
+    except msgspec.DecodeError as e:
+        raise SnapshotError(path, f"not a snapshot file ({e})")
+
+    if not isinstance(envelope, dict) or envelope.get("format") != SNAPSHOT_FORMAT:
+        raise SnapshotError(path, f"unsupported format {envelope.get('format') if isinstance(envelope, dict) else None}")
+
+    payload = envelope.get("payload") or b""
+    if hashlib.sha256(payload).hexdigest() != envelope.get("sha256"):
+        raise SnapshotError(path, "checksum mismatch")
+
+    return RateCardSnapshot.from_payload(msgspec.msgpack.decode(payload))
+
+
+# --- BOOT SNAPSHOT ---
+
+class _BootState:
+    UNVERIFIED = "unverified"
+    VERIFYING = "verifying"
+    VERIFIED = "verified"
+    STALE = "stale"
+
+
+_boot_lock = threading.Lock()
+_boot_snapshot: Optional[RateCardSnapshot] = None
+_boot_state: Optional[str] = None
+
+
+def get_snapshot_path() -> str:
+    """Configured artifact path; empty means boot snapshots are disabled."""
+    return getattr(settings, 'COURIER_RATE_SNAPSHOT_PATH', DEFAULT_SNAPSHOT_PATH)
+
+
+def install_boot_snapshot(snapshot: Optional[RateCardSnapshot], verified: bool = False):
+    """Make ``snapshot`` the process-wide boot snapshot (``None`` clears it)."""
+    global _boot_snapshot, _boot_state
+    with _boot_lock:
+        _boot_snapshot = snapshot
+        if snapshot is None:
+            _boot_state = None
+        else:
+            _boot_state = _BootState.VERIFIED if verified else _BootState.UNVERIFIED
+
+
+def load_boot_snapshot(path: Optional[str] = None) -> Optional[RateCardSnapshot]:
+    """
+    Load the snapshot artifact if one exists. Never touches the database.
+
+    Called from ``CourierConfig.ready()``; a missing or invalid artifact
+    just means rate cards are compiled from the DB as before.
+    """
+    path = path or get_snapshot_path()
+    if not path or not os.path.exists(path):
+        return None
+
+    try:
+        snapshot = read_snapshot(path)
+    except SnapshotError as e:
+        logger.warning(e.message)
+        return None
+
+    install_boot_snapshot(snapshot)
+    logger.info(f"Rate card snapshot v{snapshot.version} loaded from {path} ({len(snapshot)} carriers)")
+    return snapshot
+
+
+def verify_boot_snapshot() -> bool:
+    """
+    Compare the boot snapshot's version with the database.
+
+    A stale snapshot is discarded and any cached copy derived from it is
+    dropped, so the next request compiles fresh rate cards.
+
+    Returns:
+        bool: True if the boot snapshot is still current.
+    """
+    global _boot_state
+    from courier.models import SystemConfig
+
+    snapshot = _boot_snapshot
+    if snapshot is None:
+        return False
+
+    try:
+        db_version = SystemConfig.get_rate_card_version()
+    except Exception as e:
+        # Keep serving the snapshot; a later call will retry
+        logger.warning(f"Rate card snapshot verification failed: {e}")
+        with _boot_lock:
+            if _boot_snapshot is snapshot:
+                _boot_state = _BootState.UNVERIFIED
+        return False
+
+    current = db_version == snapshot.version
+    with _boot_lock:
+        if _boot_snapshot is not snapshot:
+            return False
+        _boot_state = _BootState.VERIFIED if current else _BootState.STALE
+
+    if not current:
+        cache.delete(CacheKeys.CARRIER_RATE_CARDS)
+        cache.delete(CacheKeys.FTL_RATE_CARDS)
+        logger.warning(
+            f"Rate card snapshot v{snapshot.version} is stale (database is at v{db_version}); discarded"
+        )
+    return current
+
+
+def _verify_in_background():
+    try:
+        verify_boot_snapshot()
+    finally:
+        connection.close()
+
+
+def get_boot_snapshot(verify: bool = True) -> Optional[RateCardSnapshot]:
+    """
+    Return the boot snapshot unless it is known to be stale.
+
+    The first call schedules a background version check; until it finishes
+    the snapshot is served optimistically. Once verified, every later reuse
+    (a rate cache miss) checks the version again, so a rate change made
+    after boot retires the snapshot instead of it being cached back.
+    """
+    global _boot_state
+    with _boot_lock:
+        snapshot, state = _boot_snapshot, _boot_state
+        if snapshot is None or state == _BootState.STALE:
+            return None
+        start_check = verify and state == _BootState.UNVERIFIED
+        if start_check:
+            _boot_state = _BootState.VERIFYING
+
+    if verify and state == _BootState.VERIFIED:
+        return snapshot if verify_boot_snapshot() else None
+
+    if start_check:
+        threading.Thread(
+            target=_verify_in_background, name="rate-snapshot-verify", daemon=True
+        ).start()
+    return snapshot
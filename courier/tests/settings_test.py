@@ -30,3 +30,12 @@ LOGGING = {
         'handlers': ['null'],
     },
 }
+
+# Never pick up a locally exported rate card snapshot
+COURIER_RATE_SNAPSHOT_PATH = ''
+
+# Render invoices in the test thread (tests that need the process pool ask for it)
+COURIER_INVOICE_WORKERS = 0
+
+# Don't queue re-quote jobs from fixture setup (tests that need them turn it on)
+COURIER_REQUOTE_ON_RATE_CHANGE = False
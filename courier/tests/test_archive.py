@@ -0,0 +1,104 @@
+"""
+Tests for order archival, the listing window and the partition helpers
+"""
+from datetime import date, timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from courier import partitioning
+from courier.archive import archive_orders, unpack
+from courier.models import FTLOrder, Order, OrderArchive, OrderStatus
+from courier.order_import import OrderImporter
+
+
+@pytest.fixture
+def aged_orders(sample_order_data):
+    """Orders 400 days old (delivered, cancelled, booked) and one delivered yesterday."""
+    ids = [row["id"] for row in OrderImporter([sample_order_data] * 4).run()["orders"]]
+    statuses = [OrderStatus.DELIVERED, OrderStatus.CANCELLED, OrderStatus.BOOKED, OrderStatus.DELIVERED]
+    ages = [400, 400, 400, 1]
+    now = timezone.now()
+    for pk, status, age in zip(ids, statuses, ages):
+        Order.objects.filter(pk=pk).update(status=status, created_at=now - timedelta(days=age))
+    return Order.objects.in_bulk(ids)
+
+
+@pytest.mark.django_db
+class TestArchiveOrders:
+    """courier.archive.archive_orders"""
+
+    def test_moves_only_old_finished_orders(self, aged_orders):
+        report = archive_orders(older_than_days=180, batch_size=1)
+
+        assert report["archived"] == {OrderArchive.Kind.ORDER: 2, OrderArchive.Kind.FTL: 0}
+        remaining = set(Order.objects.values_list("status", flat=True))
+        assert remaining == {OrderStatus.BOOKED, OrderStatus.DELIVERED}
+        assert Order.objects.count() == 2
+        assert OrderArchive.objects.count() == 2
+
+    def test_archived_row_round_trips(self, aged_orders):
+        delivered = next(o for o in aged_orders.values() if o.status == OrderStatus.DELIVERED
+                         and o.created_at < timezone.now() - timedelta(days=180))
+
+        archive_orders(older_than_days=180)
+
+        archived = OrderArchive.objects.get(order_number=delivered.order_number)
+        row = unpack(archived.payload)
+        assert archived.order_id == delivered.pk
+        assert row["recipient_name"] == delivered.recipient_name
+        assert row["order_value"] == str(delivered.order_value)
+        assert row["created_at"].startswith(delivered.created_at.date().isoformat())
+
+    def test_rerun_and_dry_run(self, aged_orders, sample_ftl_order):
+        FTLOrder.objects.filter(pk=sample_ftl_order.pk).update(
+            status=OrderStatus.CANCELLED, created_at=timezone.now() - timedelta(days=400))
+
+        assert archive_orders(older_than_days=180, dry_run=True)["archived"] == {"order": 2, "ftl": 1}
+        assert not OrderArchive.objects.exists()
+        assert sum(archive_orders(older_than_days=180)["archived"].values()) == 3
+        assert sum(archive_orders(older_than_days=180)["archived"].values()) == 0
+
+    def test_command(self, aged_orders, capsys):
+        call_command('archive_orders', '--older-than-days', '180', '--status', 'delivered')
+
+        assert "1 order(s) created before" in capsys.readouterr().out
+        assert OrderArchive.objects.get().status == OrderStatus.DELIVERED
+
+
+@pytest.mark.django_db
+class TestListingWindow:
+    """?since= on the keyset-paginated listings"""
+
+    def test_old_orders_outside_default_window(self, client, aged_orders):
+        url = reverse('courier:order-list')
+
+        assert len(client.get(url).json()["results"]) == 1
+        assert len(client.get(url, {"since": "all"}).json()["results"]) == 4
+        since = (timezone.now() - timedelta(days=500)).date().isoformat()
+        assert len(client.get(url, {"since": since}).json()["results"]) == 4
+
+    def test_admin_list_and_invalid_since(self, client, admin_token, aged_orders):
+        url = reverse('courier:admin-orders-list')
+
+        assert len(client.get(url, HTTP_X_ADMIN_TOKEN=admin_token).json()["orders"]) == 1
+        response = client.get(url, {"since": "last-year"}, HTTP_X_ADMIN_TOKEN=admin_token)
+        assert response.status_code == 400
+        assert "since" in response.json()
+
+
+def test_partition_helpers():
+    assert partitioning.add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert partitioning.add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    name = partitioning.partition_name('ftl_orders', date(2026, 2, 1))
+    assert name == 'ftl_orders_y2026m02'
+    assert partitioning.partition_month('ftl_orders', name) == date(2026, 2, 1)
+
+
+@pytest.mark.django_db
+def test_partitioning_is_a_no_op_on_sqlite():
+    assert not partitioning.supports_partitioning()
+    assert partitioning.ensure_partitions() == []
+    assert partitioning.drop_empty_partitions(date(2030, 1, 1)) == []
@@ -0,0 +1,76 @@
+"""
+Tests for the admin token verification cache (courier/authentication.py)
+"""
+import pytest
+from unittest.mock import patch
+from django.contrib.auth.hashers import check_password, make_password
+from django.test import override_settings
+from django.urls import reverse
+
+from courier import authentication
+from courier.authentication import check_admin_token, clear_admin_token_cache
+
+
+@pytest.fixture(autouse=True)
+def clean_token_cache():
+    clear_admin_token_cache()
+    yield
+    clear_admin_token_cache()
+
+
+@pytest.fixture
+def hasher():
+    with patch('courier.authentication.check_password', wraps=check_password) as spy:
+        yield spy
+
+
+class TestCheckAdminToken:
+
+    def test_valid_token_is_hashed_once(self, admin_token, hasher):
+        assert all(check_admin_token(admin_token) for _ in range(5))
+        assert hasher.call_count == 1
+
+    def test_invalid_token_is_hashed_once(self, hasher):
+        assert not any(check_admin_token("wrong") for _ in range(5))
+        assert hasher.call_count == 1
+        assert not check_admin_token("")
+
+    def test_valid_token_expires(self, admin_token, hasher):
+        with override_settings(COURIER_ADMIN_TOKEN_CACHE_TTL=0):
+            check_admin_token(admin_token)
+            check_admin_token(admin_token)
+        assert hasher.call_count == 2
+
+    def test_negative_cache_is_bounded(self, hasher):
+        with override_settings(COURIER_ADMIN_TOKEN_NEGATIVE_CACHE_SIZE=2):
+            for token in ("a", "b", "c"):
+                check_admin_token(token)
+
+        assert len(authentication._rejected_tokens) == 2
+        check_admin_token("a")  # Evicted, so hashed again
+        assert hasher.call_count == 4
+
+    def test_password_rotation_invalidates_cache(self, admin_token):
+        assert check_admin_token(admin_token)
+
+        with override_settings(ADMIN_PASSWORD_HASH=make_password("rotated")):
+            assert not check_admin_token(admin_token)
+            assert check_admin_token("rotated")
+
+
+@pytest.mark.django_db
+class TestAdminEndpointsUseCache:
+
+    def test_dashboard_polling_hashes_once(self, client, admin_token, hasher):
+        url = reverse('courier:admin-dashboard-stats')
+        for _ in range(3):
+            assert client.get(url, HTTP_X_ADMIN_TOKEN=admin_token).status_code == 200
+
+        assert hasher.call_count == 1
+
+    def test_invalid_token_still_rejected(self, client, hasher):
+        url = reverse('courier:admin-dashboard-stats')
+        for _ in range(3):
+            assert client.get(url, HTTP_X_ADMIN_TOKEN="wrong").status_code in [401, 403]
+
+        assert hasher.call_count == 1
@@ -0,0 +1,69 @@
+"""
+Tests for single-transaction bulk booking (BookingService.book_orders)
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from courier.models import Order, OrderStatus
+from courier.order_import import OrderImporter
+from courier.views.base import get_rate_snapshot  # before services (views import it back)
+from courier.services import BookingService
+
+CARRIER = 'Delhivery Surface 0.5kg'
+
+
+@pytest.fixture
+def fixed_cost(monkeypatch):
+    # The pincode index is not needed to exercise booking itself
+    monkeypatch.setattr('courier.services.calculate_cost', lambda **kwargs: {
+        "total_cost": 420.0, "zone": "z_b", "breakdown": {"base_forward": 400.0}, "serviceable": True,
+    })
+
+
+@pytest.fixture
+def draft_orders(sample_order_data):
+    def make(count):
+        report = OrderImporter([sample_order_data] * count).run()
+        return [row["id"] for row in report["orders"]]
+    return make
+
+
+@pytest.mark.django_db
+class TestBookOrders:
+    """Locking, status checks and query count"""
+
+    def test_books_all_orders(self, fixed_cost, draft_orders):
+        order_ids = draft_orders(3)
+
+        result = BookingService.book_orders(order_ids, CARRIER, 'Surface')
+
+        assert result["message"] == f"3 order(s) booked with {CARRIER}"
+        orders = Order.objects.filter(pk__in=order_ids)
+        assert {o.status for o in orders} == {OrderStatus.BOOKED}
+        assert {o.carrier.name for o in orders} == {CARRIER}
+        assert all(o.total_cost == 420 and o.zone_applied == "z_b" and o.booked_at for o in orders)
+        assert sorted(result["orders_updated"]) == sorted(o.order_number for o in orders)
+
+    def test_500_orders_in_a_handful_of_queries(self, fixed_cost, draft_orders):
+        order_ids = draft_orders(500)
+        get_rate_snapshot()
+
+        with CaptureQueriesContext(connection) as queries:
+            BookingService.book_orders(order_ids, CARRIER, 'Surface')
+
+        # SELECT ... FOR UPDATE, courier lookup, UPDATE (+ savepoint bookkeeping)
+        assert len(queries) <= 6
+        assert Order.objects.filter(status=OrderStatus.BOOKED).count() == 500
+
+    def test_rejects_non_draft_orders(self, fixed_cost, draft_orders, sample_booked_order):
+        order_ids = draft_orders(2)
+
+        with pytest.raises(ValueError, match=sample_booked_order.order_number):
+            BookingService.book_orders(order_ids + [sample_booked_order.pk], CARRIER, 'Surface')
+
+        assert not Order.objects.filter(pk__in=order_ids, status=OrderStatus.BOOKED).exists()
+
+    def test_missing_orders(self, fixed_cost, draft_orders):
+        with pytest.raises(ValueError, match="not found"):
+            BookingService.book_orders(draft_orders(1) + [987654], CARRIER, 'Surface')
@@ -4,9 +4,14 @@ Migrated from FastAPI to Django
 """
 
 import pytest
+from unittest.mock import patch
+from django.core.cache import cache
 from django.test import Client
 from django.urls import reverse
 
+from courier import health
+from courier.views.base import load_rates
+
 
 @pytest.mark.django_db
 class TestHealthEndpoint:
@@ -72,3 +77,70 @@ class TestHealthEndpoint:
         # Should work without any headers
         response = client.get(reverse('courier:health'))
         assert response.status_code == 200
+
+
+@pytest.fixture
+def fresh_report():
+    cache.clear()
+    health.clear_readiness_report()
+    yield
+    health.clear_readiness_report()
+
+
+@pytest.fixture
+def pincodes_loaded(monkeypatch):
+    monkeypatch.setattr('courier.zones.PINCODE_LOOKUP', {
+        400001: {"office": "Mumbai GPO", "state": "Maharashtra", "district": "Mumbai"}
+    })
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('fresh_report')
+class TestLivenessReadiness:
+    """Tests for GET /health/live and /health/ready"""
+
+    def test_live_does_no_io(self, client, django_assert_num_queries):
+        with django_assert_num_queries(0), patch('courier.health.build_readiness_report') as build:
+            response = client.get(reverse('courier:health-live'))
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+        build.assert_not_called()
+
+    def test_ready_reports_checks(self, client, pincodes_loaded):
+        response = client.get(reverse('courier:health-ready'))
+        data = response.json()
+
+        assert response.status_code == 200
+        assert data["status"] == "ready"
+        assert data["checks"]["database"]["ok"] is True
+        assert data["checks"]["pincode_index"]["count"] == 1
+        assert data["checks"]["pincode_index"]["loaded_at"]
+        assert set(data["checks"]) == {"database", "pincode_index", "region_store", "rate_cards"}
+
+    def test_ready_is_503_without_pincodes(self, client, monkeypatch):
+        monkeypatch.setattr('courier.zones.PINCODE_LOOKUP', {})
+        response = client.get(reverse('courier:health-ready'))
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "not_ready"
+
+    def test_ready_never_loads_rate_cards(self, client, pincodes_loaded):
+        with patch('courier.views.base.build_snapshot') as build:
+            data = client.get(reverse('courier:health-ready')).json()
+
+        build.assert_not_called()
+        assert data["checks"]["rate_cards"]["loaded"] is False
+
+        load_rates()
+        health.clear_readiness_report()
+        rate_cards = client.get(reverse('courier:health-ready')).json()["checks"]["rate_cards"]
+        assert rate_cards["loaded"] is True
+        assert rate_cards["built_at"]
+
+    def test_report_is_cached(self, client, pincodes_loaded, django_assert_num_queries):
+        client.get(reverse('courier:health-ready'))
+
+        with django_assert_num_queries(0):
+            for url in ('courier:health-ready', 'courier:health'):
+                assert client.get(reverse(url)).status_code == 200
@@ -0,0 +1,65 @@
+"""
+Tests for HTTP conditional caching of read-mostly endpoints
+"""
+import pytest
+from django.urls import reverse
+
+from courier.models import SystemConfig
+
+
+@pytest.mark.django_db
+class TestConditionalCaching:
+    """ETag / Last-Modified / 304 / Cache-Control"""
+
+    def test_pincode_lookup(self, client, monkeypatch):
+        monkeypatch.setattr('courier.views.public.PINCODE_LOOKUP', {
+            400001: {"office": "Mumbai GPO", "state": "Maharashtra", "district": "Mumbai"}
+        })
+        monkeypatch.setattr('courier.views.public.PINCODE_DATA_MTIME', 1700000000.0)
+        url = reverse('courier:lookup-pincode', args=[400001])
+        response = client.get(url)
+
+        assert response.status_code == 200
+        assert response['ETag']
+        assert response['Last-Modified']
+        assert 'max-age=86400' in response['Cache-Control']
+
+        cached = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert cached.status_code == 304
+        assert cached.content == b''
+
+    def test_unknown_pincode_has_no_validators(self, client):
+        response = client.get(reverse('courier:lookup-pincode', args=[999999]))
+
+        assert response.status_code == 404
+        assert not response.has_header('ETag')
+
+    def test_ftl_routes(self, client):
+        url = reverse('courier:get-ftl-routes')
+        response = client.get(url)
+
+        assert response.status_code == 200
+        assert response['ETag'].startswith('"ftl-')
+        assert client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code == 304
+        assert client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code == 304
+
+    def test_admin_rates_change_with_rate_card_version(self, client, admin_token):
+        url = reverse('courier:admin-get-rates')
+        response = client.get(url, HTTP_X_ADMIN_TOKEN=admin_token)
+        etag = response['ETag']
+
+        assert response.status_code == 200
+        assert 'private' in response['Cache-Control']
+        assert client.get(url, HTTP_X_ADMIN_TOKEN=admin_token, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        SystemConfig.bump_rate_card_version()
+        response = client.get(url, HTTP_X_ADMIN_TOKEN=admin_token, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
+    def test_admin_rates_require_token_before_304(self, client, admin_token):
+        url = reverse('courier:admin-get-rates')
+        etag = client.get(url, HTTP_X_ADMIN_TOKEN=admin_token)['ETag']
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code in [401, 403]
@@ -0,0 +1,131 @@
+"""
+Tests for cached invoice PDFs and the bulk ZIP export
+"""
+import io
+import json
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+from django.urls import reverse
+
+from courier import invoices
+from courier.invoices import InvoiceRenderer, cache_path, invoice_context, invoice_template
+
+
+@pytest.fixture
+def invoice_cache(settings, tmp_path):
+    settings.COURIER_INVOICE_CACHE_DIR = str(tmp_path)
+    yield tmp_path
+    invoices.renderer.shutdown()
+
+
+@pytest.fixture
+def render_calls(monkeypatch):
+    calls = []
+    render = invoices.render_to_file
+
+    def counting(context, path):
+        calls.append(context['order_number'])
+        return render(context, path)
+
+    monkeypatch.setattr(invoices, 'render_to_file', counting)
+    return calls
+
+
+def _download(client, order):
+    return client.get(reverse('courier:generate-invoice', args=[order.pk]))
+
+
+@pytest.mark.django_db
+class TestInvoiceDownload:
+    """GET /api/orders/{id}/invoice/"""
+
+    def test_rendered_once_then_served_from_disk(self, client, invoice_cache, render_calls, sample_booked_order):
+        first = _download(client, sample_booked_order)
+        second = _download(client, sample_booked_order)
+
+        assert first.status_code == 200
+        assert first['Content-Type'] == 'application/pdf'
+        body = b''.join(first.streaming_content)
+        assert body.startswith(b'%PDF')
+        assert b''.join(second.streaming_content) == body
+        assert render_calls == [sample_booked_order.order_number]
+        assert cache_path(sample_booked_order).exists()
+
+    def test_new_order_version_replaces_cached_file(self, client, invoice_cache, render_calls, sample_order):
+        _download(client, sample_order)
+        stale = cache_path(sample_order)
+
+        sample_order.notes = "updated"
+        sample_order.save()
+        _download(client, sample_order)
+
+        assert len(render_calls) == 2
+        assert not stale.exists()
+        assert cache_path(sample_order).exists()
+
+    def test_slow_render_answers_202(self, client, invoice_cache, settings, monkeypatch, sample_order):
+        settings.COURIER_INVOICE_RENDER_TIMEOUT = 0.01
+        monkeypatch.setattr(invoices.renderer, 'submit', lambda order: Future())
+
+        response = _download(client, sample_order)
+
+        assert response.status_code == 202
+        assert response['Retry-After'] == '2'
+
+
+@pytest.mark.django_db
+class TestBulkInvoices:
+    """POST /api/orders/invoices/"""
+
+    def test_zip_rendered_on_process_pool(self, client, invoice_cache, monkeypatch, request,
+                                          sample_order, sample_booked_order):
+        pool = InvoiceRenderer(workers=2)
+        request.addfinalizer(pool.shutdown)
+        monkeypatch.setattr('courier.views.invoices.renderer', pool)
+
+        response = client.post(reverse('courier:bulk-invoices'),
+                               data=json.dumps({"order_ids": [sample_order.pk, sample_booked_order.pk]}),
+                               content_type='application/json')
+
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/zip'
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        assert sorted(archive.namelist()) == sorted(
+            f"Invoice_{order.order_number}.pdf" for order in (sample_order, sample_booked_order))
+        assert all(archive.read(name).startswith(b'%PDF') for name in archive.namelist())
+        assert cache_path(sample_order).exists()
+
+    def test_unknown_orders(self, client, invoice_cache, sample_order):
+        response = client.post(reverse('courier:bulk-invoices'),
+                               data=json.dumps({"order_ids": [sample_order.pk, 987654]}),
+                               content_type='application/json')
+
+        assert response.status_code == 404
+        assert "987654" in response.json()["detail"]
+
+    def test_limit(self, client, invoice_cache, settings):
+        settings.COURIER_INVOICE_BULK_MAX_ORDERS = 2
+
+        response = client.post(reverse('courier:bulk-invoices'), data=json.dumps({"order_ids": [1, 2, 3]}),
+                               content_type='application/json')
+
+        assert response.status_code == 400
+        assert "At most 2" in response.json()["order_ids"][0]
+
+
+@pytest.mark.django_db
+class TestInvoiceTemplate:
+    """courier.invoices.InvoiceTemplate"""
+
+    def test_shared_template_renders_concurrently(self, sample_order, sample_booked_order):
+        contexts = [invoice_context(order) for order in (sample_order, sample_booked_order)] * 8
+        expected = [invoice_template.render(context, invariant=True) for context in contexts]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            rendered = list(pool.map(lambda context: invoice_template.render(context, invariant=True), contexts))
+
+        assert rendered == expected
+        assert expected[0] != expected[1]
+        assert expected[0].startswith(b'%PDF')
@@ -0,0 +1,119 @@
+"""
+Tests for lane-grouped multi-order comparison and booking
+"""
+import pytest
+from django.urls import reverse
+
+from courier.models import Order, OrderStatus, PaymentMode
+from courier.order_import import OrderImporter
+from courier.views.base import get_rate_snapshot  # before services (views import it back)
+from courier.services import BookingService, CarrierService
+
+CHEAP = 'Delhivery Surface 0.5kg'
+REMOTE_PINCODE = 560001  # CHEAP does not serve it
+
+
+@pytest.fixture
+def priced(monkeypatch):
+    """Deterministic pricing: flat fee + 10/kg (+50 COD); records every call."""
+    calls = []
+
+    def fake_cost(weight, source_pincode, dest_pincode, carrier_data, is_cod, order_value, system_config):
+        calls.append((carrier_data["carrier_name"], source_pincode, dest_pincode, weight))
+        name = carrier_data["carrier_name"]
+        if name == CHEAP and dest_pincode == REMOTE_PINCODE:
+            return {"carrier": name, "error": "Not serviceable", "serviceable": False}
+        base = 100 if name == CHEAP else 150
+        return {
+            "carrier": name, "zone": f"zone-{dest_pincode}", "breakdown": {},
+            "total_cost": round(base + weight * 10 + (50 if is_cod else 0), 2), "serviceable": True,
+        }
+
+    monkeypatch.setattr('courier.services.calculate_cost', fake_cost)
+    return calls
+
+
+@pytest.fixture
+def lane_orders(sample_order_data):
+    """Ten orders on lane A (prepaid), five on lane A (COD), two on the remote lane B."""
+    rows = (
+        [sample_order_data] * 10
+        + [{**sample_order_data, "payment_mode": PaymentMode.COD}] * 5
+        + [{**sample_order_data, "recipient_pincode": REMOTE_PINCODE}] * 2
+    )
+    return [row["id"] for row in OrderImporter(rows).run()["orders"]]
+
+
+def _active_carriers():
+    return [c for c in get_rate_snapshot().carriers if c.get("active", True)]
+
+
+@pytest.mark.django_db
+class TestCompareLanes:
+    """CarrierService.compare_rates"""
+
+    def test_groups_by_lane(self, priced, lane_orders):
+        lanes = CarrierService.get_lanes(lane_orders)
+
+        assert [(lane["dest_pincode"], lane["payment_mode"], lane["order_count"]) for lane in lanes] == [
+            (110001, PaymentMode.COD, 5), (110001, PaymentMode.PREPAID, 10), (REMOTE_PINCODE, PaymentMode.PREPAID, 2),
+        ]
+        assert lanes[1]["total_weight"] == pytest.approx(10 * 1.5)
+
+    def test_prices_each_lane_once_per_carrier(self, priced, lane_orders):
+        result = CarrierService.compare_rates(lane_orders)
+
+        assert len(priced) == 3 * len(_active_carriers())
+        assert len(result["orders"]) == 17
+        assert result["source_pincode"] is None
+        cod_lane = result["lanes"][0]
+        assert len(cod_lane["order_ids"]) == 5
+        assert cod_lane["carriers"][0]["carrier"] == CHEAP
+        assert cod_lane["carriers"][0]["total_cost"] == pytest.approx(100 + 7.5 * 10 + 50)
+
+    def test_combined_carriers_and_optimal_assignment(self, priced, lane_orders):
+        result = CarrierService.compare_rates(lane_orders)
+
+        # CHEAP misses the remote lane, so it cannot take the whole selection
+        assert CHEAP not in {c["carrier"] for c in result["carriers"]}
+        assignment = result["assignment"]
+        assert [item["carrier"] == CHEAP for item in assignment["lanes"]] == [True, True, False]
+        assert assignment["total_cost"] == pytest.approx(sum(item["total_cost"] for item in assignment["lanes"]))
+        assert assignment["unserviceable_lanes"] == []
+
+    def test_single_lane_keeps_route(self, priced, lane_orders):
+        result = CarrierService.compare_rates(lane_orders[:3])
+
+        assert (result["source_pincode"], result["dest_pincode"]) == (400001, 110001)
+        assert result["carriers"] == result["lanes"][0]["carriers"]
+
+    def test_endpoint(self, client, priced, lane_orders):
+        response = client.post(reverse('courier:order-compare-carriers'), data={"order_ids": lane_orders},
+                               content_type='application/json')
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["lanes"]) == 3
+        assert data["assignment"]["lanes"]
+
+
+@pytest.mark.django_db
+class TestBookLanes:
+    """BookingService.book_orders prices each lane on its own"""
+
+    def test_books_each_lane_at_its_cost(self, priced, lane_orders):
+        carrier = next(c for c in _active_carriers() if c["carrier_name"] != CHEAP)
+
+        result = BookingService.book_orders(lane_orders, carrier["carrier_name"], carrier["mode"])
+
+        assert len(result["lanes"]) == 3
+        assert result["total_cost"] == pytest.approx(sum(lane["total_cost"] for lane in result["lanes"]))
+        remote = Order.objects.filter(recipient_pincode=REMOTE_PINCODE)
+        assert {float(o.total_cost) for o in remote} == {150 + 3.0 * 10}
+        assert {o.zone_applied for o in remote} == {f"zone-{REMOTE_PINCODE}"}
+
+    def test_rejects_when_a_lane_is_not_serviceable(self, priced, lane_orders):
+        with pytest.raises(ValueError, match=f"-> {REMOTE_PINCODE} not serviceable"):
+            BookingService.book_orders(lane_orders, CHEAP, 'Surface')
+
+        assert not Order.objects.filter(status=OrderStatus.BOOKED).exists()
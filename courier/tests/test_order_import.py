@@ -0,0 +1,133 @@
+"""
+Tests for bulk order ingestion (CSV / JSON)
+"""
+import json
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from courier.models import Order, OrderStatus
+from courier.order_import import OrderImporter, read_csv
+from courier.serializers import OrderSerializer
+
+CSV_UPLOAD = """recipient_name,recipient_contact,recipient_address,recipient_pincode,sender_pincode,weight,length,width,height,payment_mode,order_value
+Jane Smith,98765-43211,"123 Test Street, Test Area",110001,400001,1.5,30,20,10,cod,1000.50
+Bad Row,12345,Somewhere,11000,400001,0,30,20,10,card,abc
+"""
+
+
+@pytest.fixture
+def pincode_index(monkeypatch):
+    monkeypatch.setattr('courier.zones.PINCODE_LOOKUP', {
+        110001: {"office": "Connaught Place", "state": "Delhi", "district": "New Delhi"},
+    })
+
+
+@pytest.mark.django_db
+class TestOrderImporter:
+    """Column-wise validation and bulk insert"""
+
+    def test_creates_orders_like_save(self, sample_order_data, pincode_index):
+        report = OrderImporter([sample_order_data] * 3).run()
+
+        assert report["created"] == 3
+        assert report["failed"] == 0
+        orders = Order.objects.filter(pk__in=[row["id"] for row in report["orders"]]).order_by("id")
+        assert [o.order_number for o in orders] == [row["order_number"] for row in report["orders"]]
+        order = orders[0]
+        assert order.status == OrderStatus.DRAFT
+        assert order.volumetric_weight == pytest.approx(30 * 20 * 10 / 5000)
+        assert order.applicable_weight == pytest.approx(1.5)
+        assert order.recipient_city == "New Delhi"
+        assert order.recipient_state == "Delhi"
+
+    def test_keeps_supplied_city(self, sample_order_data, pincode_index):
+        report = OrderImporter([{**sample_order_data, "recipient_city": "Delhi Cantt"}]).run()
+
+        assert Order.objects.get(pk=report["orders"][0]["id"]).recipient_city == "Delhi Cantt"
+
+    def test_row_errors_match_serializer(self, sample_order_data):
+        bad = {
+            **sample_order_data,
+            "recipient_name": "J4ne",
+            "recipient_contact": "12ab",
+            "recipient_pincode": 11000,
+            "weight": -1,
+            "payment_mode": "card",
+        }
+        del bad["recipient_address"]
+        report = OrderImporter([sample_order_data, bad]).run()
+
+        assert report["created"] == 1
+        assert report["errors"][0]["row"] == 2
+        errors = report["errors"][0]["errors"]
+        serializer = OrderSerializer(data=bad)
+        assert not serializer.is_valid()
+        for field in ["recipient_name", "recipient_contact", "recipient_address", "weight", "payment_mode"]:
+            assert errors[field] == [str(m) for m in serializer.errors[field]], field
+        assert errors["recipient_pincode"] == ["Pincode must be exactly 6 digits"]
+
+    def test_atomic_and_dry_run(self, sample_order_data):
+        rows = [sample_order_data, {**sample_order_data, "height": "tall"}]
+
+        assert OrderImporter(rows).run(atomic=True)["created"] == 0
+        report = OrderImporter([sample_order_data]).run(dry_run=True)
+        assert report["valid"] == 1 and report["created"] == 0
+        assert not Order.objects.exists()
+
+    def test_csv_rows(self):
+        rows = read_csv(CSV_UPLOAD.encode())
+        report = OrderImporter(rows).run()
+
+        assert report["created"] == 1
+        order = Order.objects.get(pk=report["orders"][0]["id"])
+        assert order.recipient_contact == "9876543211"
+        assert str(order.order_value) == "1000.50"
+        assert set(report["errors"][0]["errors"]) == {
+            "recipient_contact", "recipient_pincode", "weight", "payment_mode", "order_value"
+        }
+
+
+@pytest.mark.django_db
+class TestBulkEndpoint:
+    """POST /api/orders/bulk/"""
+
+    def test_json_list(self, client, sample_order_data):
+        response = client.post(reverse('courier:order-bulk-import'), data=json.dumps([sample_order_data] * 2),
+                               content_type='application/json')
+
+        assert response.status_code == 201
+        assert response.json()["created"] == 2
+
+    def test_csv_body(self, client):
+        response = client.post(reverse('courier:order-bulk-import'), data=CSV_UPLOAD, content_type='text/csv')
+
+        assert response.status_code == 201
+        assert response.json()["failed"] == 1
+
+    def test_all_rows_invalid(self, client, sample_order_data):
+        payload = {"orders": [{**sample_order_data, "weight": 0}], "atomic": True}
+        response = client.post(reverse('courier:order-bulk-import'), data=json.dumps(payload),
+                               content_type='application/json')
+
+        assert response.status_code == 400
+        assert response.json()["errors"][0]["errors"]["weight"] == ["Weight must be greater than 0"]
+
+    def test_unreadable_upload(self, client):
+        response = client.post(reverse('courier:order-bulk-import'), data=json.dumps({"orders": "nope"}),
+                               content_type='application/json')
+
+        assert response.status_code == 400
+        assert "expected a list" in response.json()["detail"]
+
+
+@pytest.mark.django_db
+def test_import_orders_command(tmp_path, sample_order_data, capsys):
+    path = tmp_path / "orders.json"
+    path.write_text(json.dumps([sample_order_data] * 2))
+
+    call_command('import_orders', str(path))
+
+    assert Order.objects.count() == 2
+    assert "2 created" in capsys.readouterr().out
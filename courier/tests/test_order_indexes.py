@@ -0,0 +1,46 @@
+"""
+Tests that the hot order queries are planned on their composite / partial indexes
+"""
+import pytest
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from courier.models import Courier, Order, OrderStatus
+
+
+@pytest.mark.django_db
+class TestOrderQueryPlans:
+    """EXPLAIN (SQLite) for the listing and dashboard queries"""
+
+    def test_status_listing(self):
+        plan = Order.objects.filter(status=OrderStatus.BOOKED).order_by('-created_at', '-id').explain()
+
+        assert 'orders_status_created_idx' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_carrier_listing(self, sample_booked_order):
+        courier = Courier.objects.create(name='Index Test Carrier')
+        plan = Order.objects.filter(carrier=courier).order_by('-created_at', '-id').explain()
+
+        assert 'orders_carrier_created_idx' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_booked_at_index_is_partial(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND name LIKE '%booked_at_idx'")
+            definitions = dict(cursor.fetchall())
+
+        assert set(definitions) == {'orders_booked_at_idx', 'ftl_orders_booked_at_idx'}
+        assert all(f'WHERE "status" = \'{OrderStatus.BOOKED}\'' in sql for sql in definitions.values())
+
+
+@pytest.mark.django_db
+def test_dashboard_counts_recent_bookings(client, admin_token, sample_order, sample_booked_order):
+    Order.objects.filter(pk=sample_booked_order.pk).update(booked_at=timezone.now())
+
+    response = client.get(reverse('courier:admin-dashboard-stats'), HTTP_X_ADMIN_TOKEN=admin_token)
+
+    assert response.status_code == 200
+    assert response.json()['orders']['recent_30_days'] == 2
+    assert response.json()['orders']['booked_30_days'] == 1
@@ -0,0 +1,76 @@
+"""
+Tests for block-reserving order number allocation
+"""
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from courier.models import Order, OrderNumberCounter
+from courier.order_numbers import (
+    FTL, ORDER, OrderNumberAllocator, allocate_ftl_order_numbers, allocate_order_numbers, allocator,
+)
+
+
+def _prefix(kind):
+    return f"{kind}-{timezone.now().year}-"
+
+
+@pytest.mark.django_db
+class TestAllocation:
+    """Formats, sequencing and seeding"""
+
+    def test_sequential_numbers(self):
+        prefix = _prefix(ORDER)
+        assert allocate_order_numbers(3) == [f"{prefix}1001", f"{prefix}1002", f"{prefix}1003"]
+        assert allocate_ftl_order_numbers(1) == [f"{_prefix(FTL)}1001"]
+        assert allocate_order_numbers(1) == [f"{prefix}1004"]
+
+    def test_continues_after_existing_orders(self, sample_order):
+        prefix = _prefix(ORDER)
+        Order.objects.filter(pk=sample_order.pk).update(order_number=f"{prefix}1500")
+
+        assert allocate_order_numbers(1) == [f"{prefix}1501"]
+        assert OrderNumberCounter.objects.get(prefix=prefix).next_value == 1502
+
+    def test_zero_count(self):
+        assert allocate_order_numbers(0) == []
+
+    def test_create_order_uses_allocator(self, client, sample_order_data):
+        first = client.post(reverse('courier:order-list'), data=sample_order_data, content_type='application/json')
+        second = client.post(reverse('courier:order-list'), data=sample_order_data, content_type='application/json')
+
+        assert first.status_code == 201
+        assert first.json()['order_number'] == f"{_prefix(ORDER)}1001"
+        assert second.json()['order_number'] == f"{_prefix(ORDER)}1002"
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBlockReservation:
+    """Outside a transaction, workers reserve blocks and hand them out from memory"""
+
+    @pytest.fixture(autouse=True)
+    def _reset(self):
+        yield
+        allocator.reset()
+
+    @override_settings(COURIER_ORDER_NUMBER_BLOCK_SIZE=10)
+    def test_one_reservation_per_block(self, django_assert_num_queries):
+        prefix = _prefix(ORDER)
+        allocate_order_numbers(1)
+        assert OrderNumberCounter.objects.get(prefix=prefix).next_value == 1011
+
+        with django_assert_num_queries(0):
+            numbers = allocate_order_numbers(9)
+        assert numbers[-1] == f"{prefix}1010"
+
+    def test_workers_never_overlap(self):
+        worker_a, worker_b = OrderNumberAllocator(block_size=5), OrderNumberAllocator(block_size=5)
+
+        issued = []
+        for _ in range(4):
+            issued += worker_a.allocate(ORDER, 3)
+            issued += worker_b.allocate(ORDER, 2)
+        issued += worker_a.allocate(ORDER, 12)
+
+        assert len(set(issued)) == len(issued) == 32
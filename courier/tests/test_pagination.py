@@ -0,0 +1,100 @@
+"""
+Tests for keyset pagination of order listings (courier/pagination.py)
+"""
+import pytest
+from datetime import timedelta
+from django.urls import reverse
+from django.utils import timezone
+
+from courier.models import Courier, Order, OrderStatus, PaymentMode
+
+
+@pytest.fixture
+def orders(db):
+    """25 orders, several sharing a created_at so ties are broken by id"""
+    carrier = Courier.objects.first()
+    now = timezone.now()
+    created = []
+    for i in range(25):
+        created.append(Order.objects.create(
+            order_number=f"ORD-PAGE-{i:03d}",
+            sender_pincode=400001,
+            recipient_pincode=110001,
+            recipient_name="Test Recipient",
+            recipient_contact="9876543211",
+            recipient_address="Test Address",
+            weight=1.0,
+            length=30.0,
+            width=20.0,
+            height=10.0,
+            payment_mode=PaymentMode.PREPAID,
+            status=OrderStatus.BOOKED if i % 2 else OrderStatus.DRAFT,
+            carrier=carrier if i % 5 == 0 else None,
+        ))
+    for i, order in enumerate(created):
+        Order.objects.filter(pk=order.pk).update(created_at=now - timedelta(minutes=i // 3))
+    return sorted(Order.objects.all(), key=lambda o: (o.created_at, o.id), reverse=True)
+
+
+def _walk(client, url, **headers):
+    ids, pages = [], 0
+    while url:
+        data = client.get(url, **headers).json()
+        ids += [o["id"] for o in data.get("results", data.get("orders", []))]
+        url, pages = data["next"], pages + 1
+    return ids, pages
+
+
+@pytest.mark.django_db
+class TestOrderViewSetPagination:
+
+    def test_walks_every_order_once_in_order(self, client, orders):
+        ids, pages = _walk(client, reverse('courier:order-list') + '?page_size=7')
+
+        assert ids == [o.id for o in orders]
+        assert pages == 4
+
+    def test_no_count_by_default(self, client, orders):
+        data = client.get(reverse('courier:order-list')).json()
+
+        assert "count" not in data
+        assert client.get(reverse('courier:order-list'), {'count': 'exact'}).json()["count"] == 25
+
+    def test_filters(self, client, orders):
+        carrier = Courier.objects.first()
+        ids, _ = _walk(client, reverse('courier:order-list') + f'?page_size=2&status=booked&carrier={carrier.name}')
+
+        assert ids == [o.id for o in orders if o.status == OrderStatus.BOOKED and o.carrier_id == carrier.id]
+
+    def test_invalid_cursor(self, client):
+        assert client.get(reverse('courier:order-list'), {'cursor': 'garbage'}).status_code == 404
+
+    def test_deep_pages_do_not_offset(self, client, orders, django_assert_max_num_queries):
+        url = client.get(reverse('courier:order-list') + '?page_size=20').json()["next"]
+
+        with django_assert_max_num_queries(1) as queries:
+            client.get(url)
+        assert "OFFSET" not in queries.captured_queries[-1]["sql"].upper()
+
+
+@pytest.mark.django_db
+class TestAdminOrderListPagination:
+
+    def test_limit_cursor_and_count(self, client, admin_token, orders):
+        url = reverse('courier:admin-orders-list') + '?limit=10'
+        first = client.get(url, HTTP_X_ADMIN_TOKEN=admin_token).json()
+
+        assert first["count"] == 25
+        assert first["count_is_estimate"] is False  # Exact on SQLite
+        assert len(first["orders"]) == 10
+
+        ids, pages = _walk(client, url, HTTP_X_ADMIN_TOKEN=admin_token)
+        assert ids == [o.id for o in orders]
+        assert pages == 3
+
+    def test_ftl_list(self, client, admin_token, sample_ftl_order):
+        data = client.get(reverse('courier:admin-ftl-orders-list'), HTTP_X_ADMIN_TOKEN=admin_token).json()
+
+        assert data["count"] == 1
+        assert data["next"] is None
+        assert data["orders"][0]["id"] == sample_ftl_order.id
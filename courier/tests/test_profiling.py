@@ -0,0 +1,64 @@
+"""
+Tests for the opt-in profiling middleware (courier/middleware.py)
+"""
+import os
+import pytest
+from django.core.exceptions import MiddlewareNotUsed
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from courier.middleware import ProfilingMiddleware
+
+
+@pytest.mark.django_db
+class TestProfilingMiddleware:
+
+    def test_removed_when_not_configured(self, client):
+        with pytest.raises(MiddlewareNotUsed):
+            ProfilingMiddleware(lambda request: None)
+
+        assert not client.get(reverse('courier:health-live')).has_header('Server-Timing')
+
+    @override_settings(COURIER_PROFILE_TOKEN='s3cret')
+    def test_token_request_gets_server_timing(self, admin_token):
+        client = Client()
+        url = reverse('courier:admin-orders-list')
+
+        assert not client.get(url, HTTP_X_ADMIN_TOKEN=admin_token).has_header('Server-Timing')
+        assert not client.get(url, HTTP_X_ADMIN_TOKEN=admin_token, HTTP_X_PROFILE_TOKEN='wrong').has_header('Server-Timing')
+
+        timing = client.get(url, HTTP_X_ADMIN_TOKEN=admin_token, HTTP_X_PROFILE_TOKEN='s3cret')['Server-Timing']
+        metrics = dict(part.split(';', 1) for part in timing.split(', '))
+        assert set(metrics) == {'total', 'db', 'app', 'cache'}
+        assert 'desc="0 queries"' not in metrics['db']
+
+    @override_settings(COURIER_PROFILE_TOKEN='s3cret')
+    def test_counts_cache_hits_and_misses(self, sample_rate_request):
+        import json
+        from django.core.cache import cache
+        cache.clear()
+        client = Client()
+        url = reverse('courier:compare-rates')
+        for _ in range(2):
+            response = client.post(url, data=json.dumps(sample_rate_request), content_type='application/json',
+                                   HTTP_X_PROFILE_TOKEN='s3cret')
+
+        # The second quote finds the rate cards cached
+        assert 'hits=0' not in response['Server-Timing']
+
+    @override_settings(COURIER_PROFILE_SAMPLE_RATE=1.0, COURIER_PROFILE_TOKEN='')
+    def test_sampling(self):
+        assert Client().get(reverse('courier:health-live')).has_header('Server-Timing')
+
+    def test_cprofile_dumps_are_bounded(self, tmp_path):
+        with override_settings(COURIER_PROFILE_TOKEN='s3cret', COURIER_PROFILE_DIR=str(tmp_path),
+                               COURIER_PROFILE_MAX_FILES=2):
+            client = Client()
+            ids = [
+                client.get(reverse('courier:health-live'), HTTP_X_PROFILE_TOKEN='s3cret',
+                           HTTP_X_PROFILE_CPROFILE='1')['X-Profile-Id']
+                for _ in range(3)
+            ]
+
+        assert len(set(ids)) == 3
+        assert sorted(os.listdir(tmp_path)) == sorted(ids[1:])
@@ -0,0 +1,68 @@
+"""
+Tests for the async public views (courier/views/public_async.py)
+"""
+import json
+import pytest
+from unittest.mock import patch
+from django.urls import reverse
+
+from courier.views import public_async
+
+
+@pytest.fixture(autouse=True)
+def clean_rate_cards():
+    public_async.clear_rate_cards()
+    yield
+    public_async.clear_rate_cards()
+
+
+@pytest.mark.django_db
+class TestCompareRatesAsync:
+    """The async view must answer exactly like the sync one"""
+
+    def test_matches_sync_view(self, client, sample_rate_request):
+        sync = client.post(
+            reverse('courier:compare-rates'),
+            data=json.dumps(sample_rate_request),
+            content_type='application/json'
+        )
+        response = client.post(
+            reverse('courier:compare-rates-async'),
+            data=json.dumps(sample_rate_request),
+            content_type='application/json'
+        )
+
+        assert response.status_code == sync.status_code == 200
+        assert response.json() == sync.json()
+
+    def test_validation_errors(self, client, sample_rate_request):
+        sample_rate_request["source_pincode"] = 12345
+        response = client.post(
+            reverse('courier:compare-rates-async'),
+            data=json.dumps(sample_rate_request),
+            content_type='application/json'
+        )
+
+        assert response.status_code == 400
+        assert "source_pincode" in response.json()
+
+    def test_pricing_does_not_read_system_config(self, client, sample_rate_request):
+        """After the rate cards are loaded, quotes make no SystemConfig calls"""
+        url = reverse('courier:compare-rates-async')
+        client.post(url, data=json.dumps(sample_rate_request), content_type='application/json')
+
+        with patch('courier.engine.SystemConfig.get_solo') as get_solo:
+            response = client.post(url, data=json.dumps(sample_rate_request), content_type='application/json')
+
+        assert response.status_code == 200
+        get_solo.assert_not_called()
+
+
+@pytest.mark.django_db
+class TestLookupPincodeAsync:
+
+    def test_known_and_unknown_pincode(self, client):
+        sync = client.get(reverse('courier:lookup-pincode', args=[400001])).json()
+
+        assert client.get(reverse('courier:lookup-pincode-async', args=[400001])).json() == sync
+        assert client.get(reverse('courier:lookup-pincode-async', args=[999999])).status_code == 404
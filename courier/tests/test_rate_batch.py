@@ -0,0 +1,74 @@
+"""
+Tests for the batch compare-rates endpoint (POST /api/compare-rates/batch)
+"""
+import json
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+
+
+def _post_batch(client, shipments):
+    response = client.post(
+        reverse('courier:compare-rates-batch'),
+        data=json.dumps({"shipments": shipments}),
+        content_type='application/json'
+    )
+    return response
+
+
+def _lines(response):
+    body = b"".join(response.streaming_content).decode()
+    return [json.loads(line) for line in body.splitlines()]
+
+
+@pytest.mark.django_db
+class TestCompareRatesBatch:
+    """Test batch pricing with streamed NDJSON results"""
+
+    def test_streams_one_line_per_shipment(self, client, sample_rate_request):
+        response = _post_batch(client, [
+            dict(sample_rate_request, reference="A-1"),
+            dict(sample_rate_request, weight=5),
+        ])
+
+        assert response.status_code == 200
+        assert response.streaming
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = _lines(response)
+        assert [line["index"] for line in lines] == [0, 1]
+        assert lines[0]["reference"] == "A-1"
+        assert lines[0]["status"] == 200
+
+    def test_matches_single_endpoint(self, client, sample_rate_request):
+        single = client.post(
+            reverse('courier:compare-rates'),
+            data=json.dumps(sample_rate_request),
+            content_type='application/json'
+        ).json()
+
+        line = _lines(_post_batch(client, [sample_rate_request]))[0]
+
+        assert [r["carrier"] for r in line["rates"]] == [r["carrier"] for r in single]
+        assert [r["total_cost"] for r in line["rates"]] == [r["total_cost"] for r in single]
+
+    def test_row_errors_do_not_fail_batch(self, client, sample_rate_request):
+        lines = _lines(_post_batch(client, [
+            dict(sample_rate_request, source_pincode=12345),
+            {"source_pincode": 400001, "dest_pincode": 110001},
+            "not a shipment",
+            sample_rate_request,
+        ]))
+
+        assert lines[0]["status"] == 400
+        assert "source_pincode" in lines[0]["errors"]
+        assert lines[1]["errors"] == {"non_field_errors": ["Either 'weight' or 'orders' must be provided."]}
+        assert "non_field_errors" in lines[2]["errors"]
+        assert lines[3]["status"] == 200
+
+    def test_envelope_validation(self, client, sample_rate_request):
+        assert _post_batch(client, []).status_code == 400
+
+        with override_settings(COURIER_RATE_BATCH_MAX_SIZE=2):
+            response = _post_batch(client, [sample_rate_request] * 3)
+        assert response.status_code == 400
+        assert "shipments" in response.json()
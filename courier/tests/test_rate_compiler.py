@@ -0,0 +1,66 @@
+"""
+Tests for the float-native rate card compiler (courier/rate_compiler.py)
+"""
+import pytest
+from decimal import Decimal
+
+from courier.models import Courier
+from courier.rate_compiler import compile_rate_cards
+from courier.rate_import import RateCardImporter
+
+
+def _values(obj):
+    if isinstance(obj, dict):
+        for value in obj.values():
+            yield from _values(value)
+    elif isinstance(obj, list):
+        for value in obj:
+            yield from _values(value)
+    else:
+        yield obj
+
+
+@pytest.fixture
+def custom_matrix_carrier():
+    RateCardImporter([{
+        "carrier_name": "Compiler Matrix Carrier",
+        "type": "PTL",
+        "mode": "Surface",
+        "logic": "Zonal",
+        "zone_mapping": {"Maharashtra": "W1", "Delhi": "N1"},
+        "routing_logic": {"zonal_rates": {"W1": {"W1": 7.5, "N1": 11.25}, "N1": {"N1": 8}}},
+        "edl_config": {"odaslabs": [1, 2]},
+    }]).run()
+
+
+@pytest.mark.django_db
+class TestCompileRateCards:
+    """The compiler must match Courier.get_rate_dict() exactly"""
+
+    def test_matches_get_rate_dict(self, custom_matrix_carrier):
+        carriers, courier_ids = compile_rate_cards(Courier.objects.all())
+
+        assert len(carriers) == Courier.objects.count()
+        for carrier, courier_id in zip(carriers, courier_ids):
+            assert carrier == Courier.objects.get(pk=courier_id).get_rate_dict()
+        assert {c["logic"] for c in carriers} >= {"Zonal", "city_to_city", "pincode_region_csv"}
+
+    def test_values_are_float_native(self, custom_matrix_carrier):
+        carriers, _ = compile_rate_cards(Courier.objects.all())
+
+        assert not any(isinstance(value, Decimal) for value in _values(carriers))
+        matrix = next(c for c in carriers if c["carrier_name"] == "Compiler Matrix Carrier")
+        assert matrix["routing_logic"]["zonal_rates"]["W1"]["N1"] == 11.25
+        assert matrix["zone_mapping"] == {"Maharashtra": "W1", "Delhi": "N1"}
+
+    def test_defaults_to_active_carriers(self):
+        Courier.objects.filter(pk=Courier.objects.first().pk).update(is_active=False)
+
+        carriers, courier_ids = compile_rate_cards()
+
+        assert courier_ids == list(Courier.objects.filter(is_active=True).values_list("pk", flat=True))
+        assert all(c["active"] for c in carriers)
+
+    def test_query_count_is_constant(self, django_assert_max_num_queries):
+        with django_assert_max_num_queries(6):
+            compile_rate_cards(Courier.objects.all())
@@ -0,0 +1,179 @@
+"""
+Tests for the transactional rate card import (courier/rate_import.py)
+"""
+import copy
+import json
+import pytest
+from decimal import Decimal
+from django.urls import reverse
+
+from courier.exceptions import RateCardImportError
+from courier.models import Courier, CourierZoneRate, CityRoute, RequoteJob, SystemConfig
+from courier.rate_import import RateCardImporter, export_rate_cards, update_carrier_rate_card
+from courier.views.base import get_rate_snapshot
+
+
+def _carrier(name="Import Test Carrier", **overrides):
+    doc = {
+        "carrier_name": name,
+        "type": "Courier",
+        "mode": "Surface",
+        "active": True,
+        "min_weight": 0.5,
+        "max_weight": 50.0,
+        "volumetric_divisor": 5000,
+        "logic": "Zonal",
+        "fuel_config": {"is_dynamic": False, "base_diesel_price": 0, "diesel_ratio": 0, "flat_percent": 0.1},
+        "fixed_fees": {"docket_fee": 10, "cod_fixed": 30},
+        "variable_fees": {"cod_percent": 0.015, "owners_risk": 0.002},
+        "routing_logic": {
+            "is_city_specific": False,
+            "zonal_rates": {
+                "forward": {"z_a": 30, "z_b": 35},
+                "additional": {"z_a": 25, "z_b": 30},
+            },
+        },
+    }
+    doc.update(overrides)
+    return doc
+
+
+@pytest.mark.django_db
+class TestRateCardImporter:
+    """Test diffing and applying rate card documents"""
+
+    def test_creates_new_carrier(self):
+        summary = RateCardImporter([_carrier()]).run()
+
+        assert summary["created"] == ["Import Test Carrier"]
+        courier = Courier.objects.get(name="Import Test Carrier")
+        data = courier.get_rate_dict()
+        assert data["routing_logic"]["zonal_rates"]["forward"] == {"z_a": 30.0, "z_b": 35.0}
+        assert data["fixed_fees"]["docket_fee"] == 10.0
+        assert data["variable_fees"]["owners_risk"] == 0.002
+        assert data["fuel_config"]["flat_percent"] == 0.1
+
+    def test_reimport_is_noop(self):
+        RateCardImporter([_carrier()]).run()
+        version = SystemConfig.get_rate_card_version()
+
+        summary = RateCardImporter([_carrier()]).run()
+
+        assert summary["unchanged"] == ["Import Test Carrier"]
+        assert summary["rows"] == {}
+        assert SystemConfig.get_rate_card_version() == version
+
+    def test_diff_updates_and_deletes_rows(self):
+        RateCardImporter([_carrier()]).run()
+        SystemConfig.get_solo()
+        version = SystemConfig.get_rate_card_version()
+
+        doc = _carrier()
+        doc["routing_logic"]["zonal_rates"]["forward"] = {"z_a": 40}
+        doc["routing_logic"]["zonal_rates"]["additional"] = {"z_a": 25}
+        summary = RateCardImporter([doc]).run()
+
+        assert summary["updated"] == ["Import Test Carrier"]
+        assert summary["rows"]["courier_zone_rates"] == {"created": 0, "updated": 1, "deleted": 2}
+        rates = CourierZoneRate.objects.filter(courier__name="Import Test Carrier")
+        assert {(r.zone_code, r.rate_type, r.rate) for r in rates} == {
+            ("z_a", "forward", Decimal("40.00")), ("z_a", "additional", Decimal("25.00"))
+        }
+        # One bump for the whole import, not one per row
+        assert SystemConfig.get_rate_card_version() == version + 1
+
+    def test_city_to_city_routes(self):
+        doc = _carrier(logic="city_to_city")
+        doc["routing_logic"].update({
+            "is_city_specific": True,
+            "city_rates": {"mumbai": 12, "pune": 10},
+            "door_delivery_slabs": [{"min": 0, "max": 100, "rate": 300}],
+        })
+        RateCardImporter([doc]).run()
+
+        routes = dict(CityRoute.objects.filter(courier__name="Import Test Carrier").values_list("city_name", "rate_per_kg"))
+        assert routes == {"mumbai": Decimal("12.00"), "pune": Decimal("10.00")}
+
+    def test_dry_run_writes_nothing(self):
+        summary = RateCardImporter([_carrier()]).run(dry_run=True)
+
+        assert summary["created"] == ["Import Test Carrier"]
+        assert not Courier.objects.filter(name="Import Test Carrier").exists()
+
+    def test_invalid_document_rejected_atomically(self):
+        with pytest.raises(RateCardImportError) as exc:
+            RateCardImporter([_carrier(), _carrier(name="Bad", mode="Boat")]).run()
+
+        assert exc.value.details["errors"][0]["carrier"] == "Bad"
+        assert not Courier.objects.filter(name="Import Test Carrier").exists()
+
+    def test_rename_only_update_invalidates(self, settings, django_capture_on_commit_callbacks):
+        settings.COURIER_REQUOTE_ON_RATE_CHANGE = True
+        RateCardImporter([_carrier()]).run()
+        courier_id = Courier.objects.get(name="Import Test Carrier").pk
+        assert get_rate_snapshot().carriers.get("Import Test Carrier", "Surface") is not None
+        version = SystemConfig.get_rate_card_version()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            update_carrier_rate_card("Import Test Carrier", {"carrier_name": "Renamed Carrier"})
+
+        assert SystemConfig.get_rate_card_version() > version
+        snapshot = get_rate_snapshot()
+        assert snapshot.carriers.get("Import Test Carrier", "Surface") is None
+        assert snapshot.carriers.get("Renamed Carrier", "Surface") is not None
+        assert RequoteJob.objects.get().carrier_ids == [courier_id]
+
+    def test_export_round_trip(self):
+        """An exported document imports back without changes"""
+        document = export_rate_cards()
+        summary = RateCardImporter(copy.deepcopy(document)).run()
+
+        assert summary["created"] == []
+        assert summary["updated"] == []
+        assert export_rate_cards() == document
+
+
+@pytest.mark.django_db
+class TestRateCardImportEndpoint:
+    """Test the admin import endpoint"""
+
+    def test_import_requires_token(self, client):
+        response = client.post(
+            reverse('courier:admin-import-rates'),
+            data=json.dumps([_carrier()]),
+            content_type='application/json'
+        )
+        assert response.status_code in [401, 403]
+
+    def test_import_with_options(self, client, admin_token):
+        response = client.post(
+            reverse('courier:admin-import-rates'),
+            data=json.dumps({"carriers": [_carrier()], "dry_run": True}),
+            content_type='application/json',
+            HTTP_X_ADMIN_TOKEN=admin_token
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["dry_run"] is True
+        assert data["created"] == ["Import Test Carrier"]
+
+    def test_import_validation_errors(self, client, admin_token):
+        response = client.post(
+            reverse('courier:admin-import-rates'),
+            data=json.dumps([{"mode": "Air"}]),
+            content_type='application/json',
+            HTTP_X_ADMIN_TOKEN=admin_token
+        )
+        assert response.status_code == 400
+        assert response.json()["errors"][0]["error"] == "carrier_name is required"
+
+    def test_toggle_carrier_updates_db(self, client, admin_token):
+        RateCardImporter([_carrier()]).run()
+        response = client.put(
+            reverse('courier:admin-toggle-carrier', args=["Import Test Carrier"]),
+            data=json.dumps({"active": False}),
+            content_type='application/json',
+            HTTP_X_ADMIN_TOKEN=admin_token
+        )
+        assert response.status_code == 200
+        assert Courier.objects.get(name="Import Test Carrier").is_active is False
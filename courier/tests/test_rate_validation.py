@@ -0,0 +1,79 @@
+"""
+Tests for the compiled rate request validation fast path
+"""
+import json
+import pytest
+from unittest.mock import patch
+from django.urls import reverse
+from rest_framework.exceptions import ValidationError
+
+from courier.serializers import RateRequestSerializer, validate_rate_request
+
+BOX = {"weight": 2, "length": 30, "width": 20.5, "height": 10}
+
+PAYLOADS = [
+    {"source_pincode": 400001, "dest_pincode": 110001, "weight": 1.5},
+    {"source_pincode": 400001, "dest_pincode": 110001, "weight": 3, "is_cod": True,
+     "order_value": 2000, "mode": "Air", "reference": "ignored"},
+    {"source_pincode": 400001, "dest_pincode": 110001, "orders": [BOX, BOX]},
+    {"source_pincode": 400001, "dest_pincode": 110001, "weight": 1, "orders": []},
+    # Coerced by DRF only
+    {"source_pincode": "400001", "dest_pincode": 110001.0, "weight": "1.5", "is_cod": "true"},
+    {"source_pincode": 400001, "dest_pincode": 110001, "weight": True},
+    # Invalid
+    {"source_pincode": 12345, "dest_pincode": 110001, "weight": 1},
+    {"source_pincode": 400001, "dest_pincode": 110001},
+    {"source_pincode": 400001, "dest_pincode": 110001, "orders": []},
+    {"source_pincode": 400001, "dest_pincode": 110001, "weight": None},
+    {"source_pincode": 400001, "dest_pincode": 110001, "weight": 1000},
+    {"source_pincode": 400001, "dest_pincode": 110001, "weight": 1, "mode": "Rail"},
+    {"source_pincode": 400001, "dest_pincode": 110001, "orders": [dict(BOX, height=0)]},
+    {"source_pincode": 400001, "dest_pincode": 110001, "weight": 1, "order_value": -1},
+    {"source_pincode": 10 ** 400, "dest_pincode": 110001, "weight": 1},
+    ["not", "a", "dict"],
+]
+
+
+def _serializer_result(payload):
+    serializer = RateRequestSerializer(data=payload)
+    if serializer.is_valid():
+        return json.dumps(serializer.validated_data, sort_keys=True), None
+    return None, serializer.errors
+
+
+class TestValidateRateRequest:
+    """The fast path must be indistinguishable from RateRequestSerializer"""
+
+    @pytest.mark.parametrize("payload", PAYLOADS)
+    def test_matches_serializer(self, payload):
+        expected_data, expected_errors = _serializer_result(payload)
+
+        try:
+            data = validate_rate_request(payload)
+        except ValidationError as e:
+            assert e.detail == expected_errors
+        else:
+            assert expected_errors is None
+            assert json.dumps(data, sort_keys=True) == expected_data
+
+    def test_well_formed_requests_skip_serializer(self):
+        with patch('courier.serializers.RateRequestSerializer') as serializer:
+            data = validate_rate_request(PAYLOADS[2])
+
+        serializer.assert_not_called()
+        assert data["orders"][0] == {"weight": 2.0, "length": 30.0, "width": 20.5, "height": 10.0}
+        assert data["mode"] == "Both" and data["is_cod"] is False
+
+
+@pytest.mark.django_db
+class TestCompareRatesValidation:
+
+    def test_errors_are_drf_shaped(self, client):
+        response = client.post(
+            reverse('courier:compare-rates'),
+            data=json.dumps({"source_pincode": 12345, "dest_pincode": 110001}),
+            content_type='application/json'
+        )
+
+        assert response.status_code == 400
+        assert response.json() == {"source_pincode": ["Ensure this value is greater than or equal to 100000."]}
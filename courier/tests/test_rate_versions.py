@@ -0,0 +1,135 @@
+"""
+Tests for effective-dated rate card versions (courier/rate_versions.py)
+"""
+import json
+import pytest
+from datetime import timedelta
+from django.urls import reverse
+from django.utils import timezone
+
+from courier.models import Courier, RateCardVersion, RequoteJob, SystemConfig
+from courier.rate_versions import (
+    publish_rate_card_version, get_active_version_id, get_version_snapshot, clear_version_cache
+)
+from courier.requote import run_pending_jobs
+from courier.views.base import get_rate_snapshot
+
+
+def active_carriers(snapshot):
+    return [c["carrier_name"] for c in snapshot.carriers if c.get("active", True)]
+
+
+@pytest.fixture(autouse=True)
+def clean_version_cache():
+    clear_version_cache()
+    yield
+    clear_version_cache()
+
+
+@pytest.mark.django_db
+class TestRateCardVersions:
+    """Test publishing and activating rate card versions"""
+
+    def test_live_tables_used_before_first_publish(self):
+        assert get_active_version_id() is None
+        assert get_rate_snapshot().version_id is None
+
+    def test_published_version_is_active(self):
+        version = publish_rate_card_version(notes="initial")
+
+        snapshot = get_rate_snapshot()
+        assert snapshot.version_id == version.pk
+        assert snapshot.carriers.version_id == version.pk
+        assert len(snapshot) == len(version.payload["carriers"])
+
+    def test_scheduled_version_activates_at_effective_time(self):
+        current = publish_rate_card_version()
+        scheduled = publish_rate_card_version(effective_from=timezone.now() + timedelta(days=1))
+
+        assert get_active_version_id() == current.pk
+        assert get_active_version_id(at=timezone.now() + timedelta(days=2)) == scheduled.pk
+
+    def test_versions_are_immutable(self):
+        version = publish_rate_card_version()
+        version.notes = "changed"
+        with pytest.raises(ValueError):
+            version.save()
+
+    def test_version_keeps_system_config(self):
+        """Later config changes do not leak into a published version"""
+        conf = SystemConfig.get_solo()
+        version = publish_rate_card_version()
+        gst_rate = float(conf.gst_rate)
+
+        conf.gst_rate = "0.28"
+        conf.save()
+
+        assert get_version_snapshot(version.pk).system_config["gst_rate"] == gst_rate
+
+    def test_edits_after_publish_are_drafts(self):
+        """Live table edits reach quotes with the next publish, not before"""
+        version = publish_rate_card_version()
+        courier = Courier.objects.filter(is_active=True).first()
+        courier.is_active = False
+        courier.save()
+
+        snapshot = get_rate_snapshot()
+        assert snapshot.version_id == version.pk
+        assert courier.name in active_carriers(snapshot)
+
+        version = publish_rate_card_version()
+        snapshot = get_rate_snapshot()
+        assert snapshot.version_id == version.pk
+        assert courier.name not in active_carriers(snapshot)
+
+    def test_publish_queues_requote_at_effective_time(self, settings, django_capture_on_commit_callbacks):
+        settings.COURIER_REQUOTE_ON_RATE_CHANGE = True
+        effective_from = timezone.now() + timedelta(days=1)
+        with django_capture_on_commit_callbacks(execute=True):
+            publish_rate_card_version()
+            courier = Courier.objects.filter(is_active=True).first()
+            courier.is_active = False
+            courier.save()
+            scheduled = publish_rate_card_version(effective_from=effective_from)
+
+        # The draft edit queued nothing; each publish queued one job for all carriers
+        jobs = list(RequoteJob.objects.order_by('id').values_list('carrier_ids', 'run_after'))
+        assert len(jobs) == 2
+        assert jobs[1] == (None, scheduled.effective_from)
+        assert [job.run_after for job in run_pending_jobs(pause=0)] == [jobs[0][1]]
+        assert RequoteJob.objects.get(run_after=effective_from).status == RequoteJob.Status.PENDING
+
+
+@pytest.mark.django_db
+class TestRateCardVersionEndpoint:
+    """Test the admin rate card version endpoint"""
+
+    def test_publish_and_list(self, client, admin_token):
+        response = client.post(
+            reverse('courier:admin-rate-card-versions'),
+            data=json.dumps({"notes": "November revision"}),
+            content_type='application/json',
+            HTTP_X_ADMIN_TOKEN=admin_token
+        )
+        assert response.status_code == 201
+        version_id = response.json()["id"]
+
+        response = client.get(reverse('courier:admin-rate-card-versions'), HTTP_X_ADMIN_TOKEN=admin_token)
+        assert response.status_code == 200
+        versions = response.json()
+        assert versions[0]["id"] == version_id
+        assert versions[0]["active"] is True
+        assert RateCardVersion.objects.get(pk=version_id).notes == "November revision"
+
+    def test_rate_edit_after_publish_warns(self, client, admin_token):
+        url = reverse('courier:admin-toggle-carrier', args=['Blue Dart'])
+        response = client.put(url, data=json.dumps({"active": False}), content_type='application/json',
+                              HTTP_X_ADMIN_TOKEN=admin_token)
+        assert response.status_code == 200
+        assert "warning" not in response.json()
+
+        version = publish_rate_card_version()
+        response = client.put(url, data=json.dumps({"active": True}), content_type='application/json',
+                              HTTP_X_ADMIN_TOKEN=admin_token)
+        assert response.status_code == 200
+        assert f"published rate card version {version.pk}" in response.json()["warning"]
@@ -0,0 +1,100 @@
+"""
+Tests for the msgspec JSON renderer/parser and typed quote schema
+"""
+import datetime
+import io
+import json
+import uuid
+from decimal import Decimal
+
+import msgspec
+import pytest
+from django.urls import reverse
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.renderers import JSONRenderer
+
+from courier.renderers import MsgspecJSONParser, MsgspecJSONRenderer
+from courier.schemas import BatchQuoteLine, Quote
+
+
+class TestMsgspecJSONRenderer:
+    """Output must parse to the same JSON as DRF's JSONRenderer"""
+
+    def test_matches_json_renderer(self):
+        data = {
+            "order_number": "ORD-1",
+            "created_at": datetime.datetime(2024, 5, 1, 10, 30, tzinfo=datetime.timezone.utc),
+            "delivery_date": datetime.date(2024, 5, 3),
+            "uuid": uuid.UUID(int=1),
+            "amount": Decimal("1234.50"),
+            "errors": {"weight": [ErrorDetail("Required", code="required")]},
+            "city": "Chennai ₹",
+            "rates": [1.5, 0.1, None, True],
+        }
+        fast = MsgspecJSONRenderer().render(data)
+
+        assert json.loads(fast) == json.loads(JSONRenderer().render(data))
+        assert b"\xe2\x82\xb9" in fast  # UTF-8, not \u escapes
+
+    def test_indent_and_empty(self):
+        renderer = MsgspecJSONRenderer()
+
+        assert renderer.render(None) == b''
+        assert b'\n  "a"' in renderer.render({"a": 1}, 'application/json; indent=2')
+
+
+class TestMsgspecJSONParser:
+
+    def test_parse_and_errors(self):
+        parser = MsgspecJSONParser()
+
+        assert parser.parse(io.BytesIO(b'{"a": [1, 2.5]}')) == {"a": [1, 2.5]}
+        with pytest.raises(ParseError):
+            parser.parse(io.BytesIO(b'{"a": '))
+
+
+@pytest.mark.django_db
+class TestHotEndpoints:
+    """Hot endpoints keep the wire format and match the typed schema"""
+
+    def test_compare_rates_decodes_as_quotes(self, client, sample_rate_request):
+        response = client.post(
+            reverse('courier:compare-rates'),
+            data=json.dumps(sample_rate_request),
+            content_type='application/json'
+        )
+
+        assert response.status_code == 200
+        quotes = msgspec.json.decode(response.content, type=list[Quote])
+        assert quotes
+        assert [q.total_cost for q in quotes] == sorted(q.total_cost for q in quotes)
+
+    def test_batch_lines_decode(self, client, sample_rate_request):
+        response = client.post(
+            reverse('courier:compare-rates-batch'),
+            data=json.dumps({"shipments": [sample_rate_request, {"weight": 1}]}),
+            content_type='application/json'
+        )
+        body = b"".join(response.streaming_content)
+        lines = [msgspec.json.decode(line, type=BatchQuoteLine) for line in body.splitlines()]
+
+        assert lines[0].status == 200 and lines[0].rates
+        assert lines[1].status == 400 and lines[1].errors
+
+    def test_malformed_body(self, client):
+        response = client.post(
+            reverse('courier:compare-rates'), data='{"weight":', content_type='application/json'
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("JSON parse error")
+
+    def test_orders_still_accept_forms(self, client, sample_order):
+        response = client.patch(
+            reverse('courier:order-detail', args=[sample_order.id]),
+            data='recipient_name=Form+Recipient', content_type='application/x-www-form-urlencoded'
+        )
+
+        assert response.status_code == 200
+        sample_order.refresh_from_db()
+        assert sample_order.recipient_name == "Form Recipient"
@@ -0,0 +1,150 @@
+"""
+Tests for re-quoting DRAFT orders after rate or fuel changes
+"""
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+
+from courier.models import Courier, CourierZoneRate, Order, RequoteJob, SystemConfig
+from courier.order_import import OrderImporter
+from courier import requote
+from courier.requote import enqueue_requote, run_job, run_pending_jobs
+
+CHEAP = 'Delhivery Surface 0.5kg'
+OTHER = 'Shadowfax Surface 0.5kg'
+
+
+@pytest.fixture
+def priced(monkeypatch):
+    """Flat 420 per order; records every call."""
+    calls = []
+
+    def fake_cost(weight, source_pincode, dest_pincode, carrier_data, is_cod, order_value, system_config):
+        calls.append((carrier_data["carrier_name"], source_pincode, dest_pincode, weight))
+        return {"total_cost": 420.0, "zone": "z_b", "breakdown": {"base_forward": 400.0}, "serviceable": True}
+
+    monkeypatch.setattr('courier.requote.calculate_cost', fake_cost)
+    return calls
+
+
+@pytest.fixture
+def quoted_drafts(sample_order_data):
+    """Drafts quoted at 150, priced by ``carrier`` on ``dest`` lane."""
+    def make(count, carrier=CHEAP, dest=110001, weight=1.5):
+        rows = [dict(sample_order_data, recipient_pincode=dest, weight=weight)] * count
+        ids = [row["id"] for row in OrderImporter(rows).run()["orders"]]
+        Order.objects.filter(pk__in=ids).update(
+            carrier=Courier.objects.get(name=carrier), mode='Surface', total_cost=Decimal('150.00'),
+            zone_applied='z_a', cost_breakdown={"base_forward": 130.0},
+        )
+        return ids
+    return make
+
+
+@pytest.mark.django_db
+class TestRequoteJob:
+    """courier.requote.run_job"""
+
+    def test_reprices_quoted_drafts_only(self, priced, quoted_drafts, sample_order, sample_booked_order):
+        ids = quoted_drafts(3)
+        Order.objects.filter(pk=sample_booked_order.pk).update(carrier=Courier.objects.get(name=CHEAP))
+
+        job = run_job(enqueue_requote(), pause=0)
+
+        assert job.status == RequoteJob.Status.DONE
+        assert (job.scanned, job.changed, job.unserviceable) == (3, 3, 0)
+        assert job.total_delta == Decimal('810.00')
+        assert job.largest_increase == Decimal('270.00')
+        assert job.by_carrier == {CHEAP: {"changed": 3, "delta": 810.0}}
+        drafts = Order.objects.filter(pk__in=ids)
+        assert {(o.total_cost, o.zone_applied) for o in drafts} == {(Decimal('420.00'), 'z_b')}
+        sample_booked_order.refresh_from_db()
+        assert sample_booked_order.total_cost == 150
+        sample_order.refresh_from_db()
+        assert sample_order.total_cost is None
+        # Identical orders on one lane are priced once per batch
+        assert len(priced) == 1
+
+    def test_narrowed_by_carrier_and_lane(self, priced, quoted_drafts):
+        cheap = quoted_drafts(2)
+        other = quoted_drafts(2, carrier=OTHER)
+        remote = quoted_drafts(1, dest=560001)
+
+        run_job(enqueue_requote([Courier.objects.get(name=CHEAP).pk], dest_pincode=110001), pause=0)
+
+        costs = dict(Order.objects.values_list('pk', 'total_cost'))
+        assert {costs[pk] for pk in cheap} == {Decimal('420.00')}
+        assert {costs[pk] for pk in other + remote} == {Decimal('150.00')}
+
+    def test_resumes_from_cursor_after_failure(self, priced, quoted_drafts, monkeypatch):
+        ids = quoted_drafts(5)
+        price_batch = requote._price_batch
+        batches = []
+
+        def second_batch_fails(orders, snapshot, job):
+            batches.append([order.pk for order in orders])
+            if len(batches) == 2:
+                raise RuntimeError("database went away")
+            return price_batch(orders, snapshot, job)
+
+        monkeypatch.setattr(requote, '_price_batch', second_batch_fails)
+        job = run_job(enqueue_requote(), batch_size=3, pause=0)
+
+        assert job.status == RequoteJob.Status.FAILED
+        assert "database went away" in job.error
+        assert (job.cursor, job.scanned, job.changed) == (ids[2], 3, 3)
+        assert Order.objects.get(pk=ids[3]).total_cost == 150
+
+        job = run_job(job, batch_size=3, pause=0)
+
+        assert batches[2] == ids[3:]
+
+        assert job.status == RequoteJob.Status.DONE
+        assert (job.scanned, job.changed) == (5, 5)
+        assert not Order.objects.filter(pk__in=ids, total_cost=150).exists()
+
+    def test_time_budget_leaves_job_running(self, priced, quoted_drafts):
+        quoted_drafts(2)
+        job = enqueue_requote()
+
+        assert run_pending_jobs(max_seconds=0) == []
+        job = run_job(job, batch_size=1, pause=0, deadline=0)
+        assert job.status == RequoteJob.Status.RUNNING
+        assert run_pending_jobs(pause=0)[0].status == RequoteJob.Status.DONE
+
+
+@pytest.mark.django_db
+class TestQueueing:
+    """Jobs queued by rate changes"""
+
+    def test_pending_jobs_are_merged(self):
+        first = enqueue_requote([3, 1])
+        assert enqueue_requote([2]).pk == first.pk
+        assert RequoteJob.objects.get(pk=first.pk).carrier_ids == [1, 2, 3]
+        assert enqueue_requote().carrier_ids is None
+        assert enqueue_requote([4], dest_pincode=110001).pk != first.pk
+
+    def test_rate_and_fuel_changes_queue_jobs(self, settings, django_capture_on_commit_callbacks):
+        settings.COURIER_REQUOTE_ON_RATE_CHANGE = True
+        courier = Courier.objects.get(name=CHEAP)
+        with django_capture_on_commit_callbacks(execute=True):
+            rate = courier.zone_rates.filter(rate_type=CourierZoneRate.RateType.FORWARD).first()
+            rate.rate += 1
+            rate.save()
+        assert RequoteJob.objects.get(status=RequoteJob.Status.PENDING).carrier_ids == [courier.pk]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            config = SystemConfig.get_solo()
+            config.diesel_price_current += 5
+            config.save()
+        assert RequoteJob.objects.get(status=RequoteJob.Status.PENDING).carrier_ids is None
+
+    def test_command(self, priced, quoted_drafts, capsys):
+        quoted_drafts(2)
+
+        call_command('requote_drafts', '--carrier', CHEAP, '--pause', '0')
+
+        out = capsys.readouterr().out
+        assert "2 of 2 re-quoted, total +540.00" in out
+        assert "1 job(s) run, 2 draft quote(s) changed" in out
@@ -0,0 +1,144 @@
+"""
+Tests for precompiled rate-card snapshots (courier/snapshot.py)
+"""
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from courier.exceptions import SnapshotError
+from courier.models import Courier, SystemConfig
+from courier.snapshot import (
+    RateCardSnapshot, build_snapshot, dump_snapshot, read_snapshot, filter_by_mode,
+    install_boot_snapshot, load_boot_snapshot, get_boot_snapshot, verify_boot_snapshot
+)
+from courier.views.base import load_rates, get_rate_snapshot
+from courier.constants import CacheKeys
+
+
+@pytest.fixture(autouse=True)
+def clean_boot_snapshot():
+    """Each test starts without a boot snapshot and with an empty rate cache"""
+    install_boot_snapshot(None)
+    cache.delete(CacheKeys.CARRIER_RATE_CARDS)
+    yield
+    install_boot_snapshot(None)
+    cache.delete(CacheKeys.CARRIER_RATE_CARDS)
+
+
+@pytest.mark.django_db
+class TestSnapshotFile:
+    """Test writing and reading snapshot artifacts"""
+
+    def test_round_trip(self, tmp_path):
+        """A dumped snapshot reads back identically"""
+        snapshot = build_snapshot()
+        path = tmp_path / "rates.msgpack"
+        dump_snapshot(snapshot, str(path))
+
+        loaded = read_snapshot(str(path))
+        assert loaded.to_payload() == snapshot.to_payload()
+        assert loaded.version == SystemConfig.get_rate_card_version()
+        assert len(loaded) == Courier.objects.filter(is_active=True).count()
+
+    def test_corrupt_file_rejected(self, tmp_path):
+        """A tampered payload fails the checksum"""
+        path = tmp_path / "rates.msgpack"
+        dump_snapshot(RateCardSnapshot(carriers=[{"carrier_name": "X"}], version=3), str(path))
+        data = path.read_bytes().replace(b"carrier_name", b"carrier_nome")
+        path.write_bytes(data)
+
+        with pytest.raises(SnapshotError) as exc:
+            read_snapshot(str(path))
+        assert exc.value.code == "SNAPSHOT_INVALID"
+
+    def test_missing_file_is_ignored_at_boot(self, tmp_path):
+        """No artifact means no boot snapshot"""
+        assert load_boot_snapshot(str(tmp_path / "absent.msgpack")) is None
+        assert get_boot_snapshot(verify=False) is None
+
+    def test_export_command(self, tmp_path):
+        """export_rate_snapshot writes a loadable artifact"""
+        path = tmp_path / "rates.msgpack"
+        call_command("export_rate_snapshot", output=str(path), verify=True)
+        assert read_snapshot(str(path)).version == SystemConfig.get_rate_card_version()
+
+
+@pytest.mark.django_db
+class TestBootSnapshot:
+    """Test serving rate cards from the boot snapshot"""
+
+    def test_load_rates_served_from_boot_snapshot(self):
+        """load_rates uses the boot snapshot instead of compiling from DB"""
+        fake = RateCardSnapshot(
+            carriers=[{"carrier_name": "Snapshot Carrier"}],
+            version=SystemConfig.get_rate_card_version()
+        )
+        install_boot_snapshot(fake, verified=True)
+
+        assert load_rates() == [{"carrier_name": "Snapshot Carrier"}]
+
+    def test_stale_snapshot_discarded(self):
+        """A rate change after export makes the boot snapshot stale"""
+        snapshot = build_snapshot()
+        install_boot_snapshot(snapshot)
+
+        courier = Courier.objects.filter(is_active=True).first()
+        courier.save()  # bumps the rate card version via signals
+
+        assert SystemConfig.get_rate_card_version() > snapshot.version
+        assert verify_boot_snapshot() is False
+        assert get_boot_snapshot(verify=False) is None
+        assert get_rate_snapshot() is not snapshot
+
+    def test_verified_snapshot_not_reused_after_rate_change(self):
+        """A carrier edited after boot shows up on the next cache miss"""
+        install_boot_snapshot(build_snapshot(), verified=True)
+        assert get_rate_snapshot().version == SystemConfig.get_rate_card_version()
+
+        courier = Courier.objects.filter(is_active=True).first()
+        courier.is_active = False
+        courier.save()  # bumps the version and drops the cached rate cards
+
+        snapshot = get_rate_snapshot()
+        assert snapshot.version == SystemConfig.get_rate_card_version()
+        assert courier.name not in [c["carrier_name"] for c in snapshot.carriers if c.get("active", True)]
+        assert get_boot_snapshot(verify=False) is None
+
+    def test_current_snapshot_verified(self):
+        """An up-to-date boot snapshot passes verification"""
+        install_boot_snapshot(build_snapshot())
+        assert verify_boot_snapshot() is True
+        assert get_boot_snapshot(verify=False) is not None
+
+
+class TestCarrierIndexes:
+    """Test the lookup indexes on snapshot carriers"""
+
+    def setup_method(self):
+        self.snapshot = RateCardSnapshot(
+            carriers=[
+                {"carrier_name": "Alpha", "mode": "Surface", "logic": "Zonal"},
+                {"carrier_name": "Alpha", "mode": "Air", "logic": "Zonal"},
+                {"carrier_name": "Beta", "mode": "Surface", "logic": "city_to_city"},
+            ],
+            courier_ids=[1, 2, 3],
+        )
+
+    def test_lookup_by_name_and_mode(self):
+        carriers = self.snapshot.carriers
+        assert carriers.get("Alpha", "Air")["mode"] == "Air"
+        assert carriers.get("Alpha")["mode"] == "Surface"
+        assert carriers.get("Gamma") is None
+        assert carriers.courier_id("Alpha", "air") == 2
+
+    def test_filter_by_mode_and_logic(self):
+        carriers = self.snapshot.carriers
+        assert [c["carrier_name"] for c in carriers.for_mode("surface")] == ["Alpha", "Beta"]
+        assert len(carriers.for_mode("Both")) == 3
+        assert [c["carrier_name"] for c in carriers.for_logic("city_to_city")] == ["Beta"]
+
+    def test_filter_by_mode_plain_list(self):
+        """filter_by_mode also accepts a plain list of rate cards"""
+        plain = list(self.snapshot.carriers)
+        assert filter_by_mode(plain, "Air") == [plain[1]]
+        assert filter_by_mode(plain, "both") == plain
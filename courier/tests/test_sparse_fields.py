@@ -0,0 +1,68 @@
+"""
+Tests for ?fields= / ?exclude= sparse fieldsets on order endpoints
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from courier.models import Order
+
+
+def _order_selects(queries):
+    return [q['sql'] for q in queries if q['sql'].startswith('SELECT') and '"orders"' in q['sql']]
+
+
+@pytest.mark.django_db
+class TestOrderViewSetFields:
+    """GET /api/orders/"""
+
+    def test_fields_limits_payload_and_columns(self, client, sample_booked_order):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse('courier:order-list'), {'fields': 'id,order_number,status'})
+
+        assert response.status_code == 200
+        assert set(response.json()['results'][0]) == {'id', 'order_number', 'status'}
+        sql = ' '.join(_order_selects(queries))
+        assert 'cost_breakdown' not in sql
+        assert '"notes"' not in sql
+
+    def test_exclude_defers_columns(self, client, sample_booked_order):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse('courier:order-list'), {'exclude': 'cost_breakdown,notes'})
+
+        row = response.json()['results'][0]
+        assert 'cost_breakdown' not in row and 'notes' not in row
+        assert row['order_number'] == sample_booked_order.order_number
+        assert 'cost_breakdown' not in ' '.join(_order_selects(queries))
+
+    def test_retrieve_and_default(self, client, sample_order):
+        url = reverse('courier:order-detail', args=[sample_order.pk])
+
+        assert set(client.get(url, {'fields': 'id,weight'}).json()) == {'id', 'weight'}
+        assert 'cost_breakdown' in client.get(url).json()
+
+    def test_pagination_with_fields(self, client, sample_order, sample_booked_order):
+        response = client.get(reverse('courier:order-list'), {'fields': 'order_number', 'page_size': 1})
+        data = response.json()
+
+        assert data['results'] == [{'order_number': Order.objects.order_by('-created_at', '-id')[0].order_number}]
+        assert data['next']
+        assert len(client.get(data['next']).json()['results']) == 1
+
+    def test_unknown_field(self, client, sample_order):
+        response = client.get(reverse('courier:order-list'), {'fields': 'id,secret'})
+
+        assert response.status_code == 400
+        assert response.json() == {'fields': ['Unknown field(s): secret']}
+
+
+@pytest.mark.django_db
+def test_admin_orders_list_fields(client, admin_token, sample_booked_order):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse('courier:admin-orders-list'), {'fields': 'order_number,total_cost'},
+                              HTTP_X_ADMIN_TOKEN=admin_token)
+
+    assert response.status_code == 200
+    assert response.json()['orders'] == [{'order_number': sample_booked_order.order_number, 'total_cost': '150.00'}]
+    assert 'cost_breakdown' not in ' '.join(_order_selects(queries))
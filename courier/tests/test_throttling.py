@@ -0,0 +1,78 @@
+"""
+Tests for the in-memory sliding-window throttles (courier/throttling.py)
+"""
+import json
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+
+from courier.throttling import AnonSlidingWindowThrottle, SlidingWindowCounter, counter
+
+
+@pytest.fixture(autouse=True)
+def clean_counters():
+    counter.clear()
+    cache.clear()
+    yield
+    counter.clear()
+
+
+class TestSlidingWindowCounter:
+
+    def test_limit_within_window(self):
+        windows = SlidingWindowCounter()
+
+        assert [windows.hit('k', 3, 60, 10.0)[0] for _ in range(4)] == [True, True, True, False]
+        assert windows.hit('other', 3, 60, 10.0) == (True, None)
+
+    def test_previous_window_is_weighted(self):
+        windows = SlidingWindowCounter()
+        for _ in range(10):
+            windows.hit('k', 10, 60, 50.0)
+
+        # 15s into the next window 75% of the old hits still count
+        assert [windows.hit('k', 10, 60, 75.0)[0] for _ in range(4)] == [True, True, True, False]
+        # The next slot frees up once only 60% of them count, at 84s
+        assert windows.hit('k', 10, 60, 75.0)[1] == pytest.approx(9.0)
+        # 30s in only half of them count
+        assert [windows.hit('k', 10, 60, 90.0)[0] for _ in range(3)] == [True, True, False]
+
+    def test_wait_when_current_window_is_full(self):
+        windows = SlidingWindowCounter()
+        windows.hit('k', 1, 60, 10.0)
+
+        allowed, wait = windows.hit('k', 1, 60, 10.0)
+        assert not allowed
+        # 50s to the next window, then the old hit must fully age out
+        assert wait == pytest.approx(110.0)
+
+    def test_sync_shares_counts_between_processes(self):
+        worker_a, worker_b = SlidingWindowCounter(), SlidingWindowCounter()
+        for _ in range(3):
+            worker_a.hit('k', 5, 60, 10.0)
+        worker_a.sync('k', 10.0, 1)
+
+        worker_b.hit('k', 5, 60, 10.5)
+        worker_b.sync('k', 10.5, 1)
+
+        # Worker B now knows about worker A's 3 hits
+        assert [worker_b.hit('k', 5, 60, 11.0)[0] for _ in range(2)] == [True, False]
+
+
+@pytest.mark.django_db
+class TestAnonSlidingWindowThrottle:
+
+    @override_settings(COURIER_THROTTLE_SYNC_INTERVAL=0)
+    def test_compare_rates_is_throttled(self, client, sample_rate_request, monkeypatch):
+        monkeypatch.setattr(AnonSlidingWindowThrottle, 'THROTTLE_RATES', {'anon': '2/minute'})
+        url = reverse('courier:compare-rates')
+        statuses = [
+            client.post(url, data=json.dumps(sample_rate_request), content_type='application/json').status_code
+            for _ in range(3)
+        ]
+
+        assert 429 not in statuses[:2]
+        assert statuses[2] == 429
+        response = client.post(url, data=json.dumps(sample_rate_request), content_type='application/json')
+        assert int(response['Retry-After']) > 0
@@ -1,10 +1,173 @@
 """
 Custom throttling classes for rate limiting.
+
+The sliding-window throttles keep their counters in process memory instead
+of the Django cache, so checking a request costs a dict lookup under a lock
+rather than a cache read and a pickled history write (a file read/write
+with the production FileBasedCache). Each key holds two counters, the
+current and previous fixed window; the previous one is weighted by how
+much of it still overlaps the sliding window.
+
+Counters are per worker process. With COURIER_THROTTLE_SYNC_INTERVAL set
+(seconds, default 1), each worker also adds its new hits to a shared
+per-window counter in the default cache at most once per interval per key
+and adopts the shared total, so limits hold approximately across workers
+and nodes. Set it to 0 for purely local counting.
 """
-from rest_framework.throttling import UserRateThrottle
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+from courier.constants import CacheKeys
+
+logger = logging.getLogger('courier')
+
+# Seconds between sweeps of expired counters
+PRUNE_INTERVAL = 60
+
+
+class _Window:
+    __slots__ = ('index', 'current', 'previous', 'pending', 'synced_at', 'duration')
+
+    def __init__(self, index, duration):
+        self.index = index
+        self.current = 0
+        self.previous = 0
+        self.pending = 0  # Hits not yet added to the shared counter
+        self.synced_at = 0.0
+        self.duration = duration
+
+
+class SlidingWindowCounter:
+    """Thread-safe in-memory sliding-window counters, keyed like DRF cache keys."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._windows = {}
+        self._pruned_at = 0.0
+
+    def hit(self, key, limit, duration, now):
+        """
+        Count a request against ``key`` if it is within ``limit`` per ``duration``.
+
+        Returns:
+            tuple: (allowed, seconds to wait or None)
+        """
+        index, offset = divmod(now, duration)
+        index = int(index)
+        with self._lock:
+            window = self._advance(key, index, duration)
+            weight = 1 - offset / duration
+            if window.previous * weight + window.current >= limit:
+                return False, self._wait(window, limit, duration, offset)
+            window.current += 1
+            window.pending += 1
+            if now - self._pruned_at >= PRUNE_INTERVAL:
+                self._prune(now)
+        return True, None
+
+    def _advance(self, key, index, duration):
+        window = self._windows.get(key)
+        if window is None or window.duration != duration or window.index < index - 1:
+            window = self._windows[key] = _Window(index, duration)
+        elif window.index == index - 1:
+            window.index, window.previous, window.current = index, window.current, 0
+            window.pending = 0
+        return window
+
+    @staticmethod
+    def _wait(window, limit, duration, offset):
+        if window.current >= limit:
+            # Blocked until the next window, then by what is left of this one
+            return duration - offset + duration * (1 - (limit - 1) / window.current)
+        # Wait until the previous window's weight drops enough for one more request
+        needed_weight = (limit - 1 - window.current) / window.previous
+        return max(0.0, (1 - needed_weight) * duration - offset)
+
+    def _prune(self, now):
+        self._pruned_at = now
+        stale = [
+            key for key, window in self._windows.items()
+            if window.index < int(now // window.duration) - 1
+        ]
+        for key in stale:
+            del self._windows[key]
+
+    def sync(self, key, now, interval):
+        """
+        Exchange this process's new hits for ``key`` with the shared cache.
+
+        Adds pending hits to the shared counter for the current window and
+        raises the local count to the shared total. Cache failures are
+        logged and the local count is kept.
+        """
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window.synced_at < interval:
+                return
+            index, pending = window.index, window.pending
+            window.pending, window.synced_at = 0, now
+
+        cache_key = CacheKeys.THROTTLE_WINDOW.format(key, index)
+        try:
+            cache.add(cache_key, 0, window.duration * 2)
+            total = cache.incr(cache_key, pending) if pending else cache.get(cache_key, 0)
+        except Exception as e:
+            logger.warning(f"Throttle sync failed for {key}: {e}")
+            return
+
+        with self._lock:
+            if window.index == index and total > window.current:
+                window.current = total
+
+    def clear(self):
+        with self._lock:
+            self._windows.clear()
+
+
+counter = SlidingWindowCounter()
+
+
+class SlidingWindowThrottleMixin:
+    """
+    Replaces SimpleRateThrottle's cached request history with ``counter``.
+
+    Mix in before a SimpleRateThrottle subclass; rates, scopes and
+    ``get_cache_key`` behave as in DRF.
+    """
+    counter = counter
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        allowed, self._wait_seconds = self.counter.hit(self.key, self.num_requests, self.duration, now)
+        interval = getattr(settings, 'COURIER_THROTTLE_SYNC_INTERVAL', 1)
+        if interval:
+            self.counter.sync(self.key, now, interval)
+        return allowed
+
+    def wait(self):
+        return getattr(self, '_wait_seconds', None)
+
+
+class AnonSlidingWindowThrottle(SlidingWindowThrottleMixin, AnonRateThrottle):
+    """AnonRateThrottle ('anon' scope, keyed by client IP) on in-memory counters."""
+
+
+class UserSlidingWindowThrottle(SlidingWindowThrottleMixin, UserRateThrottle):
+    """UserRateThrottle ('user' scope) on in-memory counters."""
 
 
-class AdminRateThrottle(UserRateThrottle):
+class AdminRateThrottle(SlidingWindowThrottleMixin, UserRateThrottle):
     """
     Rate limiting for admin endpoints.
     More restrictive than regular user endpoints to prevent brute force attacks.
@@ -15,13 +15,23 @@ router.register(r'ftl-orders', views.FTLOrderViewSet, basename='ftl-order')
 urlpatterns = [
     # Public endpoints
     path('health', views.health_check, name='health'),
+    path('health/live', views.health_live, name='health-live'),
+    path('health/ready', views.health_ready, name='health-ready'),
     path('compare-rates', views.compare_rates, name='compare-rates'),
+    path('compare-rates/batch', views.compare_rates_batch, name='compare-rates-batch'),
     path('pincode/<int:pincode>/', views.lookup_pincode, name='lookup-pincode'),
+
+    # Async variants for uvicorn workers (config.asgi)
+    path('async/compare-rates', views.compare_rates_async, name='compare-rates-async'),
+    path('async/pincode/<int:pincode>/', views.lookup_pincode_async, name='lookup-pincode-async'),
     
     # FTL endpoints
     path('ftl/routes', views.get_ftl_routes, name='get-ftl-routes'),
     path('ftl/calculate-rate', views.calculate_ftl_rate, name='calculate-ftl-rate'),
 
+    # Before the router, which would read "invoices" as an order pk
+    path('orders/invoices/', views.bulk_invoices_zip, name='bulk-invoices'),
+
     # Order management (includes ViewSet routes)
     # IMPORTANT: Router must come BEFORE manual paths with <pk> to prevent action names being captured
     path('', include(router.urls)),
@@ -30,6 +40,8 @@ urlpatterns = [
     # Admin endpoints
     path('admin/rates', views.get_all_rates, name='admin-get-rates'),
     path('admin/rates/update', views.update_rates, name='admin-update-rates'),
+    path('admin/rates/import', views.import_rates, name='admin-import-rates'),
+    path('admin/rates/versions', views.rate_card_versions, name='admin-rate-card-versions'),
     path('admin/rates/add', views.add_carrier, name='admin-add-carrier'),
     path('admin/carriers/<str:carrier_name>/toggle-active', views.toggle_carrier_active, name='admin-toggle-carrier'),
     path('admin/carriers/<str:carrier_name>', views.delete_carrier, name='admin-delete-carrier'),
@@ -6,13 +6,19 @@ Re-exports all view functions and classes for URL routing.
 # Public API endpoints
 from .public import (
     health_check,
+    health_live,
+    health_ready,
     root_redirect,
     dashboard_view,
     rate_calculator_view,
     compare_rates,
+    compare_rates_batch,
     lookup_pincode,
 )
 
+# Async public endpoints (ASGI)
+from .public_async import compare_rates_async, lookup_pincode_async
+
 # Order management
 from .orders import OrderViewSet
 
@@ -20,6 +26,8 @@ from .orders import OrderViewSet
 from .admin import (
     get_all_rates,
     update_rates,
+    import_rates,
+    rate_card_versions,
     add_carrier,
     toggle_carrier_active,
     delete_carrier,
@@ -48,21 +56,28 @@ from .base import (
 )
 
 # Invoice generation
-from .invoices import generate_invoice_pdf
+from .invoices import generate_invoice_pdf, bulk_invoices_zip
 
 __all__ = [
     # Public
     'health_check',
+    'health_live',
+    'health_ready',
     'root_redirect',
     'dashboard_view',
     'rate_calculator_view',
     'compare_rates',
+    'compare_rates_batch',
     'lookup_pincode',
+    'compare_rates_async',
+    'lookup_pincode_async',
     # Orders
     'OrderViewSet',
     # Admin
     'get_all_rates',
     'update_rates',
+    'import_rates',
+    'rate_card_versions',
     'add_carrier',
     'toggle_carrier_active',
     'delete_carrier',
@@ -84,4 +99,5 @@ __all__ = [
     'calculate_ftl_price',
     # Invoices
     'generate_invoice_pdf',
+    'bulk_invoices_zip',
 ]
@@ -2,52 +2,129 @@
 Admin Views.
 Contains admin endpoints for rate card management.
 """
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.response import Response
 from rest_framework import status
-import json
-import os
-import shutil
+from rest_framework.exceptions import ValidationError
+from django.db.models import ProtectedError
 
 from courier.permissions import IsAdminToken
-from courier.serializers import NewCarrierSerializer, OrderSerializer, FTLOrderSerializer
-from courier.models import Order, FTLOrder
-from .base import (
-    load_rates, invalidate_rates_cache, logger,
-    RATE_CARD_PATH
+from courier.serializers import (
+    NewCarrierSerializer, OrderSerializer, FTLOrderSerializer, RateCardVersionPublishSerializer
 )
+from courier.models import Order, FTLOrder, SystemConfig
+from courier.exceptions import RateCardImportError
+from courier.renderers import FAST_RENDERER_CLASSES
+from courier.pagination import AdminKeysetPagination
+from courier.rate_import import (
+    RateCardImporter, export_rate_cards, update_carrier_rate_card, delete_carrier_rate_card
+)
+from courier.rate_versions import publish_rate_card_version, get_active_version_id, draft_warning
+from .base import load_rates, invalidate_rates_cache, conditional_get, logger
+
+
+def _rates_etag(request):
+    # Bumped on every carrier, rate table or system config change
+    return f'"rates-{SystemConfig.get_rate_card_version()}"'
+
+
+def _with_draft_warning(data):
+    """Tell the caller when a published rate card version keeps this edit out of quotes"""
+    warning = draft_warning()
+    if warning:
+        data["warning"] = warning
+    return data
 
 
 @api_view(['GET'])
 @permission_classes([IsAdminToken])
+@conditional_get(_rates_etag, private=True, no_cache=True)
 def get_all_rates(request):
-    """Get all carrier rates"""
-    with open(RATE_CARD_PATH, "r") as f:
-        return Response(json.load(f))
+    """Get all carrier rates (active and inactive) as an importable document"""
+    return Response(export_rate_cards())
+
+
+def _run_rate_card_import(carriers, dry_run=False, deactivate_missing=False):
+    """Run the bulk importer and shape its outcome as an API response"""
+    try:
+        summary = RateCardImporter(carriers, deactivate_missing=deactivate_missing).run(dry_run=dry_run)
+    except RateCardImportError as e:
+        logger.warning(f"ADMIN_ACTION: Rate card import rejected: {e.details['errors']}")
+        return Response(
+            {"detail": e.message, "errors": e.details["errors"]},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    except Exception as e:
+        logger.error(f"ADMIN_ERROR: Rate card import failed: {str(e)}")
+        return Response(
+            {"detail": f"Rate card import failed: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    if not dry_run:
+        invalidate_rates_cache()
+        return Response(_with_draft_warning({"status": "success", **summary}))
+    return Response({"status": "success", **summary})
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminToken])
+def import_rates(request):
+    """
+    Bulk import a rate card document into the database.
+
+    Body is either the carrier list itself or
+    {"carriers": [...], "dry_run": bool, "deactivate_missing": bool}.
+    """
+    payload = request.data
+    if isinstance(payload, dict):
+        return _run_rate_card_import(
+            payload.get("carriers"),
+            dry_run=bool(payload.get("dry_run", False)),
+            deactivate_missing=bool(payload.get("deactivate_missing", False)),
+        )
+    return _run_rate_card_import(payload)
 
 
 @api_view(['POST'])
 @permission_classes([IsAdminToken])
 def update_rates(request):
-    """Update carrier rates"""
-    try:
-        new_data = request.data
+    """Replace carrier rates; carriers missing from the document are deactivated"""
+    response = _run_rate_card_import(request.data, deactivate_missing=True)
+    if response.status_code == status.HTTP_200_OK:
+        logger.info("ADMIN_ACTION: Rates updated successfully.")
+        response.data["message"] = "Rates updated successfully"
+    return response
 
-        if os.path.exists(RATE_CARD_PATH):
-            shutil.copy(RATE_CARD_PATH, RATE_CARD_PATH + ".bak")
 
-        with open(RATE_CARD_PATH, "w") as f:
-            json.dump(new_data, f, indent=4)
+@api_view(['GET', 'POST'])
+@permission_classes([IsAdminToken])
+def rate_card_versions(request):
+    """
+    List published rate card versions, or publish the current rates as a new one.
 
-        logger.info("ADMIN_ACTION: Rates updated successfully.")
-        invalidate_rates_cache()  # Clear cache after update
-        return Response({"status": "success", "message": "Rates updated successfully"})
-    except Exception as e:
-        logger.error(f"ADMIN_ERROR: Failed to update rates: {str(e)}")
-        return Response(
-            {"detail": f"Failed to update rates: {str(e)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+    POST body: {"effective_from": ISO datetime (default now), "notes": str}
+    """
+    from courier.models import RateCardVersion
+
+    if request.method == 'POST':
+        serializer = RateCardVersionPublishSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        version = publish_rate_card_version(
+            effective_from=serializer.validated_data.get('effective_from'),
+            notes=serializer.validated_data.get('notes', ''),
         )
+        logger.info(f"ADMIN_ACTION: Rate card version {version.pk} published")
+        return Response({
+            "status": "success",
+            "id": version.pk,
+            "effective_from": version.effective_from,
+            "source_version": version.source_version,
+        }, status=status.HTTP_201_CREATED)
+
+    active_id = get_active_version_id()
+    versions = RateCardVersion.objects.values('id', 'effective_from', 'source_version', 'notes', 'created_at')
+    return Response([dict(v, active=v['id'] == active_id) for v in versions])
 
 
 @api_view(['POST'])
@@ -110,7 +187,7 @@ def add_carrier(request):
         logger.info(f"ADMIN_ACTION: New carrier added to DB: {courier.name}")
         invalidate_rates_cache()
         
-        return Response({
+        return Response(_with_draft_warning({
             "status": "success",
             "message": f"Carrier '{courier.name}' added successfully",
             "carrier": {
@@ -118,7 +195,7 @@ def add_carrier(request):
                 "name": courier.name,
                 "mode": courier.carrier_mode
             }
-        }, status=status.HTTP_201_CREATED)
+        }), status=status.HTTP_201_CREATED)
 
     except Exception as e:
         logger.error(f"ADMIN_ERROR: Failed to add carrier: {str(e)}")
@@ -132,6 +209,8 @@ def add_carrier(request):
 @permission_classes([IsAdminToken])
 def toggle_carrier_active(request, carrier_name):
     """Toggle carrier active/inactive status"""
+    from courier.models import Courier
+
     active = request.data.get('active')
 
     if active is None:
@@ -141,38 +220,24 @@ def toggle_carrier_active(request, carrier_name):
         )
 
     try:
-        # Load existing rates
-        carriers = load_rates()
-
-        # Find and update the carrier
-        carrier_found = False
-        for carrier in carriers:
-            if carrier.get("carrier_name") == carrier_name:
-                carrier["active"] = active
-                carrier_found = True
-                break
-
-        if not carrier_found:
+        courier = Courier.objects.filter(name=carrier_name).first()
+        if courier is None:
             return Response(
                 {"detail": f"Carrier '{carrier_name}' not found"},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        # Backup and save
-        if os.path.exists(RATE_CARD_PATH):
-            shutil.copy(RATE_CARD_PATH, RATE_CARD_PATH + ".bak")
-
-        with open(RATE_CARD_PATH, "w") as f:
-            json.dump(carriers, f, indent=4)
+        # Signals invalidate the rate card cache and bump the version
+        courier.is_active = bool(active)
+        courier.save(update_fields=['is_active', 'updated_at'])
 
         logger.info(f"ADMIN_ACTION: Carrier '{carrier_name}' {'activated' if active else 'deactivated'}")
-        invalidate_rates_cache()  # Clear cache after update
-        return Response({
+        return Response(_with_draft_warning({
             "status": "success",
             "message": f"Carrier '{carrier_name}' {'activated' if active else 'deactivated'}",
             "carrier_name": carrier_name,
             "active": active
-        })
+        }))
 
     except Exception as e:
         logger.error(f"ADMIN_ERROR: Failed to toggle carrier status: {str(e)}")
@@ -185,36 +250,32 @@ def toggle_carrier_active(request, carrier_name):
 @api_view(['DELETE'])
 @permission_classes([IsAdminToken])
 def delete_carrier(request, carrier_name):
-    """Delete a carrier from rate cards"""
-    try:
-        # Load existing rates
-        carriers = load_rates()
-
-        # Filter out the carrier
-        initial_count = len(carriers)
-        carriers = [c for c in carriers if c.get("carrier_name") != carrier_name]
+    """Delete a carrier and its rate tables"""
+    from courier.models import Courier
 
-        if len(carriers) == initial_count:
+    try:
+        courier = Courier.objects.filter(name=carrier_name).first()
+        if courier is None:
             return Response(
                 {"detail": f"Carrier '{carrier_name}' not found"},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        # Backup and save
-        if os.path.exists(RATE_CARD_PATH):
-            shutil.copy(RATE_CARD_PATH, RATE_CARD_PATH + ".bak")
-
-        with open(RATE_CARD_PATH, "w") as f:
-            json.dump(carriers, f, indent=4)
+        delete_carrier_rate_card(courier)
 
         logger.info(f"ADMIN_ACTION: Carrier '{carrier_name}' deleted")
         invalidate_rates_cache()  # Clear cache after update
-        return Response({
+        return Response(_with_draft_warning({
             "status": "success",
             "message": f"Carrier '{carrier_name}' deleted successfully",
-            "remaining_carriers": len(carriers)
-        })
+            "remaining_carriers": Courier.objects.count()
+        }))
 
+    except ProtectedError:
+        return Response(
+            {"detail": f"Carrier '{carrier_name}' has orders and cannot be deleted; deactivate it instead."},
+            status=status.HTTP_409_CONFLICT
+        )
     except Exception as e:
         logger.error(f"ADMIN_ERROR: Failed to delete carrier: {str(e)}")
         return Response(
@@ -227,48 +288,35 @@ def delete_carrier(request, carrier_name):
 @permission_classes([IsAdminToken])
 def update_carrier(request, carrier_name):
     """Update carrier details"""
-    try:
-        # Load existing rates
-        carriers = load_rates()
-
-        # Find the carrier
-        carrier_found = False
-        carrier_index = None
-        for i, carrier in enumerate(carriers):
-            if carrier.get("carrier_name") == carrier_name:
-                carrier_found = True
-                carrier_index = i
-                break
-
-        if not carrier_found:
-            return Response(
-                {"detail": f"Carrier '{carrier_name}' not found"},
-                status=status.HTTP_404_NOT_FOUND
-            )
+    from courier.models import Courier
 
+    try:
         # Validate the update data with serializer (partial update)
         serializer = NewCarrierSerializer(data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        update_data = serializer.validated_data
-
-        # Update the carrier
-        carriers[carrier_index].update(update_data)
 
-        # Backup and save
-        if os.path.exists(RATE_CARD_PATH):
-            shutil.copy(RATE_CARD_PATH, RATE_CARD_PATH + ".bak")
-
-        with open(RATE_CARD_PATH, "w") as f:
-            json.dump(carriers, f, indent=4)
+        carrier = update_carrier_rate_card(carrier_name, serializer.validated_data)
 
         logger.info(f"ADMIN_ACTION: Carrier '{carrier_name}' updated")
         invalidate_rates_cache()  # Clear cache after update
-        return Response({
+        return Response(_with_draft_warning({
             "status": "success",
             "message": f"Carrier '{carrier_name}' updated successfully",
-            "carrier": carriers[carrier_index]
-        })
+            "carrier": carrier
+        }))
 
+    except Courier.DoesNotExist:
+        return Response(
+            {"detail": f"Carrier '{carrier_name}' not found"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    except RateCardImportError as e:
+        return Response(
+            {"detail": e.message, "errors": e.details["errors"]},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    except ValidationError:
+        raise
     except Exception as e:
         logger.error(f"ADMIN_ERROR: Failed to update carrier: {str(e)}")
         return Response(
@@ -279,56 +327,53 @@ def update_carrier(request, carrier_name):
 
 @api_view(['GET'])
 @permission_classes([IsAdminToken])
+@renderer_classes(FAST_RENDERER_CLASSES)
 def admin_orders_list(request):
-    """Get all orders for admin dashboard with filtering"""
-    from courier.models import Order
-    from courier.serializers import OrderSerializer
-    from django.db.models import Sum, Count
+    """
+    Get orders for admin dashboard with filtering, newest first.
+
+    Query params: status, carrier, limit (page size, default 100), cursor
+    (from "next"), count (none, estimate - the default - or exact) and
+    fields / exclude (comma-separated OrderSerializer fields).
+    """
+    fields, exclude = OrderSerializer.parse_fieldset(request.query_params)
+    queryset = OrderSerializer.sparse_queryset(Order.objects.all(), fields, exclude)
 
-    # Get query params
     status_filter = request.query_params.get('status')
     carrier_filter = request.query_params.get('carrier')
-    limit = int(request.query_params.get('limit', 100))
-
-    # Build queryset
-    queryset = Order.objects.all().order_by('-created_at')
-
     if status_filter:
         queryset = queryset.filter(status=status_filter)
     if carrier_filter:
         queryset = queryset.filter(carrier__name=carrier_filter)
 
-    # Get orders
-    orders = queryset[:limit]
+    paginator = AdminKeysetPagination()
+    orders = paginator.paginate_queryset(queryset, request)
 
     return Response({
-        "count": queryset.count(),
-        "orders": OrderSerializer(orders, many=True).data
+        **paginator.get_page_metadata(),
+        "orders": OrderSerializer(orders, many=True, fields=fields, exclude=exclude).data
     })
 
 
 @api_view(['GET'])
 @permission_classes([IsAdminToken])
 def admin_ftl_orders_list(request):
-    """Get all FTL orders for admin dashboard"""
-    from courier.models import FTLOrder
-    from courier.serializers import FTLOrderSerializer
-
-    # Get query params
-    status_filter = request.query_params.get('status')
-    limit = int(request.query_params.get('limit', 100))
+    """
+    Get FTL orders for admin dashboard, newest first.
 
-    # Build queryset
-    queryset = FTLOrder.objects.all().order_by('-created_at')
+    Query params: status, limit, cursor and count, as for admin_orders_list.
+    """
+    queryset = FTLOrder.objects.all()
 
+    status_filter = request.query_params.get('status')
     if status_filter:
         queryset = queryset.filter(status=status_filter)
 
-    # Get orders
-    orders = queryset[:limit]
+    paginator = AdminKeysetPagination()
+    orders = paginator.paginate_queryset(queryset, request)
 
     return Response({
-        "count": queryset.count(),
+        **paginator.get_page_metadata(),
         "orders": FTLOrderSerializer(orders, many=True).data
     })
 
@@ -340,10 +385,12 @@ def admin_dashboard_stats(request):
     from courier.models import Order, FTLOrder, OrderStatus
     from django.db.models import Sum, Count
     from django.utils import timezone
-    from datetime import timedelta
+    from datetime import datetime, time, timedelta
 
-    today = timezone.now().date()
-    last_30_days = today - timedelta(days=30)
+    today = timezone.localdate()
+    # Compare against a datetime, not __date: wrapping the column in a
+    # date cast would stop the created_at / booked_at indexes being used
+    last_30_days = datetime.combine(today - timedelta(days=30), time.min, tzinfo=timezone.get_current_timezone())
 
     # Order stats
     order_stats = Order.objects.aggregate(
@@ -372,12 +419,12 @@ def admin_dashboard_stats(request):
 
     # Recent activity (last 30 days)
     recent_orders = Order.objects.filter(
-        created_at__date__gte=last_30_days
+        created_at__gte=last_30_days
     ).count()
 
     recent_booked = Order.objects.filter(
         status=OrderStatus.BOOKED,
-        booked_at__date__gte=last_30_days
+        booked_at__gte=last_30_days
     ).count()
 
     # Active carriers
@@ -10,10 +10,14 @@ from rest_framework.throttling import AnonRateThrottle
 from django.conf import settings
 from django.utils import timezone
 from django.core.cache import cache
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition
 import json
 import os
 import shutil
 import logging
+from datetime import datetime, timezone as dt_timezone
+from functools import wraps
 
 from courier.serializers import (
     OrderSerializer, OrderUpdateSerializer, RateRequestSerializer,
@@ -25,6 +29,10 @@ from courier.permissions import IsAdminToken
 from courier.engine import calculate_cost
 from courier.zones import get_zone_column, PINCODE_LOOKUP
 from courier.models import Order, OrderStatus, PaymentMode, FTLOrder, Courier, SystemConfig
+from courier.constants import CacheKeys
+from courier.snapshot import FTL_RATES_PATH, RateCardSnapshot, build_snapshot, get_boot_snapshot
+from courier.rate_versions import get_active_version_snapshot
+from courier.order_numbers import allocate_order_numbers, allocate_ftl_order_numbers
 
 
 logger = logging.getLogger('courier')
@@ -32,58 +40,93 @@ logger = logging.getLogger('courier')
 # Path configurations
 BASE_DIR = settings.BASE_DIR
 RATE_CARD_PATH = os.path.join(BASE_DIR, "courier", "data", "master_card.json")
-FTL_RATES_PATH = os.path.join(BASE_DIR, "courier", "data", "ftl_rates.json")
 
 
-def load_rates():
+def get_rate_snapshot():
     """
-    Load rate cards with caching for performance.
+    Return the current RateCardSnapshot with caching for performance.
     Cache timeout: 5 minutes (300 seconds).
+
+    Once a rate card version has been published, the version in effect
+    is returned instead (immutable, cached in-process). Before that, on a
+    cache miss the snapshot loaded at boot is used if it is still current,
+    otherwise the rate cards are compiled from the DB.
     """
-    CACHE_KEY = 'carrier_rate_cards'
     CACHE_TIMEOUT = 300  # 5 minutes
-    
+
+    version_snapshot = get_active_version_snapshot()
+    if version_snapshot is not None:
+        return version_snapshot
+
     # Try to get from cache first
-    rates = cache.get(CACHE_KEY)
-    if rates is not None:
-        return rates
-    
+    snapshot = cache.get(CacheKeys.CARRIER_RATE_CARDS)
+    if isinstance(snapshot, RateCardSnapshot):
+        return snapshot
+
+    boot_snapshot = get_boot_snapshot()
+    if boot_snapshot is not None:
+        cache.set(CacheKeys.CARRIER_RATE_CARDS, boot_snapshot, CACHE_TIMEOUT)
+        return boot_snapshot
+
     # Cache miss - load from DB
     try:
-        couriers = Courier.objects.filter(is_active=True).prefetch_related(
-            'city_routes', 'delivery_slabs', 'custom_zones', 'custom_zone_rates'
-        )
-        rates = [c.get_rate_dict() for c in couriers]
-        
-        if not rates:
+        snapshot = build_snapshot()
+
+        if not snapshot.carriers:
             logger.warning("No active couriers found in database")
-            
+
         # Store in cache
-        cache.set(CACHE_KEY, rates, CACHE_TIMEOUT)
-        logger.info(f"Rate cards loaded from DB and cached ({len(rates)} carriers)")
-        return rates
+        cache.set(CacheKeys.CARRIER_RATE_CARDS, snapshot, CACHE_TIMEOUT)
+        logger.info(f"Rate cards loaded from DB and cached ({len(snapshot)} carriers)")
+        return snapshot
 
     except Exception as e:
         logger.error(f"Unexpected error loading rate cards from DB: {e}")
-        return []
+        return RateCardSnapshot(carriers=[])
+
+
+def load_rates():
+    """
+    Load rate cards with caching for performance.
+    Cache timeout: 5 minutes (300 seconds).
+    """
+    return get_rate_snapshot().carriers
+
+
+def get_ftl_rates_version():
+    """Modification time (ns) of the FTL rates file, or None if it is missing."""
+    try:
+        return os.stat(FTL_RATES_PATH).st_mtime_ns
+    except OSError:
+        return None
 
 
 def load_ftl_rates():
     """
     Load FTL rates from JSON file with caching.
     Cache timeout: 5 minutes (300 seconds).
+
+    The cached copy is tagged with the file's mtime and reloaded as soon as
+    the file changes, so responses always match get_ftl_rates_version().
     """
-    CACHE_KEY = 'ftl_rate_cards'
     CACHE_TIMEOUT = 300  # 5 minutes
-    
+
+    source_version = get_ftl_rates_version()
+
     # Try to get from cache first
-    rates = cache.get(CACHE_KEY)
-    if rates is not None:
-        return rates
-    
+    cached = cache.get(CacheKeys.FTL_RATE_CARDS)
+    if isinstance(cached, tuple) and cached[0] == source_version:
+        return cached[1]
+
+    # The boot snapshot carries the FTL table as long as the file is unchanged
+    boot_snapshot = get_boot_snapshot()
+    if boot_snapshot is not None and boot_snapshot.ftl_is_current(FTL_RATES_PATH):
+        cache.set(CacheKeys.FTL_RATE_CARDS, (boot_snapshot.ftl_source_mtime, boot_snapshot.ftl_rates), CACHE_TIMEOUT)
+        return boot_snapshot.ftl_rates
+
     # Cache miss - load from file
     try:
-        if not os.path.exists(FTL_RATES_PATH):
+        if source_version is None:
             logger.warning(f"FTL rates file not found at {FTL_RATES_PATH}")
             return {}
         
@@ -91,7 +134,7 @@ def load_ftl_rates():
             rates = json.load(f)
         
         # Store in cache
-        cache.set(CACHE_KEY, rates, CACHE_TIMEOUT)
+        cache.set(CacheKeys.FTL_RATE_CARDS, (source_version, rates), CACHE_TIMEOUT)
         logger.info("FTL rates loaded and cached")
         return rates
         
@@ -103,64 +146,56 @@ def load_ftl_rates():
         return {}
 
 
+def conditional_get(etag_func, last_modified_func=None, **cache_control):
+    """
+    HTTP conditional caching for a read-mostly GET view.
+
+    Adds ETag/Last-Modified from the given callables (which get the view's
+    arguments and should derive them from data versions, not the response
+    body), answers matching If-None-Match/If-Modified-Since with 304, and
+    sets Cache-Control on 200/304 responses.
+
+    Apply it directly on the view function, below @api_view and the
+    permission decorators, so DRF authenticates before any 304 is sent.
+    """
+    def decorator(view):
+        conditional_view = condition(etag_func=etag_func, last_modified_func=last_modified_func)(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                patch_cache_control(response, **cache_control)
+                # JSON and the browsable API share a URL (and version)
+                patch_vary_headers(response, ['Accept'])
+            return response
+        return wrapper
+    return decorator
+
+
+def version_timestamp(timestamp):
+    """Aware datetime for a Unix timestamp (for last_modified_func)."""
+    return datetime.fromtimestamp(timestamp, tz=dt_timezone.utc) if timestamp is not None else None
+
+
 def invalidate_rates_cache():
     """
     Invalidate all rate-related caches.
     Call this after updating rate cards via admin endpoints.
     """
-    cache.delete('carrier_rate_cards')
-    cache.delete('ftl_rate_cards')
+    cache.delete(CacheKeys.CARRIER_RATE_CARDS)
+    cache.delete(CacheKeys.FTL_RATE_CARDS)
     logger.info("Rate card caches invalidated")
 
 
 def generate_order_number():
     """Generate unique order number"""
-    today = timezone.now()
-    prefix = f"ORD-{today.year}-"
-
-    # Get the latest order number for today
-    latest_order = (
-        Order.objects
-        .filter(order_number__startswith=prefix)
-        .order_by('-id')
-        .first()
-    )
-
-    if latest_order:
-        try:
-            last_num = int(latest_order.order_number.split("-")[-1])
-            new_num = last_num + 1
-        except (ValueError, IndexError):
-            new_num = 1001
-    else:
-        new_num = 1001
-
-    return f"{prefix}{new_num}"
+    return allocate_order_numbers(1)[0]
 
 
 def generate_ftl_order_number():
     """Generate unique FTL order number"""
-    today = timezone.now()
-    prefix = f"FTL-{today.year}-"
-
-    # Get the latest FTL order number for today
-    latest_order = (
-        FTLOrder.objects
-        .filter(order_number__startswith=prefix)
-        .order_by('-id')
-        .first()
-    )
-
-    if latest_order:
-        try:
-            last_num = int(latest_order.order_number.split("-")[-1])
-            new_num = last_num + 1
-        except (ValueError, IndexError):
-            new_num = 1001
-    else:
-        new_num = 1001
-
-    return f"{prefix}{new_num}"
+    return allocate_ftl_order_numbers(1)[0]
 
 
 def calculate_ftl_price(base_price):
@@ -3,20 +3,35 @@ FTL (Full Truck Load) Views.
 Contains FTL order management and rate calculation endpoints.
 """
 from rest_framework import viewsets, status, serializers as drf_serializers
-from rest_framework.decorators import api_view, action, permission_classes
+from rest_framework.decorators import api_view, action, permission_classes, renderer_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from django.utils import timezone
 
 from courier.models import FTLOrder, OrderStatus
 from courier.serializers import FTLOrderSerializer, FTLRateRequestSerializer
+from courier.renderers import FAST_RENDERER_CLASSES
+from courier.pagination import KeysetPagination
 from .base import (
-    load_ftl_rates, calculate_ftl_price, generate_ftl_order_number, logger
+    load_ftl_rates, calculate_ftl_price, generate_ftl_order_number, logger,
+    conditional_get, get_ftl_rates_version, version_timestamp
 )
 
 
+def _ftl_routes_etag(request):
+    version = get_ftl_rates_version()
+    return f'"ftl-{version}"' if version is not None else None
+
+
+def _ftl_routes_last_modified(request):
+    version = get_ftl_rates_version()
+    return version_timestamp(version / 1e9 if version is not None else None)
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@renderer_classes(FAST_RENDERER_CLASSES)
+@conditional_get(_ftl_routes_etag, _ftl_routes_last_modified, public=True, max_age=300)
 def get_ftl_routes(request):
     """Get all available FTL routes (source and destination cities)"""
     ftl_rates = load_ftl_rates()
@@ -81,6 +96,7 @@ class FTLOrderViewSet(viewsets.ModelViewSet):
     queryset = FTLOrder.objects.all()
     serializer_class = FTLOrderSerializer
     permission_classes = [AllowAny]
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
         queryset = FTLOrder.objects.all()
@@ -92,7 +108,7 @@ class FTLOrderViewSet(viewsets.ModelViewSet):
             except ValueError:
                 pass
         
-        return queryset.order_by('-created_at')
+        return queryset.order_by('-created_at', '-id')
     
     def create(self, request, *args, **kwargs):
         """Create a new FTL order"""
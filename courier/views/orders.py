@@ -2,8 +2,10 @@
 Order Management Views.
 Contains OrderViewSet for CRUD operations on orders.
 """
+import msgspec
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.parsers import BaseParser, MultiPartParser
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from django.utils import timezone
@@ -15,6 +17,22 @@ from courier.serializers import (
 from courier.engine import calculate_cost
 from .base import load_rates, generate_order_number
 from courier.services import CarrierService, BookingService
+from courier.renderers import FAST_RENDERER_CLASSES, FAST_DEFAULT_PARSER_CLASSES, MsgspecJSONParser
+from courier.pagination import KeysetPagination
+from courier.exceptions import OrderImportError
+from courier.order_import import OrderImporter, read_csv
+
+
+class CSVParser(BaseParser):
+    """Raw ``text/csv`` request bodies, passed on as bytes."""
+    media_type = 'text/csv'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return stream.read() if stream is not None else b''
+
+
+def _truthy(value):
+    return str(value).lower() in ('1', 'true', 'yes')
 
 
 
@@ -23,23 +41,43 @@ class OrderViewSet(viewsets.ModelViewSet):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
     permission_classes = [AllowAny]
+    renderer_classes = FAST_RENDERER_CLASSES
+    parser_classes = FAST_DEFAULT_PARSER_CLASSES
+    pagination_class = KeysetPagination
 
     def get_serializer_class(self):
         if self.action == 'partial_update' or self.action == 'update':
             return OrderUpdateSerializer
         return OrderSerializer
 
+    def get_fieldset(self):
+        """(fields, exclude) from ?fields= / ?exclude= on list and retrieve, else (None, None)."""
+        if self.action not in ('list', 'retrieve'):
+            return None, None
+        if not hasattr(self, '_fieldset'):
+            self._fieldset = OrderSerializer.parse_fieldset(self.request.query_params)
+        return self._fieldset
+
+    def get_serializer(self, *args, **kwargs):
+        fields, exclude = self.get_fieldset()
+        if fields is not None or exclude:
+            kwargs.update(fields=fields, exclude=exclude)
+        return super().get_serializer(*args, **kwargs)
+
     def get_queryset(self):
         queryset = Order.objects.all()
         status_param = self.request.query_params.get('status')
+        carrier_param = self.request.query_params.get('carrier')
 
         if status_param:
             try:
                 queryset = queryset.filter(status=status_param)
             except ValueError:
                 pass
+        if carrier_param:
+            queryset = queryset.filter(carrier__name=carrier_param)
 
-        return queryset.order_by('-created_at')
+        return OrderSerializer.sparse_queryset(queryset.order_by('-created_at', '-id'), *self.get_fieldset())
 
     def create(self, request, *args, **kwargs):
         """Create a new order"""
@@ -111,17 +149,20 @@ class OrderViewSet(viewsets.ModelViewSet):
         return Response({
             "orders": [
                 {
-                    "id": order.id,
-                    "order_number": order.order_number,
-                    "recipient_name": order.recipient_name,
-                    "weight": order.applicable_weight or order.weight
+                    "id": order["id"],
+                    "order_number": order["order_number"],
+                    "recipient_name": order["recipient_name"],
+                    "weight": order["applicable_weight"] or order["weight"]
                 }
                 for order in result["orders"]
             ],
+            "lanes": result["lanes"],
             "carriers": result["carriers"],
+            "assignment": result["assignment"],
             "source_pincode": result["source_pincode"],
             "dest_pincode": result["dest_pincode"],
-            "total_weight": result["total_weight"]
+            "total_weight": result["total_weight"],
+            "rate_card_version_id": result["rate_card_version_id"]
         })
 
 
@@ -138,7 +179,8 @@ class OrderViewSet(viewsets.ModelViewSet):
             result = BookingService.book_orders(
                 order_ids=data['order_ids'],
                 carrier_name=data['carrier_name'],
-                mode=data['mode']
+                mode=data['mode'],
+                rate_card_version_id=data.get('rate_card_version_id')
             )
             return Response(result)
             
@@ -149,6 +191,50 @@ class OrderViewSet(viewsets.ModelViewSet):
             )
 
 
+    @action(detail=False, methods=['post'], url_path='bulk',
+            parser_classes=[MsgspecJSONParser, CSVParser, MultiPartParser])
+    def bulk_import(self, request):
+        """
+        Create many DRAFT orders from one CSV or JSON upload.
+
+        Body: a JSON list of orders, {"orders": [...], "dry_run": bool,
+        "atomic": bool}, a text/csv body, or a multipart "file" (.csv or
+        .json). dry_run and atomic can also be query parameters. Valid rows
+        are created and invalid ones reported, unless atomic is set.
+        """
+        payload = request.data
+        options = payload if isinstance(payload, dict) and 'orders' in payload else request.query_params
+        try:
+            if isinstance(payload, bytes):
+                rows = read_csv(payload)
+            elif 'file' in request.FILES:
+                upload = request.FILES['file']
+                if upload.name.lower().endswith('.json'):
+                    try:
+                        rows = msgspec.json.decode(upload.read())
+                    except msgspec.DecodeError as e:
+                        raise OrderImportError(f"could not parse JSON: {e}")
+                else:
+                    rows = read_csv(upload.read())
+            elif isinstance(payload, dict):
+                rows = payload.get('orders')
+            else:
+                rows = payload
+            report = OrderImporter(rows).run(
+                dry_run=_truthy(options.get('dry_run', False)),
+                atomic=_truthy(options.get('atomic', False)),
+            )
+        except OrderImportError as e:
+            return Response({"detail": e.message}, status=status.HTTP_400_BAD_REQUEST)
+
+        if report["created"]:
+            response_status = status.HTTP_201_CREATED
+        elif report["failed"] and not report["dry_run"]:
+            response_status = status.HTTP_400_BAD_REQUEST
+        else:
+            response_status = status.HTTP_200_OK
+        return Response(report, status=response_status)
+
     @action(detail=True, methods=['post'], url_path='cancel')
     def cancel_order(self, request, pk=None):
         """
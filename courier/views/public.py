@@ -2,37 +2,74 @@
 Public API Views.
 Contains health check, rate comparison, and pincode lookup endpoints.
 """
-from rest_framework.decorators import api_view, permission_classes, throttle_classes
+from rest_framework.decorators import (
+    api_view, authentication_classes, permission_classes, throttle_classes,
+    renderer_classes, parser_classes
+)
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-from rest_framework.throttling import AnonRateThrottle
+from rest_framework.exceptions import ValidationError
 from rest_framework import status
+from django.http import StreamingHttpResponse
 from django.shortcuts import render, redirect
 
 from .base import (
     load_rates, logger, RateRequestSerializer,
-    get_zone_column, PINCODE_LOOKUP, calculate_cost
+    get_zone_column, PINCODE_LOOKUP, calculate_cost,
+    conditional_get, version_timestamp
 )
 from django.conf import settings
-from courier.serializers import RateRequestSerializer
+from courier.serializers import RateBatchSerializer, validate_rate_request, validate_shipment
+from courier.models import SystemConfig
 from courier.engine import calculate_cost
-from courier.zones import get_zone_column, PINCODE_LOOKUP
+from courier.zones import get_zone_column, PINCODE_LOOKUP, PINCODE_DATA_MTIME
 from courier.exceptions import InvalidWeightError, CourierError
+from courier.snapshot import filter_by_mode, system_config_dict
+from courier.health import get_readiness_report
+from courier.throttling import AnonSlidingWindowThrottle
+from courier.renderers import FAST_RENDERER_CLASSES, FAST_PARSER_CLASSES, encoder as json_encoder
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def health_check(request):
-    """Health check endpoint for monitoring"""
+    """Health check endpoint for monitoring (summary of the readiness report)"""
+    checks = get_readiness_report()["checks"]
+    rate_cards = checks["rate_cards"]
     return Response({
         "status": "healthy",
-        "pincode_db_loaded": len(PINCODE_LOOKUP) > 0,
-        "pincode_count": len(PINCODE_LOOKUP),
-        "rate_cards_loaded": len(load_rates()) > 0,
-        "rate_card_count": len(load_rates())
+        "pincode_db_loaded": checks["pincode_index"]["ok"],
+        "pincode_count": checks["pincode_index"]["count"],
+        "rate_cards_loaded": rate_cards.get("loaded", False),
+        "rate_card_count": rate_cards.get("carrier_count", 0)
     })
 
 
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+@throttle_classes([])
+def health_live(request):
+    """Liveness probe: the process is up and serving requests. Does no I/O."""
+    return Response({"status": "alive"})
+
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+@throttle_classes([])
+def health_ready(request):
+    """
+    Readiness probe: database, pincode index, region store and rate cards.
+
+    Returns 503 until the instance can serve quotes. The report is cached
+    for a few seconds and never loads rate cards itself.
+    """
+    report = get_readiness_report()
+    response_status = status.HTTP_200_OK if report["status"] == "ready" else status.HTTP_503_SERVICE_UNAVAILABLE
+    return Response(report, status=response_status)
+
+
 def dashboard_view(request):
     """Render the main dashboard (Django template)"""
     return render(request, 'dashboard.html', {'section': 'dashboard'})
@@ -50,50 +87,44 @@ def root_redirect(request):
     return redirect('/dashboard/')
 
 
-@api_view(['POST'])
-@throttle_classes([AnonRateThrottle])
-@permission_classes([AllowAny])
-def compare_rates(request):
-    """Compare shipping rates across carriers"""
-    serializer = RateRequestSerializer(data=request.data)
-    serializer.is_valid(raise_exception=True)
-    data = serializer.validated_data
+def _volumetric_divisor():
+    try:
+        # Load Volumetric Divisor from Config
+        return settings.COURIER_BUSINESS_RULES.get('VOLUMETRIC_DIVISOR', 5000)
+    except Exception:
+        return 5000 # Fallback
 
-    zone_key, zone_label = get_zone_column(
-        data['source_pincode'],
-        data['dest_pincode']
-    )
 
-    # Calculate Total Weight
+def _shipment_weight(data, vol_divisor):
+    """Chargeable weight of a validated rate request"""
     if data.get('orders'):
         # Multi-box logic
-        try:
-            # Load Volumetric Divisor from Config
-            vol_divisor = settings.COURIER_BUSINESS_RULES.get('VOLUMETRIC_DIVISOR', 5000)
-        except Exception:
-            vol_divisor = 5000 # Fallback
-
         total_weight = 0
         for box in data['orders']:
             vol_weight = (box['length'] * box['width'] * box['height']) / vol_divisor
             applicable = max(box['weight'], vol_weight)
             total_weight += applicable
-    else:
-        # Legacy single weight logic
-        total_weight = data['weight']
+        return total_weight
+    # Legacy single weight logic
+    return data['weight']
+
+
+def _price_shipment(data, carriers, total_weight, system_config, rate_card_version_id):
+    """
+    Price one validated rate request against the given carriers.
+
+    Returns:
+        list: Serviceable results, cheapest first.
 
-    rates = load_rates()
+    Raises:
+        InvalidWeightError: If the weight is invalid for all carriers.
+    """
     results = []
 
-    for carrier in rates:
+    for carrier in carriers:
         if not carrier.get("active", True):
             continue
 
-        req_mode = data['mode'].lower()
-        car_mode = carrier.get("mode", "Surface").lower()
-        if req_mode != "both" and car_mode != req_mode:
-            continue
-
         try:
             res = calculate_cost(
                 weight=total_weight,
@@ -101,15 +132,17 @@ def compare_rates(request):
                 dest_pincode=data['dest_pincode'],
                 carrier_data=carrier,
                 is_cod=data['is_cod'],
-                order_value=data['order_value']
+                order_value=data['order_value'],
+                system_config=system_config
             )
 
             res["applied_zone"] = res.get("zone", "") # Use zone from engine result
             res["mode"] = carrier.get("mode", "Surface")
+            res["rate_card_version_id"] = rate_card_version_id
             results.append(res)
-        except InvalidWeightError as e:
+        except InvalidWeightError:
             # If weight is invalid, it's a bad request for ALL carriers
-            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            raise
         except CourierError as e:
             # Known courier error (e.g. pinned logic failure), log and skip
             logger.warning(f"Carrier {carrier.get('carrier_name')} skipped: {e.message}")
@@ -120,6 +153,31 @@ def compare_rates(request):
 
     # Filter out non-servicable carriers before sorting
     valid_results = [r for r in results if r.get("serviceable")]
+    return sorted(valid_results, key=lambda x: x["total_cost"])
+
+
+@api_view(['POST'])
+@throttle_classes([AnonSlidingWindowThrottle])
+@permission_classes([AllowAny])
+@renderer_classes(FAST_RENDERER_CLASSES)
+@parser_classes(FAST_PARSER_CLASSES)
+def compare_rates(request):
+    """Compare shipping rates across carriers"""
+    data = validate_rate_request(request.data)
+
+    # Calculate Total Weight
+    total_weight = _shipment_weight(data, _volumetric_divisor())
+
+    all_rates = load_rates()
+    # Quotes record which published rate card version priced them
+    rate_card_version_id = getattr(all_rates, 'version_id', None)
+    system_config = getattr(all_rates, 'system_config', None)
+    rates = filter_by_mode(all_rates, data['mode'])
+
+    try:
+        valid_results = _price_shipment(data, rates, total_weight, system_config, rate_card_version_id)
+    except InvalidWeightError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     if not valid_results:
         logger.warning(f"No serviceable carriers matched for mode: {data['mode']}")
@@ -128,11 +186,99 @@ def compare_rates(request):
             status=status.HTTP_404_NOT_FOUND
         )
 
-    return Response(sorted(valid_results, key=lambda x: x["total_cost"]))
+    return Response(valid_results)
+
+
+def _batch_quote_lines(shipments, all_rates):
+    """
+    Price shipments one at a time, yielding one NDJSON line per shipment.
+
+    The rate cards, system config, mode filters and volumetric divisor are
+    resolved once for the whole batch; pincode locations are memoized in
+    courier.zones. Nothing is accumulated, so memory stays flat however
+    many shipments the batch holds.
+    """
+    rate_card_version_id = getattr(all_rates, 'version_id', None)
+    system_config = getattr(all_rates, 'system_config', None)
+    if system_config is None:
+        system_config = system_config_dict(SystemConfig.get_solo())
+    vol_divisor = _volumetric_divisor()
+    carriers_by_mode = {}
+
+    for index, row in enumerate(shipments):
+        line = {"index": index}
+        if isinstance(row, dict) and "reference" in row:
+            line["reference"] = row["reference"]
+
+        try:
+            data = validate_shipment(row)
+            mode = data['mode']
+            if mode not in carriers_by_mode:
+                carriers_by_mode[mode] = filter_by_mode(all_rates, mode)
+            rates = _price_shipment(
+                data, carriers_by_mode[mode], _shipment_weight(data, vol_divisor),
+                system_config, rate_card_version_id
+            )
+        except ValidationError as e:
+            line.update(status=status.HTTP_400_BAD_REQUEST, errors=e.detail)
+        except InvalidWeightError as e:
+            line.update(status=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except Exception as e:
+            logger.error(f"BATCH_QUOTE_ERROR: Shipment {index} failed. Error: {str(e)}")
+            line.update(status=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Could not price this shipment.")
+        else:
+            if rates:
+                line.update(status=status.HTTP_200_OK, rates=rates)
+            else:
+                line.update(
+                    status=status.HTTP_404_NOT_FOUND,
+                    detail="No serviceable carriers found for this route."
+                )
+
+        yield json_encoder.encode(line) + b"\n"
+
+
+@api_view(['POST'])
+@throttle_classes([AnonSlidingWindowThrottle])
+@permission_classes([AllowAny])
+@renderer_classes(FAST_RENDERER_CLASSES)
+@parser_classes(FAST_PARSER_CLASSES)
+def compare_rates_batch(request):
+    """
+    Compare shipping rates for many shipments in one request.
+
+    Body: {"shipments": [<compare-rates request>, ...]}. Each shipment may
+    carry a "reference" that is echoed back. The response is NDJSON
+    (application/x-ndjson), one line per shipment in request order, with
+    the per-row "status" of the equivalent /api/compare-rates call and
+    either "rates" or "errors"/"detail". Lines are streamed as they are
+    priced; an invalid row does not fail the batch.
+    """
+    serializer = RateBatchSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    response = StreamingHttpResponse(
+        _batch_quote_lines(serializer.validated_data['shipments'], load_rates()),
+        content_type='application/x-ndjson'
+    )
+    response['X-Accel-Buffering'] = 'no'  # Let nginx pass lines through as they are written
+    return response
+
+
+def _pincode_etag(request, pincode):
+    # Unknown pincodes get a plain 404 without validators
+    if PINCODE_DATA_MTIME is None or int(pincode) not in PINCODE_LOOKUP:
+        return None
+    return f'"pincode-{int(PINCODE_DATA_MTIME)}-{pincode}"'
+
+
+def _pincode_last_modified(request, pincode):
+    return version_timestamp(PINCODE_DATA_MTIME) if int(pincode) in PINCODE_LOOKUP else None
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_get(_pincode_etag, _pincode_last_modified, public=True, max_age=86400)
 def lookup_pincode(request, pincode):
     """Get city and state for a pincode"""
     pincode_data = PINCODE_LOOKUP.get(int(pincode))
@@ -0,0 +1,167 @@
+"""
+Async Public API Views (ASGI).
+
+Native async variants of compare-rates and pincode lookup for uvicorn
+workers (``config.asgi:application``). Pricing runs on the event loop
+against an in-process copy of the rate cards and their system config, so
+a quote makes no database or cache calls. Everything that does block -
+refreshing the rate cards, the throttle's shared-cache sync - runs through
+``db_sync_to_async`` on a small bounded thread pool.
+
+Under WSGI these views still work (Django runs them in a per-request
+event loop) but gain nothing; route quote traffic to them only on ASGI.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import msgspec
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
+from courier.exceptions import InvalidWeightError
+from courier.models import SystemConfig
+from courier.serializers import validate_rate_request
+from courier.snapshot import filter_by_mode, system_config_dict
+from courier.throttling import AnonSlidingWindowThrottle
+from courier.zones import PINCODE_LOOKUP
+from . import public
+from .base import logger
+
+# Threads for blocking work; bounds DB connections per worker
+_db_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'COURIER_ASYNC_DB_THREADS', 4),
+    thread_name_prefix='courier-async-db',
+)
+
+# In-process rate cards: (carriers, system_config, expires_at)
+_rates = None
+
+
+def _in_db_thread(func, *args, **kwargs):
+    # Pool threads never see request_started/finished, so recycle
+    # connections here the way those signals would.
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def db_sync_to_async(func, *args, **kwargs):
+    """Run blocking (DB, cache) work on the bounded pool without blocking the loop."""
+    return await sync_to_async(_in_db_thread, thread_sensitive=False, executor=_db_executor)(
+        func, *args, **kwargs
+    )
+
+
+def _load_rate_cards():
+    carriers = public.load_rates()
+    system_config = getattr(carriers, 'system_config', None)
+    if system_config is None:
+        system_config = system_config_dict(SystemConfig.get_solo())
+    return carriers, system_config
+
+
+async def get_rate_cards():
+    """
+    Rate cards and system config for async pricing.
+
+    Kept in-process for COURIER_ASYNC_RATES_TTL seconds (default 5) and
+    refreshed from load_rates() off the event loop, so rate changes reach
+    async workers within that window.
+    """
+    global _rates
+    now = time.monotonic()
+    if _rates is None or _rates[2] <= now:
+        carriers, system_config = await db_sync_to_async(_load_rate_cards)
+        ttl = getattr(settings, 'COURIER_ASYNC_RATES_TTL', 5)
+        _rates = (carriers, system_config, now + ttl)
+    return _rates[0], _rates[1]
+
+
+def clear_rate_cards():
+    """Drop the in-process rate cards (tests, after publishing rates)."""
+    global _rates
+    _rates = None
+
+
+def _check_throttle(request):
+    """Same throttle as the sync view. Returns (allowed, seconds to wait)."""
+    throttle = AnonSlidingWindowThrottle()
+    if throttle.allow_request(Request(request), None):
+        return True, None
+    return False, throttle.wait()
+
+
+def _throttled(wait):
+    detail = "Request was throttled."
+    response_headers = {}
+    if wait is not None:
+        wait = int(wait + 0.999)
+        detail += f" Expected available in {wait} second{'s' if wait != 1 else ''}."
+        response_headers['Retry-After'] = str(wait)
+    return JsonResponse(
+        {"detail": detail}, status=status.HTTP_429_TOO_MANY_REQUESTS, headers=response_headers
+    )
+
+
+@csrf_exempt
+@require_POST
+async def compare_rates_async(request):
+    """Compare shipping rates across carriers (async; same contract as compare_rates)"""
+    allowed, wait = await db_sync_to_async(_check_throttle, request)
+    if not allowed:
+        return _throttled(wait)
+
+    try:
+        payload = msgspec.json.decode(request.body or b"{}")
+    except msgspec.DecodeError as e:
+        return JsonResponse({"detail": f"JSON parse error - {e}"}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        data = validate_rate_request(payload)
+    except ValidationError as e:
+        return JsonResponse(e.detail, status=status.HTTP_400_BAD_REQUEST, safe=False)
+
+    carriers, system_config = await get_rate_cards()
+    total_weight = public._shipment_weight(data, public._volumetric_divisor())
+
+    try:
+        valid_results = public._price_shipment(
+            data, filter_by_mode(carriers, data['mode']), total_weight,
+            system_config, getattr(carriers, 'version_id', None)
+        )
+    except InvalidWeightError as e:
+        return JsonResponse({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    if not valid_results:
+        logger.warning(f"No serviceable carriers matched for mode: {data['mode']}")
+        return JsonResponse(
+            {"detail": "No serviceable carriers found for this route."},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    return JsonResponse(valid_results, safe=False)
+
+
+@require_GET
+async def lookup_pincode_async(request, pincode):
+    """Get city and state for a pincode (async; in-memory lookup only)"""
+    pincode_data = PINCODE_LOOKUP.get(int(pincode))
+
+    if not pincode_data:
+        return JsonResponse({"detail": "Pincode not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    return JsonResponse({
+        "pincode": pincode,
+        "city": pincode_data.get("district", ""),
+        "state": pincode_data.get("state", ""),
+        "office": pincode_data.get("office", "")
+    })
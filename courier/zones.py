@@ -1,7 +1,9 @@
 import pandas as pd
 import json
 import os
+import time
 import logging
+from functools import lru_cache
 
 # Configure module logger
 logger = logging.getLogger('courier')
@@ -38,6 +40,9 @@ def initialize_pincode_lookup():
         return {}
 
 PINCODE_LOOKUP = initialize_pincode_lookup()
+# Version of the pincode data loaded above (for HTTP caching of lookups)
+PINCODE_DATA_MTIME = os.path.getmtime(DATA_PATH) if PINCODE_LOOKUP else None
+PINCODE_LOADED_AT = time.time()
 
 
 # --- 3. REFACTORED HELPERS ---
@@ -73,6 +78,10 @@ def normalize_name(name: str, type: str = 'state') -> str:
             
     return cleaned
 
+# PINCODE_LOOKUP is static after import, so normalized locations are memoized;
+# batch quotes and multi-carrier comparisons hit the same pincodes repeatedly.
+# Callers must treat the returned dict as read-only.
+@lru_cache(maxsize=16384)
 def get_location_details(pincode: int):
     data = PINCODE_LOOKUP.get(pincode)
     if data:
@@ -95,6 +104,7 @@ def is_metro(location_dict):
 
 # --- 5. CSV REGION LOGIC (Generic) ---
 CSV_CACHE = {}
+CSV_LOADED_AT = {}  # filename -> time.time() of load
 
 def get_csv_region_details(pincode: int, csv_filename: str = "BlueDart_Serviceable Pincodes.csv"):
     global CSV_CACHE
@@ -132,6 +142,7 @@ def get_csv_region_details(pincode: int, csv_filename: str = "BlueDart_Serviceab
             except Exception as e:
                  logger.error(f"Error loading CSV {path}: {e}")
                  CSV_CACHE[csv_filename] = {}
+        CSV_LOADED_AT[csv_filename] = time.time()
 
     return CSV_CACHE[csv_filename].get(pincode)
 
@@ -0,0 +1,127 @@
+"""
+Benchmark: quote tail latency, gthread (WSGI) vs uvicorn (ASGI) workers.
+
+Opens --concurrency keep-alive connections and sends compare-rates requests
+over them as fast as the server answers, then reports throughput and
+latency percentiles. Uses only the standard library.
+
+Start both servers with the same worker count, e.g.:
+
+    gunicorn config.wsgi:application -b :8000 -w 4 --threads 2 -k gthread
+    gunicorn config.asgi:application -b :8001 -w 4 -k uvicorn.workers.UvicornWorker
+
+and compare:
+
+    python scripts/bench_async_quotes.py http://127.0.0.1:8000/api/compare-rates
+    python scripts/bench_async_quotes.py http://127.0.0.1:8001/api/async/compare-rates
+
+The anonymous throttle (30/minute) must be lifted on the servers under test,
+otherwise most responses are 429s; status counts are printed to check.
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+DEFAULT_BODY = {
+    "source_pincode": 400001,
+    "dest_pincode": 110001,
+    "weight": 1.5,
+    "is_cod": True,
+    "order_value": 2000,
+    "mode": "Both",
+}
+
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed")
+    status = int(status_line.split()[1])
+    length, close = 0, False
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        name = name.strip().lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "connection" and value.strip().lower() == "close":
+            close = True
+    await reader.readexactly(length)
+    return status, close
+
+
+async def _connection(url, request, deadline, latencies, statuses):
+    parts = urlsplit(url)
+    reader = writer = None
+    while time.monotonic() < deadline:
+        if writer is None:
+            reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+        start = time.perf_counter()
+        writer.write(request)
+        try:
+            status, close = await _read_response(reader)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            statuses["connection error"] += 1
+            writer.close()
+            writer = None
+            continue
+        latencies.append(time.perf_counter() - start)
+        statuses[status] += 1
+        if close:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+def _percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run(url, concurrency, duration, body):
+    parts = urlsplit(url)
+    payload = json.dumps(body).encode()
+    request = (
+        f"POST {parts.path or '/'} HTTP/1.1\r\n"
+        f"Host: {parts.netloc}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\n"
+        "Connection: keep-alive\r\n\r\n"
+    ).encode() + payload
+
+    latencies, statuses = [], Counter()
+    deadline = time.monotonic() + duration
+    await asyncio.gather(*[
+        _connection(url, request, deadline, latencies, statuses) for _ in range(concurrency)
+    ])
+    return sorted(latencies), statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('url', help='compare-rates URL to load')
+    parser.add_argument('--concurrency', type=int, default=200, help='Open connections')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to run')
+    args = parser.parse_args()
+
+    latencies, statuses = asyncio.run(run(args.url, args.concurrency, args.duration, DEFAULT_BODY))
+
+    print(f"{args.url} - {args.concurrency} connections, {args.duration:.0f}s")
+    print('=' * 60)
+    print(f"Requests:   {len(latencies)} ({len(latencies) / args.duration:.0f}/s)")
+    print(f"Statuses:   {dict(statuses)}")
+    if latencies:
+        for pct in (50, 90, 99, 99.9):
+            print(f"p{pct:<9} {_percentile(latencies, pct) * 1000:8.1f} ms")
+        print(f"max        {latencies[-1] * 1000:8.1f} ms")
+    print('=' * 60)
+
+
+if __name__ == '__main__':
+    main()
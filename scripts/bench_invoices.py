@@ -0,0 +1,291 @@
+"""
+Benchmark: invoice PDFs per second per core, before and after the shared
+InvoiceTemplate.
+
+"before" is the previous per-call layout (kept below as ``legacy_render``):
+a fresh sample stylesheet, ParagraphStyles, company/footer flowables and
+table styles on every render. "after" is ``courier.invoices.render_invoice``.
+Both render the same order snapshot in one process (one core), alternating
+in ``--rounds`` short rounds over ``--seconds`` each, and the best round is
+reported; with ``--workers N`` the same runs on N spawned processes at once
+to show the aggregate rate.
+
+Usage:
+    python scripts/bench_invoices.py
+    python scripts/bench_invoices.py --seconds 10 --workers 4
+"""
+import argparse
+import datetime
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from io import BytesIO
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "courier.tests.settings_test")
+
+import django
+
+django.setup()
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from courier.invoices import render_invoice
+
+CONTEXT = {
+    "id": 1001,
+    "order_number": "ORD-20261018-01001",
+    "created_at": datetime.datetime(2026, 10, 18, 10, 30, tzinfo=datetime.timezone.utc),
+    "status": "booked",
+    "awb_number": "AWB123456789",
+    "sender_name": "Warehouse Mumbai",
+    "sender_address": "Plot 7, MIDC Industrial Area, Andheri East, Mumbai",
+    "sender_pincode": 400001,
+    "sender_phone": "9876543210",
+    "recipient_name": "Ravi Kumar",
+    "recipient_address": "12, MG Road, Near Metro Station, Bengaluru",
+    "recipient_pincode": 560001,
+    "recipient_phone": "9123456780",
+    "recipient_email": "ravi@example.com",
+    "item_type": "Electronics",
+    "sku": "SKU-001",
+    "quantity": 2,
+    "weight": 1.5,
+    "length": 30,
+    "width": 20,
+    "height": 10,
+    "item_amount": Decimal("2499.00"),
+    "total_cost": Decimal("512.40"),
+    "cost_breakdown": {"freight_charge": 310.0, "fuel_surcharge": 38.75, "gst_amount": 78.15, "total_charge": 512.4},
+    "carrier_name": "Bench Carrier",
+}
+
+
+def legacy_render(context):
+    # The layout code as it was before InvoiceTemplate, for comparison
+    order = SimpleNamespace(**context)
+
+    # Create a file-like buffer to receive PDF data.
+    buffer = BytesIO()
+
+    # Create the PDF object, using the buffer as its "file."
+    doc = SimpleDocTemplate(buffer, pagesize=letter,
+                            rightMargin=40, leftMargin=40,
+                            topMargin=40, bottomMargin=40)
+
+    # Container for the 'Flowable' objects
+    elements = []
+
+    # Styles
+    styles = getSampleStyleSheet()
+    title_style = styles['Heading1']
+    title_style.alignment = 1 # Center
+
+    normal_style = styles['Normal']
+    bold_style = ParagraphStyle('Bold', parent=styles['Normal'], fontName='Helvetica-Bold')
+
+    # --- Header ---
+    elements.append(Paragraph("INVOICE", title_style))
+    elements.append(Spacer(1, 20))
+
+    # Company Info (Left) & Invoice Info (Right)
+    # We'll use a table for layout
+    company_info = [
+        [Paragraph("<b>Courier Module Inc.</b>", normal_style)],
+        ["123 Logistics Way"],
+        ["Tech Park, Bangalore 560100"],
+        ["support@couriermodule.com"],
+        ["+91 98765 43210"]
+    ]
+
+    invoice_info = [
+        [Paragraph(f"<b>Invoice #:</b> {order.order_number}", normal_style)],
+        [f"Date: {order.created_at.strftime('%Y-%m-%d')}"],
+        [f"Status: {order.status.upper()}"],
+        [f"Carrier: {order.carrier_name or 'N/A'}"],
+        [f"AWB: {order.awb_number or 'N/A'}"]
+    ]
+
+    header_data = [[
+        Table(company_info, style=[('LEFTPADDING', (0,0), (-1,-1), 0)]),
+        Table(invoice_info, style=[('LEFTPADDING', (0,0), (-1,-1), 0)])
+    ]]
+
+    header_table = Table(header_data, colWidths=[3.5*inch, 3*inch])
+    header_table.setStyle(TableStyle([
+        ('VALIGN', (0,0), (-1,-1), 'TOP'),
+        ('ALIGN', (1,0), (1,0), 'RIGHT'),
+    ]))
+    elements.append(header_table)
+    elements.append(Spacer(1, 30))
+
+    # --- Addresses ---
+    # Sender (Left) & Recipient (Right)
+    sender_info = [
+        [Paragraph("<b>Sender Details:</b>", bold_style)],
+        [order.sender_name or "N/A"],
+        [Paragraph(order.sender_address or "", normal_style)],
+        [f"Pincode: {order.sender_pincode}"],
+        [f"Phone: {order.sender_phone or 'N/A'}"]
+    ]
+
+    recipient_info = [
+        [Paragraph("<b>Recipient Details:</b>", bold_style)],
+        [order.recipient_name],
+        [Paragraph(order.recipient_address, normal_style)],
+        [f"Pincode: {order.recipient_pincode}"],
+        [f"Phone: {order.recipient_phone or 'N/A'}"],
+        [f"Email: {order.recipient_email or 'N/A'}"]
+    ]
+
+    address_data = [[
+        Table(sender_info, style=[('LEFTPADDING', (0,0), (-1,-1), 0)]),
+        Table(recipient_info, style=[('LEFTPADDING', (0,0), (-1,-1), 0)])
+    ]]
+
+    address_table = Table(address_data, colWidths=[3.5*inch, 3*inch])
+    address_table.setStyle(TableStyle([
+        ('VALIGN', (0,0), (-1,-1), 'TOP'),
+        ('LINEBELOW', (0,0), (1,0), 0.5, colors.lightgrey),
+        ('BOTTOMPADDING', (0,0), (1,0), 20),
+    ]))
+    elements.append(address_table)
+    elements.append(Spacer(1, 30))
+
+    # --- Item Details ---
+    elements.append(Paragraph("<b>Shipment Details:</b>", normal_style))
+    elements.append(Spacer(1, 10))
+
+    item_data = [
+        ["Description", "SKU", "Qty", "Weight (kg)", "Dimensions (cm)", "Amount (₹)"]
+    ]
+
+    # Item row
+    item_desc = order.item_type or "Package"
+    dims = f"{order.length}x{order.width}x{order.height}"
+    item_row = [
+        item_desc,
+        order.sku or "-",
+        str(order.quantity),
+        str(order.weight),
+        dims,
+        f"{order.item_amount:.2f}"
+    ]
+    item_data.append(item_row)
+
+    # Create Table
+    item_table = Table(item_data, colWidths=[2*inch, 1*inch, 0.5*inch, 1*inch, 1.5*inch, 1*inch])
+    item_table.setStyle(TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), colors.Color(0.12, 0.23, 0.54)), # Brand blue
+        ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
+        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0,0), (-1,0), 10),
+        ('BOTTOMPADDING', (0,0), (-1,0), 12),
+        ('BACKGROUND', (0,1), (-1,-1), colors.whitesmoke),
+        ('GRID', (0,0), (-1,-1), 1, colors.black),
+    ]))
+    elements.append(item_table)
+    elements.append(Spacer(1, 20))
+
+    # --- Cost Breakdown ---
+    # Only show if there is a cost breakdown or total cost, and status is booked/delivered etc.
+    if order.total_cost:
+        cost_data = [] # Headers usually not needed for simple list, but let's do customized right-aligned table
+
+        # Base Freight
+        freight = 0
+        if order.cost_breakdown and 'freight_charge' in order.cost_breakdown:
+             freight = order.cost_breakdown['freight_charge']
+
+        # Surcharges (sum of others)
+        surcharges = 0
+        if order.cost_breakdown:
+             for k, v in order.cost_breakdown.items():
+                 if k != 'freight_charge' and k != 'total_charge' and isinstance(v, (int, float)):
+                     surcharges += v
+
+        cost_data.append(["Freight Charges:", f"₹{freight:.2f}"])
+        cost_data.append(["Surcharges/Taxes:", f"₹{surcharges:.2f}"])
+        cost_data.append(["Total Shipping Cost:", f"₹{order.total_cost:.2f}"])
+
+        cost_table = Table(cost_data, colWidths=[5.5*inch, 1.5*inch])
+        cost_table.setStyle(TableStyle([
+            ('ALIGN', (0,0), (-1,-1), 'RIGHT'),
+            ('FONTNAME', (0,-1), (-1,-1), 'Helvetica-Bold'), # Total row bold
+            ('LINEABOVE', (0,-1), (-1,-1), 1, colors.black),
+        ]))
+        elements.append(cost_table)
+
+    elements.append(Spacer(1, 40))
+
+    # --- Footer ---
+    footer_text = "Thank you for using Courier Module Inc. This is a computer-generated invoice."
+    elements.append(Paragraph(footer_text, ParagraphStyle('Footer', parent=normal_style, alignment=1, fontSize=8, textColor=colors.grey)))
+
+    # Build PDF
+    doc.build(elements)
+    return buffer.getvalue()
+
+
+VARIANTS = {"before": legacy_render, "after": render_invoice}
+
+
+def rate(variant, seconds):
+    """PDFs/sec for one variant in this process."""
+    render = VARIANTS[variant]
+    count, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        render(CONTEXT)
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def best_rates(seconds, rounds):
+    """Best per-round rate of each variant; rounds alternate so both see the same machine noise."""
+    for render in VARIANTS.values():
+        render(CONTEXT)  # warm up fonts and imports
+    best = dict.fromkeys(VARIANTS, 0.0)
+    for _ in range(rounds):
+        for variant in VARIANTS:
+            best[variant] = max(best[variant], rate(variant, seconds / rounds))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5, help="Render time per variant (default 5)")
+    parser.add_argument("--rounds", type=int, default=5, help="Alternating rounds, best one reported (default 5)")
+    parser.add_argument("--workers", type=int, default=0, help="Also run on this many processes (default off)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Invoice PDFs per second")
+    print("=" * 60)
+    print(f"before: {len(legacy_render(CONTEXT)):,} bytes, after: {len(render_invoice(CONTEXT)):,} bytes")
+
+    single = best_rates(args.seconds, args.rounds)
+    print(f"\n1 core:   before {single['before']:7.1f}/s ({1000 / single['before']:.2f} ms)"
+          f"   after {single['after']:7.1f}/s ({1000 / single['after']:.2f} ms)"
+          f"   x{single['after'] / single['before']:.2f}")
+
+    if args.workers:
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=ctx) as pool:
+            runs = list(pool.map(best_rates, [args.seconds] * args.workers, [args.rounds] * args.workers))
+        total = {variant: sum(run[variant] for run in runs) for variant in VARIANTS}
+        print(f"{args.workers} procs:  before {total['before']:7.1f}/s ({total['before'] / args.workers:.1f}/core)"
+              f"   after {total['after']:7.1f}/s ({total['after'] / args.workers:.1f}/core)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
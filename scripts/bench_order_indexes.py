@@ -0,0 +1,226 @@
+"""
+Benchmark: query plans and latencies of the hot order queries on the old
+single-column indexes vs the composite / partial indexes on Order and
+FTLOrder (migration 0032).
+
+Seeds --orders orders (default 1M) and --ftl-orders FTL orders into a
+scratch database, then for each index layout runs:
+
+  - ?status= listing, newest first (first page of 50), common and rare status
+  - ?carrier= listing, newest first (first page of 50)
+  - orders by status / carrier performance (admin_dashboard_stats)
+  - booked in the last 30 days (admin_dashboard_stats)
+  - FTL ?status= listing and booked in the last 30 days
+
+"before" drops the new indexes and recreates status and carrier_id as
+single-column indexes; "after" is the schema as migrated. Each query is
+timed --repeat times (median reported) and its plan printed once.
+
+With the default test settings the scratch database is a temporary SQLite
+file. At 1M rows SQLite's planner answers the 30-day counts from the
+status composite rather than the partial booked_at index. To measure
+production plans, point DJANGO_SETTINGS_MODULE at a settings module whose
+default database is an empty PostgreSQL database - it is migrated and
+filled with fake orders.
+
+Usage:
+    python scripts/bench_order_indexes.py
+    python scripts/bench_order_indexes.py --orders 200000 --repeat 20
+"""
+import argparse
+import atexit
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "courier.tests.settings_test")
+
+import django
+
+django.setup()
+
+from django.core.management import call_command
+from django.db import connection, models
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from courier.models import Courier, FTLOrder, Order, OrderStatus, PaymentMode
+
+BATCH_SIZE = 10000
+CARRIERS = 12
+PAGE = 50
+STATUSES = [  # rough production mix
+    (OrderStatus.DELIVERED, 54), (OrderStatus.BOOKED, 15), (OrderStatus.DRAFT, 12),
+    (OrderStatus.PICKED_UP, 10), (OrderStatus.CANCELLED, 8), (OrderStatus.NDR, 1),
+]
+
+# The pre-0032 layout: one B-tree per column (the FK got one implicitly)
+LEGACY_INDEXES = {
+    Order: [
+        models.Index(fields=['status'], name='bench_orders_status_idx'),
+        models.Index(fields=['carrier'], name='bench_orders_carrier_idx'),
+    ],
+    FTLOrder: [
+        models.Index(fields=['status'], name='bench_ftl_status_idx'),
+    ],
+}
+KEYSET_FIELDS = ['created_at', 'id']
+
+
+def new_indexes(model):
+    return [index for index in model._meta.indexes if index.fields != KEYSET_FIELDS]
+
+
+def use_scratch_database():
+    db = connection.settings_dict
+    if db['ENGINE'].endswith('sqlite3'):
+        scratch = tempfile.mkdtemp()
+        atexit.register(shutil.rmtree, scratch, ignore_errors=True)
+        db['NAME'] = os.path.join(scratch, 'bench_orders.sqlite3')
+    call_command('migrate', verbosity=0)
+    if Order.objects.exists() or FTLOrder.objects.exists():
+        sys.exit(f"Refusing to seed {db['NAME']}: it already holds orders")
+
+
+def seed(total, ftl_total, rng):
+    carriers = [Courier.objects.create(name=f'Bench Carrier {i}') for i in range(CARRIERS)]
+    statuses, weights = zip(*STATUSES)
+    now = timezone.now()
+    span = timedelta(days=365).total_seconds()
+
+    # Seed a year of history: created_at must not be stamped with "now"
+    created_fields = [Order._meta.get_field('created_at'), FTLOrder._meta.get_field('created_at')]
+    for field in created_fields:
+        field.auto_now_add = False
+    try:
+        for start in range(0, total, BATCH_SIZE):
+            batch = []
+            for i in range(start, min(start + BATCH_SIZE, total)):
+                status = rng.choices(statuses, weights)[0]
+                created = now - timedelta(seconds=span * (1 - i / total))
+                booked = status != OrderStatus.DRAFT
+                batch.append(Order(
+                    order_number=f'BENCH-{i:08d}',
+                    recipient_name='Bench Recipient', recipient_contact='9876543210',
+                    recipient_address='1 Bench Street', recipient_pincode=110001 + i % 500,
+                    sender_pincode=400001, weight=1.5, length=30, width=20, height=10,
+                    volumetric_weight=1.2, applicable_weight=1.5,
+                    payment_mode=PaymentMode.COD if i % 3 else PaymentMode.PREPAID,
+                    order_value=Decimal('1000.00'), status=status,
+                    carrier=rng.choice(carriers) if booked else None,
+                    total_cost=Decimal('150.00') if booked else None,
+                    created_at=created, booked_at=created + timedelta(hours=2) if booked else None,
+                ))
+            Order.objects.bulk_create(batch)
+            print(f"\r  orders {min(start + BATCH_SIZE, total):>9}/{total}", end='', flush=True)
+        print()
+
+        batch = []
+        for i in range(ftl_total):
+            status = rng.choices(statuses, weights)[0]
+            created = now - timedelta(seconds=span * (1 - i / ftl_total))
+            batch.append(FTLOrder(
+                order_number=f'BENCH-FTL-{i:08d}', name='Bench Shipper', phone='9876543210',
+                source_city='Mumbai', source_pincode=400001, destination_city='Delhi', destination_pincode=110001,
+                container_type='20FT', base_price=Decimal('10000'), escalation_amount=Decimal('1500'),
+                price_with_escalation=Decimal('11500'), gst_amount=Decimal('2070'), total_price=Decimal('13570'),
+                status=status, created_at=created,
+                booked_at=created + timedelta(hours=2) if status != OrderStatus.DRAFT else None,
+            ))
+        FTLOrder.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+    finally:
+        for field in created_fields:
+            field.auto_now_add = True
+    return carriers
+
+
+def set_layout(layout):
+    """Switch between the "before" and "after" index layouts; returns build seconds."""
+    start = time.perf_counter()
+    with connection.schema_editor() as editor:
+        for model, legacy in LEGACY_INDEXES.items():
+            drop, create = (new_indexes(model), legacy) if layout == 'before' else (legacy, new_indexes(model))
+            for index in drop:
+                editor.remove_index(model, index)
+            for index in create:
+                editor.add_index(model, index)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return time.perf_counter() - start
+
+
+def queries(carrier):
+    """(label, queryset, count) - count queries are timed with .count(), the rest are fetched."""
+    since = timezone.now() - timedelta(days=30)
+    newest = ('-created_at', '-id')
+    return [
+        ("status listing", Order.objects.filter(status=OrderStatus.BOOKED).order_by(*newest)[:PAGE], False),
+        ("NDR listing (rare status)", Order.objects.filter(status=OrderStatus.NDR).order_by(*newest)[:PAGE], False),
+        ("carrier listing", Order.objects.filter(carrier__name=carrier.name).order_by(*newest)[:PAGE], False),
+        ("orders by status", Order.objects.values('status').annotate(count=Count('id')).order_by('status'), False),
+        ("carrier performance", Order.objects.exclude(carrier__isnull=True).values('carrier__name').annotate(
+            order_count=Count('id'), revenue=Sum('total_cost')).order_by('-order_count')[:10], False),
+        ("booked last 30 days", Order.objects.filter(status=OrderStatus.BOOKED, booked_at__gte=since), True),
+        ("FTL status listing", FTLOrder.objects.filter(status=OrderStatus.BOOKED).order_by(*newest)[:PAGE], False),
+        ("FTL booked last 30 days", FTLOrder.objects.filter(status=OrderStatus.BOOKED, booked_at__gte=since), True),
+    ]
+
+
+def measure(carrier, repeat):
+    results = {}
+    for label, queryset, count in queries(carrier):
+        run = queryset.count if count else lambda: list(queryset.all())
+        run()  # warm the page cache
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+        results[label] = (statistics.median(timings), queryset.explain())
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--orders', type=int, default=1_000_000)
+    parser.add_argument('--ftl-orders', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=10, help='Timed runs per query')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    use_scratch_database()
+    print(f"Seeding {args.orders} orders, {args.ftl_orders} FTL orders ({connection.vendor})")
+    start = time.perf_counter()
+    carriers = seed(args.orders, args.ftl_orders, random.Random(args.seed))
+    print(f"  seeded in {time.perf_counter() - start:.1f}s")
+
+    results = {}
+    for layout in ('before', 'after'):
+        built = set_layout(layout)
+        print(f"  {layout}: indexes built in {built:.1f}s")
+        results[layout] = measure(carriers[0], args.repeat)
+
+    print('=' * 60)
+    print(f"{'query':28} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    print('=' * 60)
+    for label, (before, _) in results['before'].items():
+        after = results['after'][label][0]
+        print(f"{label:28} {before * 1e3:10.2f} {after * 1e3:10.2f} {before / after:7.1f}x")
+    print('=' * 60)
+    for layout in ('before', 'after'):
+        print(f"\nPlans ({layout})")
+        for label, (_, plan) in results[layout].items():
+            print(f"  {label}:")
+            for line in plan.splitlines():
+                print(f"      {line}")
+
+
+if __name__ == '__main__':
+    main()
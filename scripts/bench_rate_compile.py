@@ -0,0 +1,113 @@
+"""
+Benchmark: rate card rebuild, model-based vs float-native compiler.
+
+Seeds an in-memory database with 50 city-to-city carriers x 500 city routes
+and compares the old path (select/prefetch_related + Courier.get_rate_dict()
++ cast_decimal) with courier.rate_compiler.compile_rate_cards() on rebuild
+time and peak Python memory.
+
+Usage:
+    python scripts/bench_rate_compile.py
+    python scripts/bench_rate_compile.py --carriers 100 --routes 1000 --repeat 10
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "courier.tests.settings_test")
+
+import django
+
+django.setup()
+
+from django.core.management import call_command
+
+from courier.models import Courier
+from courier.rate_compiler import compile_rate_cards
+from courier.rate_import import RateCardImporter
+
+
+def seed(carriers, routes):
+    documents = []
+    for i in range(carriers):
+        documents.append({
+            "carrier_name": f"Bench Carrier {i:03d}",
+            "type": "PTL",
+            "mode": "Surface",
+            "active": True,
+            "min_weight": 20,
+            "max_weight": 5000,
+            "volumetric_divisor": 4500,
+            "logic": "city_to_city",
+            "fuel_config": {"is_dynamic": True, "base_diesel_price": 90, "diesel_ratio": 0.625, "flat_percent": 0},
+            "fixed_fees": {"docket_fee": 100, "eway_bill_fee": 50, "cod_fixed": 150},
+            "variable_fees": {"cod_percent": 0.015, "hamali_per_kg": 0.5, "min_hamali": 50, "fov_min": 100},
+            "routing_logic": {
+                "is_city_specific": True,
+                "city_rates": {f"city {j:04d}": 8 + (i * j) % 700 / 100 for j in range(routes)},
+                "door_delivery_slabs": [
+                    {"min": 0, "max": 100, "rate": 300},
+                    {"min": 100, "max": 500, "rate": 600},
+                    {"min": 500, "max": None, "rate": 900},
+                ],
+                "zonal_rates": {"forward": {}, "additional": {}},
+            },
+        })
+    RateCardImporter(documents).run()
+
+
+def legacy_compile():
+    couriers = (
+        Courier.objects.filter(is_active=True)
+        .select_related('fees_config', 'constraints_config', 'fuel_config_obj', 'routing_config')
+        .prefetch_related('zone_rates', 'city_routes', 'delivery_slabs', 'custom_zones', 'custom_zone_rates')
+    )
+    return [c.get_rate_dict() for c in couriers]
+
+
+def native_compile():
+    return compile_rate_cards()[0]
+
+
+def measure(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), sorted(timings)[len(timings) // 2], peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--carriers', type=int, default=50)
+    parser.add_argument('--routes', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    seed(args.carriers, args.routes)
+    assert legacy_compile() == native_compile(), "compilers disagree"
+
+    print(f"{args.carriers} carriers x {args.routes} city routes, best/median of {args.repeat}")
+    print('=' * 60)
+    results = {}
+    for label, fn in (("get_rate_dict + cast_decimal", legacy_compile), ("compile_rate_cards", native_compile)):
+        best, median, peak = measure(fn, args.repeat)
+        results[label] = best
+        print(f"{label:30} {best * 1000:8.1f} ms {median * 1000:8.1f} ms {peak / 1024 / 1024:8.1f} MiB peak")
+    print('=' * 60)
+    legacy, native = results.values()
+    print(f"Speedup: {legacy / native:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
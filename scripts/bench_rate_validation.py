@@ -0,0 +1,67 @@
+"""
+Benchmark: RateRequestSerializer vs the compiled validation fast path
+(courier.serializers.validate_rate_request) on single-weight and
+multi-box rate requests.
+
+Usage:
+    python scripts/bench_rate_validation.py
+    python scripts/bench_rate_validation.py --boxes 50 --repeat 20000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "courier.tests.settings_test")
+
+import django
+
+django.setup()
+
+from courier.serializers import RateRequestSerializer, validate_rate_request
+
+
+def serializer_validate(payload):
+    serializer = RateRequestSerializer(data=payload)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+def per_call(fn, payload, repeat):
+    best = float('inf')
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn(payload)
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--boxes', type=int, default=10, help='Boxes in the multi-box request')
+    parser.add_argument('--repeat', type=int, default=5000)
+    args = parser.parse_args()
+
+    base = {"source_pincode": 400001, "dest_pincode": 110001, "is_cod": True, "order_value": 2000, "mode": "Both"}
+    payloads = {
+        "single weight": dict(base, weight=1.5),
+        f"{args.boxes} boxes": dict(base, orders=[
+            {"weight": 2.5, "length": 30, "width": 20, "height": 10}
+        ] * args.boxes),
+    }
+
+    print(f"Validation time per request, best of 5 x {args.repeat}")
+    print('=' * 60)
+    print(f"{'request':16} {'serializer':>12} {'fast path':>12} {'speedup':>8}")
+    for label, payload in payloads.items():
+        assert validate_rate_request(payload) == serializer_validate(payload)
+        slow = per_call(serializer_validate, payload, args.repeat)
+        fast = per_call(validate_rate_request, payload, args.repeat)
+        print(f"{label:16} {slow * 1e6:9.1f} us {fast * 1e6:9.1f} us {slow / fast:7.1f}x")
+    print('=' * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+Benchmark: DRF JSONRenderer vs courier.renderers.MsgspecJSONRenderer.
+
+Renders the payloads of the hot endpoints - a 20-carrier compare-rates
+quote list, an admin order list page and the FTL route map - with both
+renderers, checks they decode to the same JSON and reports the time per
+render. Also times JSONParser vs MsgspecJSONParser on a 1,000-shipment
+batch request body.
+
+Usage:
+    python scripts/bench_renderers.py
+    python scripts/bench_renderers.py --orders 500 --repeat 2000
+"""
+import argparse
+import datetime
+import io
+import json
+import os
+import sys
+import time
+import uuid
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "courier.tests.settings_test")
+
+import django
+
+django.setup()
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from courier.renderers import MsgspecJSONParser, MsgspecJSONRenderer
+from courier.views.base import load_ftl_rates
+
+RATE_REQUEST = {
+    "source_pincode": 400001,
+    "dest_pincode": 110001,
+    "weight": 1.5,
+    "is_cod": True,
+    "order_value": 2000,
+    "mode": "Both",
+}
+
+
+def quotes(carriers=20):
+    # Shaped like compare-rates output (engine result + view fields)
+    return [{
+        "carrier": f"Bench Carrier {i:02d}",
+        "zone_id": "z_d",
+        "zone": "Metro to Metro",
+        "total_cost": 512.4 + i,
+        "breakdown": {
+            "base_freight_charge": 310.0 + i, "fuel_surcharge": 38.75, "docket_fee": 50.0,
+            "cod_charge": 30.0, "fov_charge": 0.0, "base_transport_cost": 310.0 + i,
+            "courier_payable": 428.75, "profit_margin": 5.42, "subtotal": 428.75,
+            "escalation_amount": 5.42, "amount_before_tax": 434.17, "gst_rate": "18.0%",
+            "gst_amount": 78.15, "final_total": 512.4 + i,
+        },
+        "serviceable": True,
+        "applied_zone": "Metro to Metro",
+        "mode": "Surface",
+        "rate_card_version_id": 3,
+    } for i in range(carriers)]
+
+
+def order_page(count):
+    # Shaped like OrderSerializer output, with the raw types a serializer can leave behind
+    now = datetime.datetime(2024, 5, 1, 10, 30, tzinfo=datetime.timezone.utc)
+    return {"count": count, "orders": [{
+        "id": i,
+        "order_number": f"ORD-20240501-{i:05d}",
+        "external_id": str(uuid.UUID(int=i)),
+        "status": "booked",
+        "recipient_name": "Ravi Kumar",
+        "recipient_address": "12, MG Road, Bengaluru",
+        "recipient_pincode": 560001,
+        "sender_pincode": 400001,
+        "weight": 2.5,
+        "length": 30.0, "width": 20.0, "height": 10.0,
+        "total_amount": Decimal("1234.56"),
+        "cost_breakdown": {"freight": 820.0, "fuel_surcharge": 123.0, "gst_amount": 188.28},
+        "carrier_name": "Bench Carrier",
+        "created_at": now,
+        "updated_at": now,
+    } for i in range(count)]}
+
+
+def ftl_routes():
+    return {
+        source: {dest: list(rates.keys()) for dest, rates in destinations.items()}
+        for source, destinations in load_ftl_rates().items()
+    }
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--orders', type=int, default=100, help='Orders per list page')
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    payloads = {
+        "compare-rates quotes": quotes(),
+        f"order list ({args.orders})": order_page(args.orders),
+        "ftl routes": ftl_routes(),
+    }
+    drf, fast = JSONRenderer(), MsgspecJSONRenderer()
+
+    print(f"Render time per response, best of 5 x {args.repeat}")
+    print('=' * 60)
+    print(f"{'payload':24} {'JSONRenderer':>12} {'msgspec':>10} {'speedup':>8}")
+    for label, data in payloads.items():
+        assert json.loads(drf.render(data)) == json.loads(fast.render(data)), label
+        slow_t = best_of(lambda: drf.render(data), args.repeat)
+        fast_t = best_of(lambda: fast.render(data), args.repeat)
+        print(f"{label:24} {slow_t * 1e6:9.1f} us {fast_t * 1e6:7.1f} us {slow_t / fast_t:7.1f}x")
+
+    body = json.dumps({"shipments": [RATE_REQUEST] * 1000}).encode()
+    slow_t = best_of(lambda: JSONParser().parse(io.BytesIO(body)), args.repeat // 10 or 1)
+    fast_t = best_of(lambda: MsgspecJSONParser().parse(io.BytesIO(body)), args.repeat // 10 or 1)
+    print(f"{'parse batch (1000)':24} {slow_t * 1e6:9.1f} us {fast_t * 1e6:7.1f} us {slow_t / fast_t:7.1f}x")
+    print('=' * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: per-request overhead of DRF's cache-backed throttles vs the
+in-memory sliding-window throttles in courier.throttling.
+
+Runs allow_request() for --requests requests spread over --clients client
+IPs, with a rate high enough that nothing is throttled, against:
+
+  - DRF AnonRateThrottle on LocMemCache
+  - DRF AnonRateThrottle on FileBasedCache (the production cache)
+  - AnonSlidingWindowThrottle, local only
+  - AnonSlidingWindowThrottle with shared-cache sync every second (FileBasedCache)
+
+Usage:
+    python scripts/bench_throttle.py
+    python scripts/bench_throttle.py --requests 50000 --clients 1000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "courier.tests.settings_test")
+
+import django
+
+django.setup()
+
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+from rest_framework.request import Request
+from rest_framework.throttling import AnonRateThrottle
+
+from courier import throttling
+from courier.throttling import AnonSlidingWindowThrottle, SlidingWindowCounter
+
+RATE = '1000000/minute'
+
+
+def requests_for(clients):
+    factory = APIRequestFactory()
+    return [
+        Request(factory.post('/api/compare-rates', REMOTE_ADDR=f"10.0.{i // 256}.{i % 256}"))
+        for i in range(clients)
+    ]
+
+
+def drf_throttle(cache_backend):
+    class Throttle(AnonRateThrottle):
+        rate = RATE
+        cache = cache_backend
+    return Throttle
+
+
+def sliding_throttle():
+    class Throttle(AnonSlidingWindowThrottle):
+        rate = RATE
+        counter = SlidingWindowCounter()
+    return Throttle
+
+
+def run(throttle_class, requests, total):
+    start = time.perf_counter()
+    for i in range(total):
+        throttle_class().allow_request(requests[i % len(requests)], None)
+    return (time.perf_counter() - start) / total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--clients', type=int, default=100, help='Distinct client IPs')
+    args = parser.parse_args()
+
+    requests = requests_for(args.clients)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        file_cache = FileBasedCache(cache_dir, {'OPTIONS': {'MAX_ENTRIES': 100000}})
+        cases = [
+            ("DRF AnonRateThrottle, locmem", drf_throttle(LocMemCache('bench', {})), 0),
+            ("DRF AnonRateThrottle, file cache", drf_throttle(file_cache), 0),
+            ("Sliding window, local", sliding_throttle(), 0),
+            ("Sliding window, file cache sync 1s", sliding_throttle(), 1),
+        ]
+
+        print(f"{args.requests} requests from {args.clients} clients")
+        print('=' * 60)
+        for label, throttle_class, sync_interval in cases:
+            throttling.cache = file_cache
+            with override_settings(COURIER_THROTTLE_SYNC_INTERVAL=sync_interval):
+                per_request = run(throttle_class, requests, args.requests)
+            print(f"{label:38} {per_request * 1e6:9.1f} us/request")
+        print('=' * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -154,7 +154,11 @@ async function loadDashboard() {
 // Load All Orders
 async function loadAllOrders(status = null) {
     try {
-        const url = status && status !== 'all' ? `${API_BASE}/api/orders/?status=${status}` : `${API_BASE}/api/orders/`;
+        // Only what the order cards show (skips cost_breakdown and notes)
+        const fields = 'id,order_number,status,recipient_name,recipient_pincode,weight,applicable_weight,payment_mode,total_cost';
+        const url = status && status !== 'all'
+            ? `${API_BASE}/api/orders/?status=${status}&fields=${fields}`
+            : `${API_BASE}/api/orders/?fields=${fields}`;
         const response = await fetch(url);
         const data = await response.json();
         // Handle both array and paginated response formats
@@ -33,7 +33,8 @@ function showShipmentTab(tab) {
 // Load Shipment Orders
 async function loadShipmentOrders() {
     try {
-        const response = await fetch(`${API_BASE}/api/orders/?status=draft`);
+        const fields = 'id,order_number,recipient_name,recipient_pincode,weight,applicable_weight,payment_mode';
+        const response = await fetch(`${API_BASE}/api/orders/?status=draft&fields=${fields}`);
         const data = await response.json();
         // Handle both array and paginated response formats
         const draftOrders = Array.isArray(data) ? data : (data.results || []);